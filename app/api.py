@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import csv
+import hmac
+import io
+import json
+import uuid
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
+
+from app.db import (
+    ITEM_FIELDS,
+    PAYLOAD_FIELDS,
+    ROLLUP_DIMENSIONS,
+    get_item,
+    item_rollup_stats,
+    iter_items,
+    list_tag_counts,
+    list_watchlist,
+)
+from app.settings import settings
+from workers.parquet_export import export_items_parquet
+
+EXPORT_CHUNK_BYTES = 64 * 1024
+WATCHLIST_FIELDS = (
+    "id", "name", "entry_type", "lab", "x_handle", "website", "youtube_channel", "rss_url", "created_at",
+)
+
+
+def require_api_access(request: Request) -> None:
+    """A dashboard session, or ``Authorization: Bearer <API_TOKEN>`` for scripts and notebooks."""
+    if request.session.get("logged_in"):
+        return
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if settings.api_token and scheme.lower() == "bearer" and hmac.compare_digest(token, settings.api_token):
+        return
+    raise HTTPException(status_code=401)
+
+
+router = APIRouter(prefix="/api/v1", dependencies=[Depends(require_api_access)])
+
+
+def _fields(value: str | None, allowed: Iterable[str], default: Iterable[str]) -> list[str]:
+    if not value:
+        return list(default)
+    fields = [field.strip() for field in value.split(",") if field.strip()]
+    unknown = sorted(set(fields) - set(allowed))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"unknown fields: {', '.join(unknown)}")
+    return fields
+
+
+def _item_filters(
+    source: str | None = None,
+    tag: str | None = None,
+    min_score: float | None = None,
+    since: str | None = Query(None, description="ISO timestamp; published at or after."),
+    until: str | None = Query(None, description="ISO timestamp; published before."),
+    search: str | None = Query(None, description="Substring of title or excerpt."),
+    leaders_only: bool = Query(False, description="Only cluster leaders, as on the dashboard."),
+) -> dict:
+    return {
+        "source_type": source,
+        "tag": tag,
+        "min_score": min_score,
+        "since": since,
+        "until": until,
+        "search": search,
+        "leaders_only": leaders_only,
+    }
+
+
+@router.get("/items")
+def list_items(
+    filters: dict = Depends(_item_filters),
+    fields: str | None = Query(None, description="Comma-separated fields; id is always included."),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: int | None = Query(None, description="next_cursor of the previous page."),
+) -> dict:
+    """Items newest first, paged by id: pass ``next_cursor`` back as ``cursor`` until it is null."""
+    selected = _fields(fields, ITEM_FIELDS + PAYLOAD_FIELDS, ITEM_FIELDS)
+    rows = list(iter_items({**filters, "before_id": cursor}, selected, limit=limit + 1))
+    next_cursor = rows[limit - 1]["id"] if len(rows) > limit else None
+    return {"data": rows[:limit], "next_cursor": next_cursor}
+
+
+@router.get("/items/{item_id}")
+def read_item(item_id: int, fields: str | None = None) -> dict:
+    item = get_item(item_id)
+    if not item:
+        raise HTTPException(status_code=404)
+    item["tags"] = [tag for tag in (item.get("tags") or "").split(",") if tag]
+    selected = _fields(fields, ITEM_FIELDS + PAYLOAD_FIELDS, ITEM_FIELDS + PAYLOAD_FIELDS)
+    return {field: item.get(field) for field in ["id", *selected]}
+
+
+@router.get("/tags")
+def list_tags() -> dict:
+    return {"data": [dict(row) for row in list_tag_counts()]}
+
+
+@router.get("/stats/items")
+def item_stats(
+    group_by: str = Query("day", description="day, source, tag or author, or day plus one of them: day,source."),
+    since: str | None = Query(None, description="First day, YYYY-MM-DD."),
+    until: str | None = Query(None, description="Last day, YYYY-MM-DD."),
+    limit: int | None = Query(None, ge=1, description="Largest groups only; ignored when grouping by day."),
+) -> dict:
+    """Item counts and score mean/p50/p90 from the rollup tables; never scans ``items``."""
+    keys = [key.strip() for key in group_by.split(",") if key.strip()]
+    dimensions = [key for key in keys if key != "day"]
+    if not keys or len(dimensions) > 1 or set(dimensions) - set(ROLLUP_DIMENSIONS):
+        raise HTTPException(status_code=400, detail=f"group_by takes day and/or one of: {', '.join(ROLLUP_DIMENSIONS)}")
+    by_day = "day" in keys
+    stats = item_rollup_stats(dimensions[0] if dimensions else None, by_day=by_day, since=since, until=until)
+    if not by_day:
+        stats.sort(key=lambda entry: entry["items"], reverse=True)
+        stats = stats[:limit]
+    return {"data": stats}
+
+
+@router.get("/watchlist")
+def watchlist(fields: str | None = None) -> dict:
+    selected = _fields(fields, WATCHLIST_FIELDS, WATCHLIST_FIELDS)
+    return {"data": [{field: row[field] for field in selected} for row in list_watchlist()]}
+
+
+def _chunked(lines: Iterator[str]) -> Iterator[bytes]:
+    """Group lines into ~64 KiB writes; each chunk is one trip through the threadpool."""
+    buffer: list[str] = []
+    size = 0
+    for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if size >= EXPORT_CHUNK_BYTES:
+            yield "".join(buffer).encode("utf-8")
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+
+def _ndjson_lines(rows: Iterator[dict]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + "\n"
+
+
+def _csv_value(field: str, value: object) -> object:
+    if field == "tags":
+        return ",".join(value)
+    if field == "metadata":
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def _csv_lines(rows: Iterator[dict], fields: list[str]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    for row in rows:
+        writer.writerow(_csv_value(field, row.get(field)) for field in fields)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+@router.get("/export/items")
+def export_items(
+    filters: dict = Depends(_item_filters),
+    fields: str | None = Query(None, description="Comma-separated fields; id is always included."),
+    format: str = Query("ndjson", pattern="^(ndjson|csv|parquet)$"),
+) -> Response:
+    """Every matching item, streamed from the cursor as NDJSON or CSV; nothing is buffered whole.
+
+    Parquet needs its footer written last, so it is built in a temporary file first.
+    """
+    selected = _fields(fields, ITEM_FIELDS + PAYLOAD_FIELDS, ITEM_FIELDS)
+    selected = ["id"] + [field for field in selected if field != "id"]
+    if format == "parquet":
+        path = Path(settings.data_dir) / "exports" / f"items-{uuid.uuid4().hex}.parquet"
+        try:
+            export_items_parquet(path, filters, selected)
+        except RuntimeError as exc:
+            raise HTTPException(status_code=501, detail=str(exc)) from exc
+        return FileResponse(
+            path,
+            media_type="application/vnd.apache.parquet",
+            filename="items.parquet",
+            background=BackgroundTask(path.unlink, missing_ok=True),
+        )
+    rows = iter_items(filters, selected)
+    if format == "csv":
+        lines, media_type = _csv_lines(rows, selected), "text/csv; charset=utf-8"
+    else:
+        lines, media_type = _ndjson_lines(rows), "application/x-ndjson"
+    headers = {"Content-Disposition": f'attachment; filename="items.{format}"'}
+    return StreamingResponse(_chunked(lines), media_type=media_type, headers=headers)
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
+import re
+from datetime import datetime, timedelta
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 from app.dates import combine_date_utc, parse_datetime, utc_now
 from app.settings import settings
 
 
-def normalize_published_at(value: str | None, *, now: datetime | None = None) -> str | None:
+def parse_published_at(value: str | datetime | None, *, now: datetime | None = None) -> datetime | None:
+    """Parsed UTC publish time, or ``None`` when missing, unparseable or outside the content window."""
     parsed = parse_datetime(value)
     if not parsed:
         return None
@@ -15,8 +18,64 @@ def normalize_published_at(value: str | None, *, now: datetime | None = None) ->
     max_age_cutoff = now - timedelta(days=settings.content_max_age_days)
     if parsed < min_date or parsed < max_age_cutoff:
         return None
-    if parsed.tzinfo is None:
-        parsed = parsed.replace(tzinfo=timezone.utc)
-    else:
-        parsed = parsed.astimezone(timezone.utc)
-    return parsed.isoformat()
+    return parsed
+
+
+def normalize_published_at(value: str | datetime | None, *, now: datetime | None = None) -> str | None:
+    parsed = parse_published_at(value, now=now)
+    return parsed.isoformat() if parsed else None
+
+
+TRACKING_PARAMS = {
+    "fbclid",
+    "gclid",
+    "dclid",
+    "igshid",
+    "mc_cid",
+    "mc_eid",
+    "mkt_tok",
+    "ref_src",
+    "ref_url",
+    "spm",
+    "yclid",
+}
+# Names that are tracking only on these hosts: elsewhere ``s`` is a WordPress search,
+# ``t`` a YouTube timestamp and ``ref`` a git ref, and they tell pages apart.
+HOST_TRACKING_PARAMS = {
+    "x.com": {"s", "t"},
+    "youtube.com": {"si"},
+}
+
+
+def canonicalize_url(url: str | None) -> str | None:
+    if not url:
+        return None
+    url = url.strip()
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return None
+    if parts.scheme not in {"http", "https"} or not parts.hostname:
+        return None
+    host = parts.hostname.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if host in {"twitter.com", "mobile.twitter.com", "mobile.x.com"}:
+        host = "x.com"
+    if host == "youtu.be":
+        video_id = parts.path.strip("/")
+        return f"https://youtube.com/watch?v={video_id}" if video_id else None
+    if host == "m.youtube.com":
+        host = "youtube.com"
+    port = f":{parts.port}" if parts.port and parts.port not in {80, 443} else ""
+    path = re.sub(r"/{2,}", "/", parts.path or "/")
+    if len(path) > 1:
+        path = path.rstrip("/")
+    host_params = HOST_TRACKING_PARAMS.get(host, set())
+    query_pairs = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS | host_params
+    ]
+    query = urlencode(sorted(query_pairs))
+    return urlunsplit(("https", f"{host}{port}", path, query, ""))
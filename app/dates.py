@@ -1,36 +1,74 @@
 from __future__ import annotations
 
+import re
 from datetime import date, datetime, time, timezone
 from email.utils import parsedate_to_datetime
+from functools import lru_cache
 
 from dateutil import parser
 
+DATE_CACHE_SIZE = 8192
+# Epoch seconds (or milliseconds) with an optional fraction; 8 digits is a basic ISO date instead.
+_EPOCH = re.compile(r"\d{9,13}(\.\d+)?")
+# "2024-05-01...", "20240501" or "20240501T...".
+_ISO = re.compile(r"\d{4}-\d{2}|\d{8}(T|$)")
+# "Wed, 01 May 2024 ..." and "01 May 2024 ...": RFC 822 as used by RSS.
+_RFC822 = re.compile(r"([A-Za-z]{3},?\s+)?\d{1,2}\s+[A-Za-z]{3}\s+\d{2,4}")
+
 
 def utc_now() -> datetime:
     return datetime.now(timezone.utc)
 
 
-def parse_datetime(value: str | None) -> datetime | None:
+def _to_utc(parsed: datetime) -> datetime:
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def _sniffed(value: str) -> datetime | None:
+    """Parse with the stdlib parser the string's shape points at; ``None`` if it does not fit."""
+    try:
+        if _EPOCH.fullmatch(value):
+            seconds = float(value)
+            return datetime.fromtimestamp(seconds / 1000 if seconds >= 1e11 else seconds, timezone.utc)
+        if _ISO.match(value):
+            return datetime.fromisoformat(value)
+        if _RFC822.match(value):
+            return parsedate_to_datetime(value)
+    except (ValueError, TypeError, OverflowError, OSError):
+        return None
+    return None
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse(value: str) -> datetime | None:
+    parsed = _sniffed(value)
+    if parsed is None:
+        try:
+            parsed = parser.isoparse(value)
+        except (ValueError, TypeError, OverflowError):
+            try:
+                parsed = parser.parse(value)
+            except (ValueError, TypeError, OverflowError):
+                return None
+    return _to_utc(parsed)
+
+
+def parse_datetime(value: str | datetime | None) -> datetime | None:
+    """Aware UTC datetime from ISO 8601, RFC 822, epoch seconds/ms or anything dateutil reads.
+
+    The common formats go straight to the matching stdlib parser; dateutil is only
+    the fallback. Results are memoized, since feeds repeat the same timestamps.
+    """
+    if isinstance(value, datetime):
+        return _to_utc(value)
     if not value:
         return None
     value = value.strip()
     if not value:
         return None
-    try:
-        parsed = parser.isoparse(value)
-    except (ValueError, TypeError):
-        try:
-            parsed = parser.parse(value)
-        except (ValueError, TypeError):
-            try:
-                parsed = parsedate_to_datetime(value)
-            except (TypeError, ValueError):
-                return None
-            if parsed is None:
-                return None
-    if parsed.tzinfo is None:
-        return parsed.replace(tzinfo=timezone.utc)
-    return parsed.astimezone(timezone.utc)
+    return _parse(value)
 
 
 def combine_date_utc(value: date) -> datetime:
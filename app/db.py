@@ -1,25 +1,38 @@
 import json
+import logging
+import re
 import sqlite3
+import time
+import zlib
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Iterable
+from typing import Callable, Iterable, Iterator
 
 from app.dates import combine_date_utc, utc_now
+from app.metrics import DB_WRITE_SECONDS
 from app.settings import settings
 
+LOGGER = logging.getLogger(__name__)
+
 DB_PATH = Path(settings.data_dir) / "radar.db"
+# PRAGMA user_version: 1 moved heavy columns out of ``items``, 2 swept rows orphaned by old cleanups,
+# 3 built ``item_rollups``, 4 indexed payload content in ``item_content_fts``.
+SCHEMA_VERSION = 4
 
 
-def get_connection() -> sqlite3.Connection:
+def get_connection(check_same_thread: bool = True) -> sqlite3.Connection:
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
+    conn = sqlite3.connect(DB_PATH, check_same_thread=check_same_thread)
     conn.row_factory = sqlite3.Row
     return conn
 
 
-def init_db() -> None:
+def init_db(migrate: bool = True) -> None:
+    """Create missing tables, columns and indexes; ``migrate=False`` leaves data migrations to ``migrate_db``."""
     conn = get_connection()
     cursor = conn.cursor()
+    # Only takes effect on a new database; scripts/compact_db.py converts an existing one.
+    cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
     cursor.execute(
         """
         CREATE TABLE IF NOT EXISTS watchlist_entries (
@@ -52,10 +65,41 @@ def init_db() -> None:
             score REAL DEFAULT 0,
             tags TEXT,
             metadata_json TEXT,
-            dedupe_hash TEXT UNIQUE
+            dedupe_hash TEXT UNIQUE,
+            canonical_url TEXT,
+            cluster_id INTEGER,
+            minhash TEXT,
+            summary_zh TEXT,
+            score_adjust REAL DEFAULT 0
+        )
+        """
+    )
+    _ensure_columns(
+        cursor,
+        "items",
+        {
+            "canonical_url": "TEXT",
+            "cluster_id": "INTEGER",
+            "minhash": "TEXT",
+            "summary_zh": "TEXT",
+            "score_adjust": "REAL DEFAULT 0",
+        },
+    )
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_items_cluster_id ON items(cluster_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_items_ingested_at ON items(ingested_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_items_published_at ON items(published_at)")
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS item_payloads (
+            item_id INTEGER PRIMARY KEY,
+            content BLOB,
+            metadata_json BLOB,
+            FOREIGN KEY(item_id) REFERENCES items(id)
         )
         """
     )
+    # Contentless: only the words are indexed (rowid = item id); the text itself stays compressed in item_payloads.
+    cursor.execute("CREATE VIRTUAL TABLE IF NOT EXISTS item_content_fts USING fts5(content, content='')")
     cursor.execute(
         """
         CREATE TABLE IF NOT EXISTS item_tags (
@@ -66,6 +110,205 @@ def init_db() -> None:
         )
         """
     )
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS item_fingerprints (
+            item_id INTEGER NOT NULL,
+            key TEXT NOT NULL,
+            FOREIGN KEY(item_id) REFERENCES items(id)
+        )
+        """
+    )
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_item_fingerprints_key ON item_fingerprints(key)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_item_fingerprints_item_id ON item_fingerprints(item_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_item_tags_item_id ON item_tags(item_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_item_tags_tag ON item_tags(tag, item_id)")
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS ingest_runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            started_at TEXT NOT NULL,
+            finished_at TEXT NOT NULL,
+            duration_seconds REAL NOT NULL,
+            mode TEXT NOT NULL,
+            watchlist_len INTEGER,
+            fetched_count INTEGER,
+            inserted_count INTEGER,
+            breakdown_json TEXT
+        )
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS summary_cache (
+            content_hash TEXT PRIMARY KEY,
+            summary_zh TEXT NOT NULL,
+            model TEXT,
+            created_at TEXT NOT NULL
+        )
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS summary_failures (
+            item_id INTEGER PRIMARY KEY,
+            attempts INTEGER NOT NULL,
+            retry_after TEXT NOT NULL,
+            FOREIGN KEY(item_id) REFERENCES items(id)
+        )
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS digest_candidates (
+            variant TEXT NOT NULL,
+            bucket TEXT NOT NULL,
+            item_id INTEGER NOT NULL,
+            score REAL NOT NULL,
+            published_at TEXT,
+            ingested_at TEXT NOT NULL,
+            PRIMARY KEY (variant, bucket, item_id)
+        )
+        """
+    )
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_digest_candidates_item_id ON digest_candidates(item_id)")
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS report_artifacts (
+            days INTEGER NOT NULL,
+            format TEXT NOT NULL,
+            watermark TEXT NOT NULL,
+            path TEXT NOT NULL,
+            size_bytes INTEGER NOT NULL,
+            created_at TEXT NOT NULL,
+            last_accessed_at TEXT NOT NULL,
+            PRIMARY KEY (days, format, watermark)
+        )
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS subscribers (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            email TEXT NOT NULL UNIQUE,
+            name TEXT,
+            tags TEXT,
+            min_score REAL DEFAULT 0,
+            max_items INTEGER DEFAULT 12,
+            active INTEGER DEFAULT 1,
+            created_at TEXT NOT NULL
+        )
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS digest_deliveries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            digest_date TEXT NOT NULL,
+            email TEXT NOT NULL,
+            status TEXT NOT NULL,
+            attempts INTEGER DEFAULT 0,
+            item_count INTEGER,
+            last_error TEXT,
+            updated_at TEXT NOT NULL,
+            UNIQUE (digest_date, email)
+        )
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS pending_backfills (
+            entry_id INTEGER PRIMARY KEY,
+            queued_at TEXT NOT NULL
+        )
+        """
+    )
+    # One-off runs requested from the web app (e.g. "ingest") for the scheduler's lease holder.
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS queued_jobs (
+            name TEXT PRIMARY KEY,
+            queued_at TEXT NOT NULL
+        )
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS leases (
+            name TEXT PRIMARY KEY,
+            holder TEXT NOT NULL,
+            expires_at REAL NOT NULL
+        )
+        """
+    )
+    # Item count and score sum per day, dimension value and 0.1-wide score bucket.
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS item_rollups (
+            day TEXT NOT NULL,
+            dimension TEXT NOT NULL,
+            value TEXT NOT NULL,
+            bucket INTEGER NOT NULL,
+            items INTEGER NOT NULL,
+            score_sum REAL NOT NULL,
+            PRIMARY KEY (dimension, day, value, bucket)
+        ) WITHOUT ROWID
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS source_health (
+            source_type TEXT NOT NULL,
+            source_key TEXT NOT NULL,
+            last_success_at REAL,
+            last_failure_at REAL,
+            consecutive_failures INTEGER NOT NULL DEFAULT 0,
+            error_class TEXT,
+            error_message TEXT,
+            latency_ewma REAL,
+            open_until REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (source_type, source_key)
+        )
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS search_cache (
+            query TEXT PRIMARY KEY,
+            fetched_at REAL NOT NULL,
+            response BLOB
+        )
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS quota_usage (
+            provider TEXT NOT NULL,
+            day TEXT NOT NULL,
+            used INTEGER NOT NULL,
+            PRIMARY KEY (provider, day)
+        )
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS rate_limits (
+            provider TEXT PRIMARY KEY,
+            tokens REAL NOT NULL,
+            updated_at REAL NOT NULL,
+            blocked_until REAL NOT NULL DEFAULT 0
+        )
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS data_versions (
+            scope TEXT PRIMARY KEY,
+            version INTEGER NOT NULL,
+            updated_at TEXT NOT NULL
+        )
+        """
+    )
     cursor.execute(
         """
         CREATE TABLE IF NOT EXISTS suggested_people (
@@ -79,6 +322,141 @@ def init_db() -> None:
     )
     conn.commit()
     conn.close()
+    if migrate:
+        migrate_db()
+
+
+def migrate_db() -> None:
+    """Bring data written by older versions up to ``SCHEMA_VERSION``; safe to run while serving."""
+    conn = get_connection()
+    cursor = conn.cursor()
+    version = cursor.execute("PRAGMA user_version").fetchone()[0]
+    if version < 1:
+        migrate_item_payloads(conn)
+    if version < 2:
+        for table in ITEM_CHILD_TABLES:
+            cursor.execute(f"DELETE FROM {table} WHERE item_id NOT IN (SELECT id FROM items)")
+    if version < 3:
+        rebuild_item_rollups(conn)
+    if version < 4:
+        rebuild_content_index(conn)
+    if version < SCHEMA_VERSION:
+        cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    conn.commit()
+    conn.close()
+
+
+def _ensure_columns(cursor: sqlite3.Cursor, table: str, columns: dict[str, str]) -> None:
+    existing = {row[1] for row in cursor.execute(f"PRAGMA table_info({table})").fetchall()}
+    for name, declaration in columns.items():
+        if name not in existing:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {declaration}")
+
+
+def compress_text(text: str | None) -> bytes | None:
+    return zlib.compress(text.encode(), settings.payload_compression_level) if text else None
+
+
+def decompress_text(blob: bytes | None) -> str | None:
+    return zlib.decompress(blob).decode() if blob else None
+
+
+def migrate_item_payloads(conn: sqlite3.Connection, batch_size: int = 2000) -> int:
+    """Move ``content`` and ``metadata_json`` still stored inline on ``items`` into ``item_payloads``.
+
+    Runs in batches so a large database is not held in one transaction. The freed
+    pages stay in the file until ``VACUUM``; returns the number of rows moved.
+    """
+    moved, last_id = 0, 0
+    while True:
+        rows = conn.execute(
+            """
+            SELECT id, content, metadata_json FROM items
+            WHERE id > ? AND (content IS NOT NULL OR metadata_json IS NOT NULL)
+            ORDER BY id LIMIT ?
+            """,
+            (last_id, batch_size),
+        ).fetchall()
+        if not rows:
+            return moved
+        last_id = rows[-1]["id"]
+        conn.executemany(
+            "INSERT OR REPLACE INTO item_payloads (item_id, content, metadata_json) VALUES (?, ?, ?)",
+            [(row["id"], compress_text(row["content"]), compress_text(row["metadata_json"])) for row in rows],
+        )
+        conn.executemany(
+            "UPDATE items SET content = NULL, metadata_json = NULL WHERE id = ?", [(row["id"],) for row in rows]
+        )
+        conn.commit()
+        moved += len(rows)
+
+
+def rebuild_content_index(conn: sqlite3.Connection, batch_size: int = 2000) -> int:
+    """Re-index the content of every payload in ``item_content_fts``, in batches; returns the number indexed."""
+    conn.execute("INSERT INTO item_content_fts (item_content_fts) VALUES ('delete-all')")
+    indexed, last_id = 0, 0
+    while True:
+        rows = conn.execute(
+            "SELECT item_id, content FROM item_payloads WHERE item_id > ? ORDER BY item_id LIMIT ?",
+            (last_id, batch_size),
+        ).fetchall()
+        if not rows:
+            conn.commit()
+            return indexed
+        last_id = rows[-1]["item_id"]
+        indexed += index_content(conn.cursor(), [(row["item_id"], decompress_text(row["content"])) for row in rows])
+        conn.commit()
+
+
+def index_content(cursor: sqlite3.Cursor, rows: Iterable[tuple[int, str | None]]) -> int:
+    """Add ``(item_id, content)`` pairs to the content search index; empty content is skipped."""
+    rows = [(item_id, content) for item_id, content in rows if content]
+    cursor.executemany("INSERT INTO item_content_fts (rowid, content) VALUES (?, ?)", rows)
+    return len(rows)
+
+
+def _unindex_content(cursor: sqlite3.Cursor, ids: list[int]) -> None:
+    # A contentless index can only forget a row given the exact text it indexed.
+    placeholders = ",".join("?" for _ in ids)
+    rows = cursor.execute(
+        f"SELECT item_id, content FROM item_payloads WHERE item_id IN ({placeholders}) AND content IS NOT NULL", ids
+    ).fetchall()
+    cursor.executemany(
+        "INSERT INTO item_content_fts (item_content_fts, rowid, content) VALUES ('delete', ?, ?)",
+        [(row["item_id"], decompress_text(row["content"])) for row in rows],
+    )
+
+
+def _search_sql(text: str) -> tuple[str, list]:
+    """Substring match on title and excerpt, word match (last word as a prefix) on the full content."""
+    like = f"%{text}%"
+    words = re.findall(r"\w+", text)
+    if not words:
+        return "(title LIKE ? OR excerpt LIKE ?)", [like, like]
+    return (
+        "(title LIKE ? OR excerpt LIKE ? OR id IN (SELECT rowid FROM item_content_fts WHERE item_content_fts MATCH ?))",
+        [like, like, '"' + " ".join(words) + '"*'],
+    )
+
+
+def load_payloads(item_ids: Iterable[int]) -> dict[int, dict]:
+    """Decompressed ``content`` and ``metadata`` for the given items; missing ids are omitted."""
+    item_ids = list(item_ids)
+    if not item_ids:
+        return {}
+    conn = get_connection()
+    placeholders = ",".join("?" for _ in item_ids)
+    rows = conn.execute(
+        f"SELECT item_id, content, metadata_json FROM item_payloads WHERE item_id IN ({placeholders})", item_ids
+    ).fetchall()
+    conn.close()
+    return {
+        row["item_id"]: {
+            "content": decompress_text(row["content"]),
+            "metadata": json.loads(decompress_text(row["metadata_json"]) or "{}"),
+        }
+        for row in rows
+    }
 
 
 def upsert_watchlist(entries: Iterable[dict]) -> None:
@@ -103,11 +481,17 @@ def upsert_watchlist(entries: Iterable[dict]) -> None:
                 datetime.utcnow().isoformat(),
             ),
         )
+    bump_data_version(cursor, "watchlist")
     conn.commit()
     conn.close()
 
 
 def insert_item(item: dict) -> int | None:
+    with DB_WRITE_SECONDS.time(operation="insert_item"):
+        return _insert_item(item)
+
+
+def _insert_item(item: dict) -> int | None:
     conn = get_connection()
     cursor = conn.cursor()
     try:
@@ -115,8 +499,9 @@ def insert_item(item: dict) -> int | None:
             """
             INSERT INTO items
             (source_type, title, url, author, published_at, ingested_at, excerpt, content,
-             summary, analysis, score, tags, metadata_json, dedupe_hash)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+             summary, analysis, score, tags, metadata_json, dedupe_hash,
+             canonical_url, cluster_id, minhash, score_adjust)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
             (
                 item["source_type"],
@@ -126,21 +511,39 @@ def insert_item(item: dict) -> int | None:
                 item.get("published_at"),
                 item.get("ingested_at", datetime.utcnow().isoformat()),
                 item.get("excerpt"),
-                item.get("content"),
+                None,
                 item.get("summary"),
                 item.get("analysis"),
                 item.get("score", 0.0),
                 ",".join(item.get("tags", [])),
-                json.dumps(item.get("metadata", {})),
+                None,
                 item.get("dedupe_hash"),
+                item.get("canonical_url"),
+                item.get("cluster_id"),
+                item.get("minhash"),
+                item.get("score_adjust", 0.0),
             ),
         )
         item_id = cursor.lastrowid
+        # Transcripts and raw API payloads live compressed in item_payloads, off the hot row.
+        metadata = item.get("metadata")
+        if item.get("content") or metadata:
+            cursor.execute(
+                "INSERT INTO item_payloads (item_id, content, metadata_json) VALUES (?, ?, ?)",
+                (item_id, compress_text(item.get("content")), compress_text(json.dumps(metadata) if metadata else None)),
+            )
+            index_content(cursor, [(item_id, item.get("content"))])
         for tag in item.get("tags", []):
             cursor.execute(
                 "INSERT INTO item_tags (item_id, tag) VALUES (?, ?)",
                 (item_id, tag),
             )
+        cursor.executemany(
+            "INSERT INTO item_fingerprints (item_id, key) VALUES (?, ?)",
+            [(item_id, key) for key in item.get("fingerprint_keys", [])],
+        )
+        apply_item_rollups(cursor, "items.id = ?", [item_id])
+        bump_data_version(cursor, "items")
         conn.commit()
         return item_id
     except sqlite3.IntegrityError:
@@ -153,7 +556,13 @@ def insert_item(item: dict) -> int | None:
 def query_items(filters: dict) -> list[sqlite3.Row]:
     conn = get_connection()
     cursor = conn.cursor()
-    query = "SELECT * FROM items WHERE 1=1"
+    query = """
+        SELECT items.*,
+               1 + (SELECT COUNT(*) FROM items AS members WHERE members.cluster_id = items.id)
+               AS cluster_size
+        FROM items
+        WHERE cluster_id IS NULL
+    """
     params: list = []
 
     if filters.get("source_type"):
@@ -171,9 +580,13 @@ def query_items(filters: dict) -> list[sqlite3.Row]:
     if filters.get("tags"):
         query += " AND tags LIKE ?"
         params.append(f"%{filters['tags']}%")
-    if filters.get("search"):
-        query += " AND (title LIKE ? OR excerpt LIKE ? OR content LIKE ?)"
-        params.extend([f"%{filters['search']}%"] * 3)
+    if filters.get("ids") is not None:
+        query += f" AND id IN ({','.join('?' for _ in filters['ids'])})"
+        params.extend(filters["ids"])
+    elif filters.get("search"):
+        clause, search_params = _search_sql(filters["search"])
+        query += f" AND {clause}"
+        params.extend(search_params)
 
     sort = filters.get("sort")
     if sort == "published_at_desc":
@@ -182,39 +595,755 @@ def query_items(filters: dict) -> list[sqlite3.Row]:
         query += " ORDER BY published_at DESC NULLS LAST, ingested_at DESC"
     rows = cursor.execute(query, params).fetchall()
     conn.close()
+    if filters.get("ids") is not None:
+        rank = {item_id: index for index, item_id in enumerate(filters["ids"])}
+        rows.sort(key=lambda row: rank[row["id"]])
     return rows
 
 
-def get_item(item_id: int) -> sqlite3.Row | None:
+def get_item(item_id: int) -> dict | None:
+    """One item with its content and metadata loaded from ``item_payloads``."""
     conn = get_connection()
     cursor = conn.cursor()
     row = cursor.execute("SELECT * FROM items WHERE id = ?", (item_id,)).fetchone()
     conn.close()
+    if not row:
+        return None
+    item = dict(row)
+    # Rows not yet moved by migrate_db still carry their payload inline.
+    item["metadata"] = json.loads(item.pop("metadata_json") or "{}")
+    item.update(load_payloads([item_id]).get(item_id, {}))
+    return item
+
+
+ITEM_FIELDS = (
+    "id", "source_type", "title", "url", "author", "published_at", "ingested_at", "excerpt",
+    "summary", "summary_zh", "analysis", "score", "tags", "canonical_url", "cluster_id",
+)
+PAYLOAD_FIELDS = ("content", "metadata")
+
+
+def _item_filter_sql(filters: dict) -> tuple[str, list]:
+    clauses: list[str] = []
+    params: list = []
+    if filters.get("source_type"):
+        clauses.append("source_type = ?")
+        params.append(filters["source_type"])
+    if filters.get("tag"):
+        clauses.append("id IN (SELECT item_id FROM item_tags WHERE tag = ?)")
+        params.append(filters["tag"])
+    if filters.get("min_score") is not None:
+        clauses.append("score >= ?")
+        params.append(filters["min_score"])
+    if filters.get("since"):
+        clauses.append("published_at >= ?")
+        params.append(filters["since"])
+    if filters.get("until"):
+        clauses.append("published_at < ?")
+        params.append(filters["until"])
+    if filters.get("search"):
+        clause, search_params = _search_sql(filters["search"])
+        clauses.append(clause)
+        params.extend(search_params)
+    if filters.get("leaders_only"):
+        clauses.append("cluster_id IS NULL")
+    if filters.get("before_id") is not None:
+        clauses.append("id < ?")
+        params.append(filters["before_id"])
+    return " AND ".join(clauses) or "1", params
+
+
+def iter_items(
+    filters: dict, fields: Iterable[str] = ITEM_FIELDS, limit: int | None = None, batch_size: int = 1000
+) -> Iterator[dict]:
+    """Matching items, newest id first, as dicts of ``fields`` (``id`` is always included).
+
+    Rows are read ``batch_size`` at a time as keyset pages on ``before_id``, each
+    page a short read that has finished before its rows are yielded. A slow
+    consumer (an export streaming to a client) therefore holds no lock between
+    pages, and writers are not kept waiting. ``filters["before_id"]`` continues
+    after a page. The connection may be resumed from any thread, as Starlette
+    does when streaming.
+    """
+    fields = ["id"] + [field for field in dict.fromkeys(fields) if field != "id"]
+    unknown = set(fields) - set(ITEM_FIELDS) - set(PAYLOAD_FIELDS)
+    if unknown:
+        raise ValueError(f"unknown item fields: {', '.join(sorted(unknown))}")
+    columns = [f"items.{field}" for field in fields if field in ITEM_FIELDS]
+    join = ""
+    if any(field in PAYLOAD_FIELDS for field in fields):
+        columns += [
+            "items.content AS inline_content",
+            "items.metadata_json AS inline_metadata",
+            "item_payloads.content AS payload_content",
+            "item_payloads.metadata_json AS payload_metadata",
+        ]
+        join = " LEFT JOIN item_payloads ON item_payloads.item_id = items.id"
+    page_filters = dict(filters)
+    remaining = limit
+    conn = get_connection(check_same_thread=False)
+    try:
+        while remaining is None or remaining > 0:
+            where, params = _item_filter_sql(page_filters)
+            page_size = batch_size if remaining is None else min(batch_size, remaining)
+            rows = conn.execute(
+                f"SELECT {', '.join(columns)} FROM items{join} WHERE {where} "
+                "ORDER BY items.id DESC LIMIT ?",
+                [*params, page_size],
+            ).fetchall()
+            for row in rows:
+                item = {field: row[field] for field in fields if field in ITEM_FIELDS}
+                if "tags" in item:
+                    item["tags"] = [tag for tag in (item["tags"] or "").split(",") if tag]
+                if "content" in fields:
+                    # Rows not yet moved by migrate_db still carry their payload inline.
+                    payload = row["payload_content"]
+                    item["content"] = decompress_text(payload) if payload is not None else row["inline_content"]
+                if "metadata" in fields:
+                    payload = row["payload_metadata"]
+                    raw = decompress_text(payload) if payload is not None else row["inline_metadata"]
+                    item["metadata"] = json.loads(raw or "{}")
+                yield item
+            if len(rows) < page_size:
+                return
+            page_filters["before_id"] = rows[-1]["id"]
+            if remaining is not None:
+                remaining -= len(rows)
+    finally:
+        conn.close()
+
+
+ROLLUP_DIMENSIONS = ("source", "author", "tag")
+# One row per item and dimension; "all" is the per-day total.
+_ROLLUP_ROWS = """
+    SELECT substr(coalesce(nullif(published_at, ''), ingested_at), 1, 10) AS day, 'all' AS dimension, '' AS value,
+           score FROM items WHERE {where}
+    UNION ALL
+    SELECT substr(coalesce(nullif(published_at, ''), ingested_at), 1, 10), 'source', source_type, score
+    FROM items WHERE {where}
+    UNION ALL
+    SELECT substr(coalesce(nullif(published_at, ''), ingested_at), 1, 10), 'author', coalesce(author, ''), score
+    FROM items WHERE {where}
+    UNION ALL
+    SELECT substr(coalesce(nullif(published_at, ''), ingested_at), 1, 10), 'tag', item_tags.tag, score
+    FROM items JOIN item_tags ON item_tags.item_id = items.id WHERE {where}
+"""
+
+
+def apply_item_rollups(cursor: sqlite3.Cursor, where: str, params: list, sign: int = 1) -> None:
+    """Add (``sign=1``) or remove (``-1``) the items matching ``where`` in ``item_rollups``.
+
+    Runs in the caller's transaction, so the rollups move together with the rows.
+    """
+    cursor.execute(
+        f"""
+        INSERT INTO item_rollups (day, dimension, value, bucket, items, score_sum)
+        SELECT day, dimension, value, CAST(round(coalesce(score, 0) * 10, 6) AS INTEGER) AS bucket,
+               ? * COUNT(*), ? * SUM(coalesce(score, 0))
+        FROM ({_ROLLUP_ROWS.format(where=where)}) WHERE true
+        GROUP BY day, dimension, value, bucket
+        ON CONFLICT (dimension, day, value, bucket) DO UPDATE SET
+            items = items + excluded.items, score_sum = score_sum + excluded.score_sum
+        """,
+        [sign, sign, *params * 4],
+    )
+    if sign < 0:
+        cursor.execute("DELETE FROM item_rollups WHERE items <= 0")
+
+
+def rebuild_item_rollups(conn: sqlite3.Connection | None = None) -> None:
+    """Recompute ``item_rollups`` from ``items``, e.g. after a rescore moved scores."""
+    own = conn is None
+    conn = conn or get_connection()
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM item_rollups")
+    apply_item_rollups(cursor, "1", [])
+    conn.commit()
+    if own:
+        conn.close()
+
+
+def _bucket_percentile(buckets: list[tuple[int, int]], fraction: float) -> float | None:
+    """Percentile of a sorted 0.1-wide score histogram, interpolated inside the bucket it falls in."""
+    total = sum(count for _, count in buckets)
+    if total <= 0:
+        return None
+    rank = fraction * total
+    seen = 0
+    for bucket, count in buckets:
+        if seen + count >= rank:
+            return round((bucket + (rank - seen) / count) / 10, 2)
+        seen += count
+    return round((buckets[-1][0] + 1) / 10, 2)
+
+
+def item_rollup_stats(
+    dimension: str | None = None,
+    by_day: bool = True,
+    since: str | None = None,
+    until: str | None = None,
+) -> list[dict]:
+    """Item count, mean and p50/p90 score per day and/or per ``dimension`` value, from ``item_rollups``.
+
+    ``dimension=None`` groups by day only. Days are ``YYYY-MM-DD`` of ``published_at``
+    (``ingested_at`` when missing); ``since`` and ``until`` bound them inclusively.
+    """
+    if dimension is not None and dimension not in ROLLUP_DIMENSIONS:
+        raise ValueError(f"unknown rollup dimension: {dimension}")
+    keys = (["day"] if by_day or dimension is None else []) + (["value"] if dimension else [])
+    query = f"SELECT {', '.join(keys)}, bucket, SUM(items), SUM(score_sum) FROM item_rollups WHERE dimension = ?"
+    params: list = [dimension or "all"]
+    if since:
+        query += " AND day >= ?"
+        params.append(since[:10])
+    if until:
+        query += " AND day <= ?"
+        params.append(until[:10])
+    query += f" GROUP BY {', '.join(keys)}, bucket ORDER BY {', '.join(keys)}, bucket"
+    conn = get_connection()
+    rows = conn.execute(query, params).fetchall()
+    conn.close()
+
+    groups: dict[tuple, dict] = {}
+    for row in rows:
+        key = tuple(row[: len(keys)])
+        group = groups.setdefault(key, {"buckets": [], "items": 0, "score_sum": 0.0})
+        bucket, items, score_sum = row[len(keys):]
+        group["buckets"].append((bucket, items))
+        group["items"] += items
+        group["score_sum"] += score_sum
+    stats = []
+    for key, group in groups.items():
+        if group["items"] <= 0:
+            continue
+        entry = dict(zip(["day" if name == "day" else dimension for name in keys], key))
+        entry.update(
+            items=group["items"],
+            avg_score=round(group["score_sum"] / group["items"], 3),
+            p50_score=_bucket_percentile(group["buckets"], 0.5),
+            p90_score=_bucket_percentile(group["buckets"], 0.9),
+        )
+        stats.append(entry)
+    return stats
+
+
+def list_tag_counts() -> list[sqlite3.Row]:
+    conn = get_connection()
+    rows = conn.execute(
+        "SELECT tag, COUNT(*) AS items FROM item_tags GROUP BY tag ORDER BY items DESC, tag"
+    ).fetchall()
+    conn.close()
+    return rows
+
+
+def record_ingest_run(run: dict) -> None:
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        INSERT INTO ingest_runs
+        (started_at, finished_at, duration_seconds, mode, watchlist_len, fetched_count,
+         inserted_count, breakdown_json)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (
+            run["started_at"],
+            run["finished_at"],
+            run["duration_seconds"],
+            run["mode"],
+            run.get("watchlist_len"),
+            run.get("fetched_count"),
+            run.get("inserted_count"),
+            json.dumps(run.get("breakdown", {})),
+        ),
+    )
+    conn.commit()
+    conn.close()
+
+
+def list_ingest_runs(limit: int = 20) -> list[sqlite3.Row]:
+    conn = get_connection()
+    cursor = conn.cursor()
+    rows = cursor.execute("SELECT * FROM ingest_runs ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+    conn.close()
+    return rows
+
+
+def get_report_artifact(days: int, fmt: str, watermark: str) -> sqlite3.Row | None:
+    conn = get_connection()
+    cursor = conn.cursor()
+    row = cursor.execute(
+        "SELECT * FROM report_artifacts WHERE days = ? AND format = ? AND watermark = ?",
+        (days, fmt, watermark),
+    ).fetchone()
+    if row:
+        cursor.execute(
+            "UPDATE report_artifacts SET last_accessed_at = ? WHERE days = ? AND format = ? AND watermark = ?",
+            (utc_now().isoformat(), days, fmt, watermark),
+        )
+        conn.commit()
+    conn.close()
     return row
 
 
-def cleanup_old_items(now: datetime | None = None) -> int:
+def record_report_artifact(days: int, fmt: str, watermark: str, path: str, size_bytes: int) -> None:
+    now = utc_now().isoformat()
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        INSERT OR REPLACE INTO report_artifacts
+        (days, format, watermark, path, size_bytes, created_at, last_accessed_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+        (days, fmt, watermark, path, size_bytes, now, now),
+    )
+    conn.commit()
+    conn.close()
+
+
+def evict_report_artifacts(max_bytes: int, max_files: int, keep_watermark: str | None = None) -> list[str]:
+    """Drop least recently used artifacts beyond the caps; returns the evicted paths."""
+    conn = get_connection()
+    cursor = conn.cursor()
+    rows = cursor.execute(
+        "SELECT rowid, watermark, path, size_bytes FROM report_artifacts ORDER BY last_accessed_at DESC"
+    ).fetchall()
+    total = 0
+    kept = 0
+    evicted: list[tuple[int, str]] = []
+    for row in rows:
+        if row["watermark"] == keep_watermark or (
+            total + row["size_bytes"] <= max_bytes and kept < max_files
+        ):
+            total += row["size_bytes"]
+            kept += 1
+            continue
+        evicted.append((row["rowid"], row["path"]))
+    cursor.executemany("DELETE FROM report_artifacts WHERE rowid = ?", [(rowid,) for rowid, _ in evicted])
+    conn.commit()
+    conn.close()
+    return [path for _, path in evicted]
+
+
+def list_cluster_members(item_id: int) -> list[sqlite3.Row]:
+    conn = get_connection()
+    cursor = conn.cursor()
+    rows = cursor.execute(
+        """
+        SELECT id, source_type, title, url, author, published_at
+        FROM items
+        WHERE cluster_id = ?
+        ORDER BY published_at DESC
+        """,
+        (item_id,),
+    ).fetchall()
+    conn.close()
+    return rows
+
+
+ITEM_CHILD_TABLES = ("item_tags", "item_fingerprints", "item_payloads", "digest_candidates", "summary_failures")
+
+
+def cleanup_old_items(
+    now: datetime | None = None,
+    batch_size: int | None = None,
+    archive: Callable[[list[dict]], None] | None = None,
+    promoted: list[int] | None = None,
+) -> int:
+    """Delete items outside the retention window in short transactions of ``batch_size`` rows.
+
+    Each batch removes the items' tags, fingerprints, payloads and digest candidates
+    with them and promotes a new leader for any cluster that lost its one. When
+    ``archive`` is given it receives every batch (with payloads and tags) before the
+    delete is committed. The ids of promoted leaders are appended to ``promoted``;
+    they have no embedding yet. Freed pages are returned with an incremental vacuum.
+    """
     now = now or utc_now()
     retention_cutoff = now - timedelta(days=settings.content_max_age_days)
     min_date_cutoff = combine_date_utc(settings.content_min_date)
+    # Blank and whitespace-only strings sort before any ISO date, so one range covers them.
+    cutoff = max(retention_cutoff, min_date_cutoff).isoformat()
+    batch_size = batch_size or settings.cleanup_batch_size
+    conn = get_connection()
+    cursor = conn.cursor()
+    deleted = 0
+    while True:
+        ids = [
+            row[0]
+            for row in cursor.execute(
+                "SELECT id FROM items WHERE published_at IS NULL OR published_at < ? LIMIT ?",
+                (cutoff, batch_size),
+            )
+        ]
+        if not ids:
+            break
+        placeholders = ",".join("?" for _ in ids)
+        if archive is not None:
+            archive(_archive_rows(cursor, ids))
+        apply_item_rollups(cursor, f"items.id IN ({placeholders})", ids, sign=-1)
+        _unindex_content(cursor, ids)
+        for table in ITEM_CHILD_TABLES:
+            cursor.execute(f"DELETE FROM {table} WHERE item_id IN ({placeholders})", ids)
+        cursor.execute(f"DELETE FROM items WHERE id IN ({placeholders})", ids)
+        new_leaders = _promote_orphaned_clusters(cursor, ids)
+        if promoted is not None:
+            promoted.extend(new_leaders)
+        bump_data_version(cursor, "items")
+        conn.commit()
+        deleted += len(ids)
+    try:
+        incremental_vacuum(conn)
+    except sqlite3.OperationalError:
+        # The deletes are committed; the free pages are returned by a later cleanup.
+        LOGGER.warning("cleanup_vacuum_failed", exc_info=True)
+    conn.close()
+    return deleted
+
+
+def _archive_rows(cursor: sqlite3.Cursor, ids: list[int]) -> list[dict]:
+    placeholders = ",".join("?" for _ in ids)
+    rows = [
+        dict(row) for row in cursor.execute(f"SELECT * FROM items WHERE id IN ({placeholders})", ids).fetchall()
+    ]
+    tags: dict[int, list[str]] = {}
+    for item_id, tag in cursor.execute(
+        f"SELECT item_id, tag FROM item_tags WHERE item_id IN ({placeholders})", ids
+    ).fetchall():
+        tags.setdefault(item_id, []).append(tag)
+    payloads = load_payloads(ids)
+    for row in rows:
+        row.pop("content", None)
+        row.pop("metadata_json", None)
+        row["tags"] = tags.get(row["id"], [])
+        row.update(payloads.get(row["id"], {"content": None, "metadata": {}}))
+    return rows
+
+
+def _promote_orphaned_clusters(cursor: sqlite3.Cursor, leader_ids: list[int]) -> list[int]:
+    """Make the oldest remaining member of each deleted leader's cluster its leader; returns the new leaders."""
+    placeholders = ",".join("?" for _ in leader_ids)
+    orphaned = cursor.execute(
+        f"""
+        SELECT cluster_id, MIN(id) FROM items
+        WHERE cluster_id IN ({placeholders})
+        GROUP BY cluster_id
+        """,
+        leader_ids,
+    ).fetchall()
+    for old_leader, new_leader in orphaned:
+        cursor.execute("UPDATE items SET cluster_id = ? WHERE cluster_id = ?", (new_leader, old_leader))
+        cursor.execute("UPDATE items SET cluster_id = NULL WHERE id = ?", (new_leader,))
+    return [new_leader for _, new_leader in orphaned]
+
+
+def incremental_vacuum(conn: sqlite3.Connection, pages_per_step: int = 2000) -> int:
+    """Return free pages to the filesystem a step at a time; a no-op unless auto_vacuum is INCREMENTAL."""
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+        return 0
+    freed = 0
+    while (free := conn.execute("PRAGMA freelist_count").fetchone()[0]) > 0:
+        # The pragma frees one page per step; executescript steps it to completion.
+        conn.executescript(f"PRAGMA incremental_vacuum({min(free, pages_per_step)});")
+        freed += min(free, pages_per_step)
+    return freed
+
+
+def acquire_lease(name: str, holder: str, ttl_seconds: float, now: float | None = None) -> bool:
+    """Take or renew lease ``name`` for ``ttl_seconds``; fails while another holder's lease is unexpired."""
+    now = time.time() if now is None else now
     conn = get_connection()
     cursor = conn.cursor()
     cursor.execute(
         """
-        DELETE FROM items
-        WHERE published_at IS NULL
-           OR TRIM(published_at) = ''
-           OR published_at < ?
-           OR published_at < ?
+        INSERT INTO leases (name, holder, expires_at) VALUES (?, ?, ?)
+        ON CONFLICT(name) DO UPDATE SET holder = excluded.holder, expires_at = excluded.expires_at
+        WHERE leases.holder = excluded.holder OR leases.expires_at < ?
         """,
-        (min_date_cutoff.isoformat(), retention_cutoff.isoformat()),
+        (name, holder, now + ttl_seconds, now),
+    )
+    acquired = cursor.rowcount == 1
+    conn.commit()
+    conn.close()
+    return acquired
+
+
+def release_lease(name: str, holder: str) -> None:
+    conn = get_connection()
+    conn.execute("DELETE FROM leases WHERE name = ? AND holder = ?", (name, holder))
+    conn.commit()
+    conn.close()
+
+
+SOURCE_HEALTH_COLUMNS = (
+    "source_type", "source_key", "last_success_at", "last_failure_at", "consecutive_failures",
+    "error_class", "error_message", "latency_ewma", "open_until",
+)
+
+
+def get_source_health(source_type: str, source_key: str) -> dict | None:
+    conn = get_connection()
+    row = conn.execute(
+        "SELECT * FROM source_health WHERE source_type = ? AND source_key = ?", (source_type, source_key)
+    ).fetchone()
+    conn.close()
+    return dict(row) if row else None
+
+
+def save_source_health(health: dict) -> None:
+    conn = get_connection()
+    conn.execute(
+        f"INSERT OR REPLACE INTO source_health ({', '.join(SOURCE_HEALTH_COLUMNS)}) "
+        f"VALUES ({', '.join('?' for _ in SOURCE_HEALTH_COLUMNS)})",
+        [health.get(column) for column in SOURCE_HEALTH_COLUMNS],
     )
-    deleted = cursor.rowcount
+    conn.commit()
+    conn.close()
+
+
+def list_source_health() -> list[sqlite3.Row]:
+    """Failing sources first (most consecutive failures), then the rest by type and key."""
+    conn = get_connection()
+    rows = conn.execute(
+        "SELECT * FROM source_health ORDER BY consecutive_failures DESC, source_type, source_key"
+    ).fetchall()
+    conn.close()
+    return rows
+
+
+def search_fetch_times(queries: Iterable[str]) -> dict[str, float]:
+    """When each of ``queries`` was last fetched (epoch seconds); absent if never."""
+    queries = list(queries)
+    if not queries:
+        return {}
+    placeholders = ",".join("?" for _ in queries)
+    conn = get_connection()
+    rows = conn.execute(
+        f"SELECT query, fetched_at FROM search_cache WHERE query IN ({placeholders})", queries
+    ).fetchall()
+    conn.close()
+    return {row["query"]: row["fetched_at"] for row in rows}
+
+
+def load_search_response(query: str, max_age_seconds: float, now: float | None = None) -> list | None:
+    now = time.time() if now is None else now
+    conn = get_connection()
+    row = conn.execute(
+        "SELECT response FROM search_cache WHERE query = ? AND fetched_at > ?", (query, now - max_age_seconds)
+    ).fetchone()
+    conn.close()
+    return json.loads(decompress_text(row["response"])) if row else None
+
+
+def store_search_response(query: str, entries: list, now: float | None = None) -> None:
+    now = time.time() if now is None else now
+    conn = get_connection()
+    conn.execute(
+        "INSERT OR REPLACE INTO search_cache (query, fetched_at, response) VALUES (?, ?, ?)",
+        (query, now, compress_text(json.dumps(entries))),
+    )
+    conn.commit()
+    conn.close()
+
+
+def prune_search_cache(max_age_seconds: float, now: float | None = None) -> int:
+    """Forget queries not fetched for ``max_age_seconds``, e.g. ones regrouped by a watchlist edit."""
+    now = time.time() if now is None else now
+    conn = get_connection()
+    deleted = conn.execute("DELETE FROM search_cache WHERE fetched_at < ?", (now - max_age_seconds,)).rowcount
     conn.commit()
     conn.close()
     return deleted
 
 
+def reserve_quota(provider: str, day: str, limit: int | None, units: int = 1) -> bool:
+    """Count ``units`` against ``provider``'s quota for ``day``; ``False`` (nothing counted) if that passes ``limit``.
+
+    With ``limit=None`` the units are only counted.
+    """
+    if limit is not None and units > limit:
+        return False
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        INSERT INTO quota_usage (provider, day, used) VALUES (?, ?, ?)
+        ON CONFLICT(provider, day) DO UPDATE SET used = used + excluded.used
+        WHERE ? IS NULL OR used + excluded.used <= ?
+        """,
+        (provider, day, units, limit, limit),
+    )
+    reserved = cursor.rowcount == 1
+    conn.commit()
+    conn.close()
+    return reserved
+
+
+def exhaust_quota(provider: str, day: str, limit: int) -> None:
+    """Mark ``provider``'s quota for ``day`` as used up, e.g. after the provider itself said so."""
+    conn = get_connection()
+    conn.execute(
+        """
+        INSERT INTO quota_usage (provider, day, used) VALUES (?, ?, ?)
+        ON CONFLICT(provider, day) DO UPDATE SET used = max(used, excluded.used)
+        """,
+        (provider, day, limit),
+    )
+    conn.commit()
+    conn.close()
+
+
+def quota_used(provider: str, day: str) -> int:
+    conn = get_connection()
+    row = conn.execute("SELECT used FROM quota_usage WHERE provider = ? AND day = ?", (provider, day)).fetchone()
+    conn.close()
+    return row["used"] if row else 0
+
+
+def take_rate_token(provider: str, per_minute: float, burst: float, now: float | None = None) -> float:
+    """Take one request token from ``provider``'s bucket: 0 if taken, else the seconds until one is due.
+
+    The bucket refills at ``per_minute`` tokens a minute up to ``burst`` and stays
+    empty until ``blocked_until``. The refill and the take are one statement, so
+    every thread and process sharing the database draws from the same bucket.
+    """
+    now = time.time() if now is None else now
+    rate = per_minute / 60
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        INSERT INTO rate_limits (provider, tokens, updated_at, blocked_until) VALUES (?, ?, ?, 0)
+        ON CONFLICT(provider) DO UPDATE SET
+            tokens = min(?, tokens + max(0, excluded.updated_at - updated_at) * ?) - 1,
+            updated_at = max(updated_at, excluded.updated_at)
+        WHERE blocked_until <= excluded.updated_at
+            AND min(?, tokens + max(0, excluded.updated_at - updated_at) * ?) >= 1
+        """,
+        (provider, burst - 1, now, burst, rate, burst, rate),
+    )
+    if cursor.rowcount == 1:
+        conn.commit()
+        conn.close()
+        return 0.0
+    row = cursor.execute(
+        "SELECT tokens, updated_at, blocked_until FROM rate_limits WHERE provider = ?", (provider,)
+    ).fetchone()
+    conn.close()
+    tokens = min(burst, row["tokens"] + max(0.0, now - row["updated_at"]) * rate)
+    # Never 0: another process may have taken the token between the two statements.
+    return max(row["blocked_until"] - now, (1 - tokens) / rate, 0.01)
+
+
+def update_rate_limit(
+    provider: str, remaining: float | None = None, blocked_until: float | None = None, now: float | None = None
+) -> None:
+    """Apply what a provider reported: at most ``remaining`` tokens, and none before ``blocked_until``.
+
+    ``remaining`` is the count as of ``now``, so it also moves the bucket's refill
+    clock to ``now``; otherwise the next take would refill from before the report.
+    """
+    now = time.time() if now is None else now
+    conn = get_connection()
+    conn.execute(
+        """
+        INSERT INTO rate_limits (provider, tokens, updated_at, blocked_until)
+        VALUES (?, coalesce(?, 0), ?, coalesce(?, 0))
+        ON CONFLICT(provider) DO UPDATE SET
+            tokens = min(tokens, coalesce(?, tokens)),
+            updated_at = CASE WHEN ? IS NULL THEN updated_at ELSE max(updated_at, excluded.updated_at) END,
+            blocked_until = max(blocked_until, excluded.blocked_until)
+        """,
+        (provider, remaining, now, blocked_until, remaining, remaining),
+    )
+    conn.commit()
+    conn.close()
+
+
+def get_rate_limits() -> dict[str, sqlite3.Row]:
+    conn = get_connection()
+    rows = conn.execute("SELECT * FROM rate_limits").fetchall()
+    conn.close()
+    return {row["provider"]: row for row in rows}
+
+
+def bump_data_version(cursor: sqlite3.Cursor, scope: str) -> None:
+    """Mark ``scope`` ("items" or "watchlist") as changed, in the caller's transaction."""
+    cursor.execute(
+        """
+        INSERT INTO data_versions (scope, version, updated_at) VALUES (?, 1, ?)
+        ON CONFLICT(scope) DO UPDATE SET version = version + 1, updated_at = excluded.updated_at
+        """,
+        (scope, utc_now().isoformat()),
+    )
+
+
+def get_data_versions(scopes: Iterable[str]) -> dict[str, tuple[int, str | None]]:
+    """``(version, updated_at)`` per scope; ``(0, None)`` for one never written."""
+    scopes = list(scopes)
+    placeholders = ",".join("?" for _ in scopes)
+    conn = get_connection()
+    rows = conn.execute(
+        f"SELECT scope, version, updated_at FROM data_versions WHERE scope IN ({placeholders})", scopes
+    ).fetchall()
+    conn.close()
+    found = {row["scope"]: (row["version"], row["updated_at"]) for row in rows}
+    return {scope: found.get(scope, (0, None)) for scope in scopes}
+
+
+def queue_backfill(entry_id: int) -> None:
+    """Ask the scheduler's lease holder to fetch a new watchlist entry's sources."""
+    conn = get_connection()
+    conn.execute(
+        "INSERT OR IGNORE INTO pending_backfills (entry_id, queued_at) VALUES (?, ?)",
+        (entry_id, datetime.utcnow().isoformat()),
+    )
+    conn.commit()
+    conn.close()
+
+
+def list_pending_backfills() -> list[dict]:
+    """Queued watchlist entries, oldest first; entries deleted since are dropped from the queue."""
+    conn = get_connection()
+    conn.execute("DELETE FROM pending_backfills WHERE entry_id NOT IN (SELECT id FROM watchlist_entries)")
+    conn.commit()
+    rows = conn.execute(
+        """
+        SELECT w.id, w.name, w.entry_type, w.lab, w.x_handle, w.website, w.youtube_channel, w.rss_url
+        FROM pending_backfills p JOIN watchlist_entries w ON w.id = p.entry_id
+        ORDER BY p.queued_at, p.entry_id
+        """
+    ).fetchall()
+    conn.close()
+    return [dict(row) for row in rows]
+
+
+def finish_backfill(entry_id: int) -> None:
+    conn = get_connection()
+    conn.execute("DELETE FROM pending_backfills WHERE entry_id = ?", (entry_id,))
+    conn.commit()
+    conn.close()
+
+
+def queue_job(name: str) -> None:
+    """Ask the scheduler's lease holder to run job ``name``; requests made before it runs collapse into one."""
+    conn = get_connection()
+    conn.execute(
+        "INSERT OR IGNORE INTO queued_jobs (name, queued_at) VALUES (?, ?)", (name, datetime.utcnow().isoformat())
+    )
+    conn.commit()
+    conn.close()
+
+
+def take_queued_job(name: str) -> bool:
+    """Claim a queued request for job ``name``; ``False`` if none is waiting."""
+    conn = get_connection()
+    taken = conn.execute("DELETE FROM queued_jobs WHERE name = ?", (name,)).rowcount == 1
+    conn.commit()
+    conn.close()
+    return taken
+
+
 def list_watchlist() -> list[sqlite3.Row]:
     conn = get_connection()
     cursor = conn.cursor()
@@ -223,6 +1352,90 @@ def list_watchlist() -> list[sqlite3.Row]:
     return rows
 
 
+def add_subscriber(
+    email: str,
+    name: str | None = None,
+    tags: Iterable[str] = (),
+    min_score: float = 0,
+    max_items: int = 12,
+) -> None:
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        INSERT INTO subscribers (email, name, tags, min_score, max_items, active, created_at)
+        VALUES (?, ?, ?, ?, ?, 1, ?)
+        ON CONFLICT(email) DO UPDATE SET
+            name = excluded.name, tags = excluded.tags, min_score = excluded.min_score,
+            max_items = excluded.max_items, active = 1
+        """,
+        (email.strip(), name, ",".join(tags), min_score, max_items, datetime.utcnow().isoformat()),
+    )
+    conn.commit()
+    conn.close()
+
+
+def set_subscriber_active(subscriber_id: int, active: bool) -> None:
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("UPDATE subscribers SET active = ? WHERE id = ?", (int(active), subscriber_id))
+    conn.commit()
+    conn.close()
+
+
+def list_subscribers(active_only: bool = False) -> list[sqlite3.Row]:
+    conn = get_connection()
+    cursor = conn.cursor()
+    query = "SELECT * FROM subscribers"
+    if active_only:
+        query += " WHERE active = 1"
+    rows = cursor.execute(f"{query} ORDER BY email").fetchall()
+    conn.close()
+    return rows
+
+
+def get_delivery_statuses(digest_date: str) -> dict[str, str]:
+    conn = get_connection()
+    cursor = conn.cursor()
+    rows = cursor.execute(
+        "SELECT email, status FROM digest_deliveries WHERE digest_date = ?", (digest_date,)
+    ).fetchall()
+    conn.close()
+    return {row["email"]: row["status"] for row in rows}
+
+
+def record_delivery(
+    digest_date: str, email: str, status: str, attempts: int, item_count: int, error: str | None = None
+) -> None:
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        INSERT INTO digest_deliveries (digest_date, email, status, attempts, item_count, last_error, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(digest_date, email) DO UPDATE SET
+            status = excluded.status,
+            attempts = digest_deliveries.attempts + excluded.attempts,
+            item_count = excluded.item_count,
+            last_error = excluded.last_error,
+            updated_at = excluded.updated_at
+        """,
+        (digest_date, email, status, attempts, item_count, error, datetime.utcnow().isoformat()),
+    )
+    conn.commit()
+    conn.close()
+
+
+def list_deliveries(limit: int = 100) -> list[sqlite3.Row]:
+    conn = get_connection()
+    cursor = conn.cursor()
+    rows = cursor.execute(
+        "SELECT * FROM digest_deliveries ORDER BY updated_at DESC LIMIT ?", (limit,)
+    ).fetchall()
+    conn.close()
+    return rows
+
+
 def add_suggested_person(name: str, reason: str | None) -> None:
     conn = get_connection()
     cursor = conn.cursor()
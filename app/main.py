@@ -1,44 +1,57 @@
 from __future__ import annotations
 
+import os
+import socket
 from datetime import datetime
 from pathlib import Path
 
-from apscheduler.schedulers.background import BackgroundScheduler
 from fastapi import Depends, FastAPI, Form, HTTPException, Request
-from fastapi.responses import FileResponse, HTMLResponse, RedirectResponse
+from fastapi.responses import FileResponse, HTMLResponse, PlainTextResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from starlette.concurrency import run_in_threadpool
 from starlette.middleware.sessions import SessionMiddleware
 
+from app import api
 from app.db import (
-    cleanup_old_items,
+    add_subscriber,
     get_item,
     init_db,
+    list_cluster_members,
+    list_deliveries,
+    list_source_health,
+    list_subscribers,
     list_suggested_people,
     list_watchlist,
     query_items,
+    queue_backfill,
+    queue_job,
     approve_suggested_person,
-    upsert_watchlist,
+    set_subscriber_active,
 )
+from app.metrics import REGISTRY
+from app.page_cache import PAGE_CACHE, cached_page
 from app.settings import settings
-from workers.digest import build_digest_html, build_digest_text, fetch_top_items
-from workers.ingest import run_ingestion
-from workers.report_generator import fetch_items, write_report
-from workers.send_email import send_email
-from workers.watchlist import (
-    add_watchlist_entry,
-    flatten_watchlist,
-    load_watchlist,
-    load_watchlist_yaml,
-)
+from workers.embeddings import related_items, semantic_search
+from workers.pdf_render import shutdown_renderer
+from workers.rate_limit import provider_status
+from workers.relevance import TAG_RULES
+from workers.report_generator import build_report
+from workers.scheduler import INGEST_JOB, LeaderScheduler
+from workers.source_health import describe
+from workers.watchlist import add_watchlist_entry, get_watchlist_index
 
 app = FastAPI(title="AI Signal Radar")
 app.add_middleware(SessionMiddleware, secret_key=settings.session_secret)
+app.include_router(api.router)
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 TEMPLATES = Jinja2Templates(directory=str(BASE_DIR / "templates"))
 
-scheduler = BackgroundScheduler(timezone=settings.timezone)
+# Every worker serves HTTP; only the one holding the scheduler lease runs jobs.
+scheduler = LeaderScheduler()
+# Labels this process's /metrics series.
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
 
 
 def require_login(request: Request) -> None:
@@ -46,38 +59,17 @@ def require_login(request: Request) -> None:
         raise HTTPException(status_code=401)
 
 
-def run_daily_digest() -> None:
-    items = fetch_top_items(limit=12)
-    if not items:
-        return
-    html_body = build_digest_html(items)
-    text_body = build_digest_text(items)
-    send_email("AI Signal Radar Morning Digest", html_body, text_body)
-
-
-def run_hourly_ingest() -> None:
-    watchlist = load_watchlist()
-    run_ingestion(watchlist)
-
-
-def run_cleanup() -> None:
-    cleanup_old_items()
-
-
 @app.on_event("startup")
 async def startup_event() -> None:
-    init_db()
-    run_cleanup()
-    watchlist = load_watchlist()
-    if not watchlist:
-        legacy_watchlist = load_watchlist_yaml()
-        legacy_entries = flatten_watchlist(legacy_watchlist)
-        if legacy_entries:
-            upsert_watchlist(legacy_entries)
-    scheduler.add_job(run_hourly_ingest, "interval", hours=1)
-    scheduler.add_job(run_daily_digest, "cron", hour=8, minute=30)
-    scheduler.add_job(run_cleanup, "cron", hour=2, minute=0)
-    scheduler.start()
+    init_db(migrate=False)
+    if settings.scheduler_mode == "embedded":
+        scheduler.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event() -> None:
+    scheduler.stop()
+    shutdown_renderer()
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -116,6 +108,7 @@ async def items_view(
     tags: str | None = None,
     min_score: float | None = None,
     sort: str | None = None,
+    semantic: bool = False,
 ) -> HTMLResponse:
     require_login(request)
     filters = {
@@ -124,28 +117,46 @@ async def items_view(
         "tags": tags,
         "min_score": min_score,
         "sort": sort,
+        "semantic": semantic,
     }
-    rows = query_items(filters)
-    return TEMPLATES.TemplateResponse(
-        "items.html",
-        {"request": request, "items": rows, "filters": filters},
-    )
+
+    def render() -> HTMLResponse:
+        if semantic and search:
+            filters["ids"] = [item_id for item_id, _ in semantic_search(search, k=100)]
+        rows = query_items(filters)
+        return TEMPLATES.TemplateResponse(
+            "items.html",
+            {"request": request, "items": rows, "filters": filters},
+        )
+
+    return cached_page(request, ("items",), render)
 
 
 @app.get("/items/{item_id}", response_class=HTMLResponse)
 async def item_detail(request: Request, item_id: int) -> HTMLResponse:
     require_login(request)
-    row = get_item(item_id)
-    if not row:
-        raise HTTPException(status_code=404)
-    return TEMPLATES.TemplateResponse("item_detail.html", {"request": request, "item": row})
+
+    def render() -> HTMLResponse:
+        row = get_item(item_id)
+        if not row:
+            raise HTTPException(status_code=404)
+        members = list_cluster_members(item_id)
+        related = query_items({"ids": [other for other, _ in related_items(item_id, k=5)]})
+        return TEMPLATES.TemplateResponse(
+            "item_detail.html", {"request": request, "item": row, "members": members, "related": related}
+        )
+
+    return cached_page(request, ("items",), render)
 
 
 @app.get("/watchlist", response_class=HTMLResponse)
 async def watchlist_view(request: Request) -> HTMLResponse:
     require_login(request)
-    entries = list_watchlist()
-    return TEMPLATES.TemplateResponse("watchlist.html", {"request": request, "entries": entries})
+    return cached_page(
+        request,
+        ("watchlist",),
+        lambda: TEMPLATES.TemplateResponse("watchlist.html", {"request": request, "entries": list_watchlist()}),
+    )
 
 
 @app.post("/watchlist/add")
@@ -160,7 +171,7 @@ async def watchlist_add(
     rss_url: str | None = Form(None),
 ) -> RedirectResponse:
     require_login(request)
-    add_watchlist_entry(
+    entry = add_watchlist_entry(
         {
             "name": name,
             "entry_type": entry_type,
@@ -171,6 +182,7 @@ async def watchlist_add(
             "rss_url": rss_url,
         }
     )
+    queue_backfill(entry["id"])
     return RedirectResponse("/watchlist", status_code=302)
 
 
@@ -189,16 +201,62 @@ async def suggested_approve(
     x_handle: str | None = Form(None),
 ) -> RedirectResponse:
     require_login(request)
-    add_watchlist_entry({"name": name, "entry_type": "person", "x_handle": x_handle})
+    if not (x_handle and get_watchlist_index().find_handle(x_handle)):
+        entry = add_watchlist_entry({"name": name, "entry_type": "person", "x_handle": x_handle})
+        queue_backfill(entry["id"])
     approve_suggested_person(suggested_id)
     return RedirectResponse("/suggested", status_code=302)
 
 
+@app.get("/subscribers", response_class=HTMLResponse)
+async def subscribers_view(request: Request) -> HTMLResponse:
+    require_login(request)
+    return TEMPLATES.TemplateResponse(
+        "subscribers.html",
+        {
+            "request": request,
+            "subscribers": list_subscribers(),
+            "deliveries": list_deliveries(limit=50),
+            "tags": list(TAG_RULES.keys()),
+        },
+    )
+
+
+@app.get("/sources", response_class=HTMLResponse)
+async def sources_view(request: Request, all: bool = False) -> HTMLResponse:
+    require_login(request)
+    sources = [describe(dict(row)) for row in list_source_health()]
+    return TEMPLATES.TemplateResponse(
+        "sources.html",
+        {"request": request, "sources": sources, "show_all": all, "providers": provider_status()},
+    )
+
+
+@app.post("/subscribers/add")
+async def subscribers_add(
+    request: Request,
+    email: str = Form(...),
+    name: str | None = Form(None),
+    tags: list[str] = Form([]),
+    min_score: float = Form(0),
+    max_items: int = Form(12),
+) -> RedirectResponse:
+    require_login(request)
+    add_subscriber(email, name, tags, min_score, max_items)
+    return RedirectResponse("/subscribers", status_code=302)
+
+
+@app.post("/subscribers/{subscriber_id}/toggle")
+async def subscribers_toggle(request: Request, subscriber_id: int, active: int = Form(...)) -> RedirectResponse:
+    require_login(request)
+    set_subscriber_active(subscriber_id, bool(active))
+    return RedirectResponse("/subscribers", status_code=302)
+
+
 @app.post("/reports/generate", response_class=HTMLResponse)
 async def generate_report(request: Request, days: int = Form(7)) -> HTMLResponse:
     require_login(request)
-    items = fetch_items(days=days)
-    report_paths = write_report(items)
+    report_paths = await run_in_threadpool(build_report, days=days)
     md_filename = Path(report_paths["markdown"]).name
     pdf_filename = Path(report_paths["pdf"]).name if report_paths["pdf"] else None
     return TEMPLATES.TemplateResponse(
@@ -234,9 +292,9 @@ async def download_report_file(request: Request, filename: str) -> FileResponse:
 @app.get("/report")
 async def download_report(request: Request, days: int = 7, format: str = "md") -> FileResponse:
     require_login(request)
-    items = fetch_items(days=days)
-    report_paths = write_report(items)
     normalized_format = format.lower()
+    formats = ("markdown", "html", "pdf") if normalized_format == "pdf" else ("markdown", "html")
+    report_paths = await run_in_threadpool(build_report, days=days, formats=formats)
     if normalized_format == "pdf":
         if report_paths["pdf"]:
             pdf_path = Path(report_paths["pdf"])
@@ -252,5 +310,26 @@ async def download_report(request: Request, days: int = 7, format: str = "md") -
 @app.post("/ingest/run")
 async def ingest_now(request: Request) -> RedirectResponse:
     require_login(request)
-    run_hourly_ingest()
+    # Only the scheduler's lease holder ingests; it picks the request up within a minute.
+    queue_job(INGEST_JOB)
     return RedirectResponse("/items", status_code=302)
+
+
+@app.get("/stats/page-cache")
+async def page_cache_stats(request: Request) -> dict:
+    require_login(request)
+    return PAGE_CACHE.stats()
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics(request: Request) -> PlainTextResponse:
+    """This process's metrics only: each worker keeps its own registry.
+
+    Every series carries ``worker`` (host:pid) and ``leader`` labels so scrapes of
+    different workers can be told apart; ingest and scheduler metrics only move on
+    the lease holder (``leader="true"``).
+    """
+    # Same access as /api/v1: a dashboard session, or the API token for a Prometheus scraper.
+    api.require_api_access(request)
+    text = REGISTRY.render(worker=WORKER_ID, leader=str(scheduler.is_leader()).lower())
+    return PlainTextResponse(text, media_type="text/plain; version=0.0.4")
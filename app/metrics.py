@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _label_key(labels: dict[str, str]) -> tuple[tuple[str, str], ...]:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: tuple[tuple[str, str], ...], extra: tuple[str, str] | None = None) -> str:
+    pairs = [*key, extra] if extra else list(key)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str) -> None:
+        self.name = name
+        self.documentation = documentation
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(_label_key(labels), 0.0)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"values": [[list(map(list, key)), value] for key, value in self._values.items()]}
+
+    def merge(self, data: dict) -> None:
+        with self._lock:
+            for key, value in data["values"]:
+                key = tuple(map(tuple, key))
+                self._values[key] = self._values.get(key, 0.0) + value
+
+    def render(self, const: tuple[tuple[str, str], ...] = ()) -> list[str]:
+        with self._lock:
+            return [
+                f"{self.name}{_format_labels(const + key)} {value}" for key, value in sorted(self._values.items())
+            ]
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.buckets = buckets
+        self._series: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._series.setdefault(key, [[0] * len(self.buckets), 0.0, 0])
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(_label_key(labels))
+        return series[2] if series else 0
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "values": [
+                    [list(map(list, key)), [list(series[0]), series[1], series[2]]]
+                    for key, series in self._series.items()
+                ]
+            }
+
+    def merge(self, data: dict) -> None:
+        with self._lock:
+            for key, (buckets, total, count) in data["values"]:
+                key = tuple(map(tuple, key))
+                series = self._series.setdefault(key, [[0] * len(self.buckets), 0.0, 0])
+                series[0] = [left + right for left, right in zip(series[0], buckets)]
+                series[1] += total
+                series[2] += count
+
+    def render(self, const: tuple[tuple[str, str], ...] = ()) -> list[str]:
+        lines = []
+        with self._lock:
+            for key, (buckets, total, count) in sorted(self._series.items()):
+                key = const + key
+                for bound, cumulative in zip(self.buckets, buckets):
+                    lines.append(f"{self.name}_bucket{_format_labels(key, ('le', repr(bound)))} {cumulative}")
+                lines.append(f"{self.name}_bucket{_format_labels(key, ('le', '+Inf'))} {count}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {total}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, Counter | Histogram] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str) -> Counter:
+        with self._lock:
+            return self._metrics.setdefault(name, Counter(name, documentation))
+
+    def histogram(self, name: str, documentation: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        with self._lock:
+            return self._metrics.setdefault(name, Histogram(name, documentation, buckets))
+
+    def snapshot(self) -> dict:
+        return {name: metric.snapshot() for name, metric in self._metrics.items()}
+
+    def merge(self, snapshot: dict) -> None:
+        """Fold in metrics recorded by another process (e.g. an ingest shard)."""
+        for name, data in snapshot.items():
+            metric = self._metrics.get(name)
+            if metric is not None:
+                metric.merge(data)
+
+    def render(self, **const_labels: str) -> str:
+        """Prometheus text format; ``const_labels`` (e.g. the worker) are added to every series."""
+        const = _label_key(const_labels)
+        lines: list[str] = []
+        for name, metric in sorted(self._metrics.items()):
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            lines.extend(metric.render(const))
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "radar_http_request_seconds", "Outbound HTTP request latency by host and status."
+)
+FETCHED_ITEMS = REGISTRY.counter("radar_ingest_fetched_items_total", "Items fetched per source.")
+STAGE_SECONDS = REGISTRY.histogram(
+    "radar_ingest_stage_seconds", "Per-item time spent in each ingest stage by source."
+)
+DROPPED_ITEMS = REGISTRY.counter(
+    "radar_ingest_dropped_items_total", "Items dropped by each ingest stage by source."
+)
+EXTRACT_SECONDS = REGISTRY.histogram("radar_extract_seconds", "Article text extraction time.")
+LLM_REQUEST_SECONDS = REGISTRY.histogram("radar_llm_request_seconds", "LLM request latency by operation.")
+LLM_TOKENS = REGISTRY.counter("radar_llm_tokens_total", "LLM tokens used by operation and kind.")
+DB_WRITE_SECONDS = REGISTRY.histogram("radar_db_write_seconds", "SQLite write time by operation.")
+INGEST_RUN_SECONDS = REGISTRY.histogram(
+    "radar_ingest_run_seconds", "Wall time of full ingest runs.", (1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600)
+)
+REPORT_CACHE_LOOKUPS = REGISTRY.counter(
+    "radar_report_cache_lookups_total", "Report artifact cache lookups by format and result."
+)
+DIGEST_DELIVERIES = REGISTRY.counter("radar_digest_deliveries_total", "Digest emails by final delivery status.")
+PAGE_CACHE_LOOKUPS = REGISTRY.counter(
+    "radar_page_cache_lookups_total", "Dashboard page cache lookups by route and result (hit, miss, not_modified)."
+)
+PAGE_CACHE_EVICTIONS = REGISTRY.counter("radar_page_cache_evictions_total", "Cached dashboard pages evicted.")
+SOURCE_BREAKER_SKIPS = REGISTRY.counter(
+    "radar_source_breaker_skips_total", "Source fetches skipped because the source's circuit breaker is open."
+)
+RATE_LIMIT_WAIT_SECONDS = REGISTRY.counter(
+    "radar_rate_limit_wait_seconds_total", "Seconds spent waiting for an external API's shared rate limit."
+)
+RATE_LIMIT_REJECTIONS = REGISTRY.counter(
+    "radar_rate_limit_rejections_total", "External API calls not made, by provider and reason (rate, quota)."
+)
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from pathlib import Path
+from typing import Callable, Iterable, NamedTuple
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from app.dates import parse_datetime
+from app.db import get_data_versions
+from app.metrics import PAGE_CACHE_EVICTIONS, PAGE_CACHE_LOOKUPS
+from app.settings import settings
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "templates"
+
+
+class CachedPage(NamedTuple):
+    etag: str
+    body: bytes
+    media_type: str
+
+
+class PageCache:
+    """LRU of rendered pages, bounded by entry count and total body bytes.
+
+    Entries are keyed by route and query string and remember the ETag they were
+    rendered under; a lookup with a different ETag (the data moved on) misses
+    and the next ``put`` replaces the stale body.
+    """
+
+    def __init__(self, max_entries: int | None = None, max_bytes: int | None = None) -> None:
+        self.max_entries = max_entries or settings.page_cache_max_entries
+        self.max_bytes = max_bytes or settings.page_cache_max_bytes
+        self._entries: OrderedDict[str, CachedPage] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.not_modified = self.evictions = 0
+
+    def get(self, key: str, etag: str) -> CachedPage | None:
+        with self._lock:
+            page = self._entries.get(key)
+            if page is None or page.etag != etag:
+                return None
+            self._entries.move_to_end(key)
+            return page
+
+    def put(self, key: str, page: CachedPage) -> None:
+        if len(page.body) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old.body)
+            self._entries[key] = page
+            self._bytes += len(page.body)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted.body)
+                self.evictions += 1
+                PAGE_CACHE_EVICTIONS.inc()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.not_modified
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "evictions": self.evictions,
+            # A 304 is served without rendering, so it counts as a hit.
+            "hit_rate": round((self.hits + self.not_modified) / lookups, 4) if lookups else 0.0,
+        }
+
+
+PAGE_CACHE = PageCache()
+
+
+def _templates_stamp() -> str:
+    """Changes when a deploy changes the templates, so ETags from the old release stop matching."""
+    mtimes = [path.stat().st_mtime_ns for path in TEMPLATES_DIR.glob("*.html")]
+    return str(max(mtimes, default=0))
+
+
+TEMPLATES_STAMP = _templates_stamp()
+
+
+def _not_modified(request: Request, etag: str, last_modified: datetime | None) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match wins over If-Modified-Since when both are sent.
+        return etag in {tag.strip() for tag in if_none_match.split(",")} or if_none_match.strip() == "*"
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return since is not None and last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def cached_page(request: Request, scopes: Iterable[str], render: Callable[[], Response]) -> Response:
+    """Serve ``render()`` through ``PAGE_CACHE``, revalidated against the data versions of ``scopes``.
+
+    The ETag is derived from the URL and the current versions alone, so a
+    matching ``If-None-Match`` is answered with a 304 before any query runs.
+    Call it after the login check: pages are cached per URL, not per user.
+    """
+    route = request.scope["route"].path if "route" in request.scope else request.url.path
+    query = "&".join(sorted(f"{name}={value}" for name, value in request.query_params.multi_items()))
+    key = f"{request.url.path}?{query}"
+    versions = get_data_versions(scopes)
+    digest = hashlib.sha1(f"{key}|{sorted(versions.items())}|{TEMPLATES_STAMP}".encode()).hexdigest()[:24]
+    etag = f'W/"{digest}"'
+    stamps = [parse_datetime(updated_at) for _, updated_at in versions.values() if updated_at]
+    last_modified = max(stamps) if stamps else None
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+
+    if _not_modified(request, etag, last_modified):
+        PAGE_CACHE.not_modified += 1
+        PAGE_CACHE_LOOKUPS.inc(route=route, result="not_modified")
+        return Response(status_code=304, headers=headers)
+    page = PAGE_CACHE.get(key, etag)
+    if page is not None:
+        PAGE_CACHE.hits += 1
+        PAGE_CACHE_LOOKUPS.inc(route=route, result="hit")
+        return Response(content=page.body, media_type=page.media_type, headers=headers)
+
+    PAGE_CACHE.misses += 1
+    PAGE_CACHE_LOOKUPS.inc(route=route, result="miss")
+    response = render()
+    if response.status_code == 200:
+        PAGE_CACHE.put(key, CachedPage(etag, bytes(response.body), response.media_type or "text/html"))
+        response.headers.update(headers)
+    return response
@@ -20,17 +20,65 @@ class Settings(BaseSettings):
 
     openai_api_key: str | None = None
     openai_model: str = "gpt-4o-mini"
+    openai_base_url: str | None = None
+    openai_embedding_model: str = "text-embedding-3-small"
 
     smtp_host: str | None = None
     smtp_port: int = 587
     smtp_username: str | None = None
     smtp_password: str | None = None
     smtp_sender: str | None = None
+    smtp_starttls: bool = True
+    smtp_batch_size: int = 50
+    smtp_rate_per_minute: int = 20
+    smtp_max_retries: int = 3
+    smtp_retry_backoff_seconds: float = 5
 
     session_secret: str = "dev-secret"
+    api_token: str | None = None
     data_dir: str = "data"
     content_min_date: date = date(2025, 11, 1)
     content_max_age_days: int = 7
+    payload_compression_level: int = 6
+    cluster_window_days: int = 3
+    cluster_min_similarity: float = 0.7
+    ingest_queue_size: int = 100
+    ingest_enrich_workers: int = 4
+    ingest_shards: int = 1
+    source_failure_threshold: int = 3
+    source_backoff_base_minutes: int = 60
+    source_backoff_max_hours: int = 48
+    x_rate_per_minute: float = 60
+    youtube_rate_per_minute: float = 300
+    youtube_daily_quota: int = 10_000
+    openai_rate_per_minute: float = 500
+    rate_limit_max_wait_seconds: float = 60
+    web_search_rate_per_minute: float = 60
+    web_search_daily_quota: int = 100
+    web_search_cache_ttl_hours: float = 6
+    web_search_terms_per_query: int = 8
+    web_search_results_per_query: int = 10
+    report_cache_max_bytes: int = 256_000_000
+    report_cache_max_files: int = 60
+    page_cache_max_entries: int = 512
+    page_cache_max_bytes: int = 64_000_000
+    pdf_workers: int = 1
+    pdf_timeout_seconds: int = 120
+    pdf_max_memory_mb: int = 1024
+    pdf_queue_size: int = 4
+    digest_top_k: int = 50
+    scheduler_mode: str = "embedded"
+    scheduler_lease_seconds: int = 60
+    cleanup_batch_size: int = 500
+    cleanup_archive: bool = False
+    summary_min_score: float = 2.0
+    summary_batch_size: int = 200
+    summary_workers: int = 4
+    summary_retry_base_minutes: int = 60
+    summary_retry_max_hours: int = 24
+    embedding_backend: str = "local"
+    embedding_dim: int = 256
+    embedding_nprobe: int = 16
 
 
 settings = Settings()
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Iterator
+
+from app.db import apply_item_rollups, compress_text, get_connection, index_content
+from workers.relevance import TAG_RULES
+
+# Mirrors the shape of the real watchlist: mostly X handles, a single YouTube channel.
+SOURCE_WEIGHTS = {"x": 0.70, "web": 0.15, "rss": 0.13, "youtube": 0.02}
+TRANSCRIPT_POOL_SIZE = 16
+AUTHORS = [f"author{index}" for index in range(500)]
+WORDS = (
+    "ai model release benchmark gpu datacenter agent safety alignment policy chip nvidia openai "
+    "anthropic deepmind inference training paper launch funding market power cooling robot data "
+    "edge mobile research product tool framework evaluation regulation compute transformer"
+).split()
+TAGS = list(TAG_RULES.keys())
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def transcript(rng: random.Random, words: int = 8000) -> str:
+    """Roughly the size of a 45-minute talk transcript (~50 KB)."""
+    return _sentence(rng, words)
+
+
+def generate_items(
+    count: int,
+    *,
+    seed: int = 7,
+    now: datetime | None = None,
+    transcript_words: int = 8000,
+    window_days: int = 7,
+    prefix: str = "bench",
+) -> Iterator[dict]:
+    rng = random.Random(seed)
+    now = now or datetime.now(timezone.utc)
+    sources, weights = zip(*SOURCE_WEIGHTS.items())
+    transcripts = [transcript(rng, transcript_words) for _ in range(TRANSCRIPT_POOL_SIZE)]
+    for index in range(count):
+        source = rng.choices(sources, weights)[0]
+        published = now - timedelta(seconds=rng.randrange(window_days * 86400))
+        title = _sentence(rng, 10)
+        excerpt = _sentence(rng, 40)
+        content = f"{transcripts[index % TRANSCRIPT_POOL_SIZE]} {index}" if source == "youtube" else excerpt
+        metadata = {"synthetic": True}
+        if source == "x":
+            metadata["raw"] = {"id": str(index), "text": excerpt, "entities": {"urls": []}}
+        yield {
+            "source_type": source,
+            "title": title,
+            "url": f"https://example.com/{prefix}/{source}/{index}",
+            "author": rng.choice(AUTHORS),
+            "published_at": published.isoformat(),
+            "ingested_at": published.isoformat(),
+            "excerpt": excerpt,
+            "content": content,
+            "summary": _sentence(rng, 30),
+            "analysis": None,
+            "score": round(rng.uniform(0.5, 6.0), 2),
+            "tags": rng.sample(TAGS, rng.randint(1, 3)),
+            "metadata": metadata,
+            "dedupe_hash": hashlib.sha256(f"{prefix}-{index}".encode()).hexdigest(),
+        }
+
+
+# The timestamp formats each source actually sends: X API v2 and YouTube Data API
+# use ISO 8601 with "Z", CSE metatags carry local offsets, and RSS uses RFC 822.
+DATE_FORMATS = {
+    "x": lambda dt: dt.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+    "youtube": lambda dt: dt.strftime("%Y-%m-%dT%H:%M:%SZ"),
+    "web": lambda dt: dt.astimezone(timezone(timedelta(hours=-4))).isoformat(),
+    "rss": lambda dt: dt.strftime("%a, %d %b %Y %H:%M:%S ") + ("GMT" if dt.minute % 3 else "+0000"),
+}
+
+
+def feed_dates(count: int, *, seed: int = 13, window: int = 5000, polls: int = 4, now: datetime | None = None) -> list[str]:
+    """Published-at strings as ingest sees them over successive runs.
+
+    Each run fetches a ``window`` of entries (every feed's current items); the window
+    advances by ``window / polls``, so each entry is seen on ``polls`` runs.
+    """
+    rng = random.Random(seed)
+    now = now or datetime.now(timezone.utc)
+    sources, weights = zip(*SOURCE_WEIGHTS.items())
+    entries = [
+        DATE_FORMATS[rng.choices(sources, weights)[0]](now - timedelta(seconds=rng.randrange(7 * 86400)))
+        for _ in range(count)
+    ]
+    step = max(1, window // polls)
+    return [value for start in range(0, count, step) for value in entries[start : start + window]]
+
+
+def load_corpus(count: int, *, seed: int = 7, batch_size: int = 900, **kwargs) -> int:
+    """Bulk-load synthetic rows straight into SQLite, bypassing the ingest pipeline."""
+    conn = get_connection()
+    cursor = conn.cursor()
+    loaded = 0
+    batch: list[dict] = []
+
+    def flush() -> None:
+        cursor.executemany(
+            """
+            INSERT INTO items
+            (source_type, title, url, author, published_at, ingested_at, excerpt,
+             summary, analysis, score, tags, dedupe_hash)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    item["source_type"],
+                    item["title"],
+                    item["url"],
+                    item["author"],
+                    item["published_at"],
+                    item["ingested_at"],
+                    item["excerpt"],
+                    item["summary"],
+                    item["analysis"],
+                    item["score"],
+                    ",".join(item["tags"]),
+                    item["dedupe_hash"],
+                )
+                for item in batch
+            ],
+        )
+        hashes = [item["dedupe_hash"] for item in batch]
+        placeholders = ",".join("?" for _ in hashes)
+        ids = dict(
+            cursor.execute(
+                f"SELECT dedupe_hash, id FROM items WHERE dedupe_hash IN ({placeholders})", hashes
+            ).fetchall()
+        )
+        cursor.executemany(
+            "INSERT INTO item_payloads (item_id, content, metadata_json) VALUES (?, ?, ?)",
+            [
+                (ids[item["dedupe_hash"]], compress_text(item["content"]), compress_text(json.dumps(item["metadata"])))
+                for item in batch
+            ],
+        )
+        index_content(cursor, [(ids[item["dedupe_hash"]], item["content"]) for item in batch])
+        cursor.executemany(
+            "INSERT INTO item_tags (item_id, tag) VALUES (?, ?)",
+            [(ids[item["dedupe_hash"]], tag) for item in batch for tag in item["tags"]],
+        )
+        apply_item_rollups(cursor, f"items.id IN ({placeholders})", list(ids.values()))
+        conn.commit()
+        batch.clear()
+
+    for item in generate_items(count, seed=seed, **kwargs):
+        batch.append(item)
+        loaded += 1
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+    conn.close()
+    return loaded
@@ -0,0 +1,282 @@
+"""Benchmark ingest, querying and reporting against a synthetic corpus.
+
+Usage::
+
+    python -m benchmarks.run --scale 10k
+    python -m benchmarks.run --scale 100k --compare data/benchmarks/baseline.json
+
+Every external API is served by a local stub, so runs are reproducible and offline.
+Results are written as JSON; ``--compare`` flags timings that regressed beyond
+``--tolerance`` relative to an earlier result file and exits non-zero.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+# Fields a source client produces; enrichment fills in the rest during ingest.
+RAW_FIELDS = (
+    "source_type", "title", "url", "author", "published_at", "ingested_at",
+    "excerpt", "content", "metadata", "dedupe_hash",
+)
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def measure(
+    results: dict, name: str, func: Callable[[], Any], *, repeat: int = 1, trace_memory: bool = False
+) -> Any:
+    timings = []
+    peak = None
+    value = None
+    for _ in range(repeat):
+        if trace_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        try:
+            value = func()
+        except Exception as exc:  # a missing optional dependency should not sink the whole run
+            results[name] = {"error": f"{type(exc).__name__}: {exc}"}
+            print(f"{name:<28} failed: {results[name]['error']}", flush=True)
+            if trace_memory:
+                tracemalloc.stop()
+            return None
+        timings.append(time.perf_counter() - started)
+        if trace_memory:
+            peak = max(peak or 0, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+    entry: dict[str, Any] = {
+        "seconds": round(min(timings), 4),
+        "median_seconds": round(statistics.median(timings), 4),
+        "repeat": repeat,
+    }
+    if isinstance(value, (list, tuple)):
+        entry["rows"] = len(value)
+    elif isinstance(value, int):
+        entry["rows"] = value
+    if peak is not None:
+        entry["peak_mb"] = round(peak / 1e6, 1)
+    results[name] = entry
+    print(f"{name:<28} {entry.get('seconds', '-'):>10}s  rows={entry.get('rows', '-')}", flush=True)
+    return value
+
+
+def fill_vectors(store, count: int, *, seed: int = 5, topics: int = 2000, batch: int = 50_000) -> int:
+    """Synthetic unit vectors scattered around ``topics`` centres, like clustered news."""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(topics, store.dim)).astype(np.float32)
+    for start in range(0, count, batch):
+        size = min(batch, count - start)
+        vectors = centres[rng.integers(0, topics, size)] + rng.normal(scale=0.6, size=(size, store.dim))
+        store.append(range(start + 1, start + size + 1), vectors / np.linalg.norm(vectors, axis=1, keepdims=True))
+    return count
+
+
+def _dateutil_parse(value: str):
+    """The parse chain ``app.dates`` used before format sniffing, kept as a baseline."""
+    from email.utils import parsedate_to_datetime
+
+    from dateutil import parser
+
+    try:
+        return parser.isoparse(value)
+    except (ValueError, TypeError):
+        try:
+            return parser.parse(value)
+        except (ValueError, TypeError):
+            return parsedate_to_datetime(value)
+
+
+def run(args: argparse.Namespace) -> dict:
+    import pytest
+
+    from app.db import init_db, query_items
+    from benchmarks.corpus import generate_items, load_corpus
+    from benchmarks.stub_services import StubServer, point_clients_at, stub_watchlist
+    from workers import ingest
+
+    count = SCALES[args.scale]
+    results: dict[str, Any] = {}
+    init_db()
+
+    with StubServer() as server, pytest.MonkeyPatch.context() as patch:
+        point_clients_at(server, patch)
+        raw = [
+            {key: item[key] for key in RAW_FIELDS}
+            for item in generate_items(args.ingest_items, seed=11, prefix="ingest")
+        ]
+        measure(results, "process_items", lambda: ingest.process_items(raw), trace_memory=args.memory)
+        watchlist = stub_watchlist(server, args.watchlist)
+        measure(
+            results,
+            "run_ingestion",
+            lambda: ingest.run_ingestion(watchlist)["inserted"],
+            trace_memory=args.memory,
+        )
+
+    from app import dates
+    from benchmarks.corpus import feed_dates
+
+    samples = feed_dates(min(count, 100_000))
+    unique = list(dict.fromkeys(samples))
+    measure(results, "parse_dates_dateutil", lambda: len([_dateutil_parse(value) for value in unique]))
+    dates._parse.cache_clear()
+    measure(results, "parse_dates_cold", lambda: len([dates.parse_datetime(value) for value in unique]))
+    dates._parse.cache_clear()
+    measure(results, "parse_dates_polls", lambda: len([dates.parse_datetime(value) for value in samples]))
+
+    measure(results, "load_corpus", lambda: load_corpus(count))
+    from app.db import DB_PATH
+
+    results["db_size_mb"] = round(DB_PATH.stat().st_size / 1e6, 1)
+
+    from workers.digest import fetch_top_items, rebuild_digest_candidates
+
+    measure(results, "rebuild_digest_candidates", rebuild_digest_candidates)
+    repeat = args.repeat
+    measure(results, "query_items", lambda: query_items({}), repeat=repeat, trace_memory=args.memory)
+    measure(results, "query_items_search", lambda: query_items({"search": "nvidia gpu"}), repeat=repeat)
+    measure(results, "query_items_source", lambda: query_items({"source_type": "youtube"}), repeat=repeat)
+    measure(results, "fetch_top_items", lambda: fetch_top_items(limit=12), repeat=repeat)
+    from app.db import item_rollup_stats
+
+    measure(results, "item_stats_day_source", lambda: item_rollup_stats("source"), repeat=repeat)
+    measure(results, "item_stats_author", lambda: item_rollup_stats("author", by_day=False), repeat=repeat)
+    from workers.parquet_export import export_items_parquet
+
+    parquet_path = DB_PATH.parent / "bench-items.parquet"
+    measure(results, "parquet_export", lambda: export_items_parquet(parquet_path))
+    parquet_path.unlink(missing_ok=True)
+
+    try:
+        from fastapi.testclient import TestClient
+
+        from app.main import app
+        from app.page_cache import PAGE_CACHE
+        from app.settings import settings
+    except Exception as exc:  # app.main pulls in the report renderer
+        results["items_page"] = {"error": f"{type(exc).__name__}: {exc}"}
+    else:
+        client = TestClient(app)
+        client.post("/login", data={"password": settings.dashboard_password})
+
+        def render_uncached():
+            PAGE_CACHE.clear()
+            return client.get("/items").raise_for_status()
+
+        measure(results, "items_page_uncached", render_uncached, repeat=repeat)
+        etag = client.get("/items").headers["etag"]
+        measure(results, "items_page_cached", lambda: client.get("/items").raise_for_status(), repeat=repeat)
+        measure(
+            results, "items_page_304", lambda: client.get("/items", headers={"If-None-Match": etag}), repeat=repeat
+        )
+
+    from workers.scoring import rescore_items
+
+    measure(results, "rescore_items", rescore_items)
+
+    from app.settings import settings
+    from workers.embeddings import VectorStore, get_embedder
+
+    store = VectorStore(Path(settings.data_dir) / "bench-vectors", settings.embedding_dim)
+    measure(results, "vector_append", lambda: fill_vectors(store, count))
+    measure(results, "vector_train", store.train)
+    len(store)  # load the memmap and inverted lists outside the timed searches
+    query = get_embedder().embed(["nvidia gpu datacenter training"])[0]
+    exact = measure(results, "vector_search_exact", lambda: store.search(query, 20, exact=True), repeat=repeat)
+    approximate = measure(results, "vector_search_ivf", lambda: store.search(query, 20), repeat=repeat)
+    if exact and approximate:
+        overlap = {item_id for item_id, _ in exact} & {item_id for item_id, _ in approximate}
+        results["vector_search_ivf"]["recall_at_20"] = len(overlap) / len(exact)
+
+    try:
+        from workers import report_generator
+    except Exception as exc:  # WeasyPrint needs system libraries that may be absent
+        results["report"] = {"error": f"{type(exc).__name__}: {exc}"}
+        return results
+    items = measure(
+        results, "fetch_items", lambda: report_generator.fetch_items(days=7), trace_memory=args.memory
+    )
+    if items is not None:
+        measure(results, "generate_markdown", lambda: report_generator.generate_markdown(items))
+        measure(results, "write_report", lambda: report_generator.write_report(items), trace_memory=args.memory)
+    del items
+    measure(results, "build_report", lambda: report_generator.build_report(days=7), trace_memory=args.memory)
+    return results
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for name, entry in current["timings"].items():
+        before = baseline.get("timings", {}).get(name, {})
+        if "seconds" not in entry or not before.get("seconds"):
+            continue
+        ratio = entry["seconds"] / before["seconds"]
+        marker = "REGRESSION" if ratio > tolerance else ""
+        print(f"{name:<28} {before['seconds']:>10}s -> {entry['seconds']:>10}s  x{ratio:.2f} {marker}")
+        if ratio > tolerance:
+            regressions.append(name)
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=sorted(SCALES), default="10k")
+    parser.add_argument("--ingest-items", type=int, default=2000, help="Raw items fed to process_items.")
+    parser.add_argument("--watchlist", type=int, default=100, help="Stub watchlist size for run_ingestion.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--memory", action="store_true", help="Record peak traced memory (slower).")
+    parser.add_argument("--data-dir", help="Directory for the benchmark database (default: temp dir).")
+    parser.add_argument("--output", help="Where to write the JSON result.")
+    parser.add_argument("--compare", help="Earlier result JSON to compare against.")
+    parser.add_argument("--tolerance", type=float, default=1.25)
+    args = parser.parse_args()
+
+    # Settings and DB_PATH are read at import time, so point them at the scratch dir first.
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix="radar-bench-")
+    os.environ["DATA_DIR"] = data_dir
+
+    timings = run(args)
+    result = {
+        "scale": args.scale,
+        "items": SCALES[args.scale],
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "git_revision": _git_revision(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "timings": timings,
+    }
+    output = Path(
+        args.output or Path("data") / "benchmarks" / f"bench-{args.scale}-{datetime.now():%Y%m%d%H%M%S}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    print(f"wrote {output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        if compare(result, baseline, args.tolerance):
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
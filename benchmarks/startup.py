@@ -0,0 +1,94 @@
+"""Time from launching uvicorn to the first 200 response.
+
+Usage::
+
+    python -m benchmarks.startup --scale 100k
+
+A corpus spread over twice the retention window is loaded first, so the restart
+also has a cleanup backlog to deal with, as after a few days of downtime.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+from benchmarks.run import SCALES
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def prepare(data_dir: Path, count: int) -> Path:
+    os.environ["DATA_DIR"] = str(data_dir)
+    from app.db import DB_PATH, init_db
+    from benchmarks.corpus import load_corpus
+
+    init_db()
+    load_corpus(count, window_days=14)
+    return DB_PATH
+
+
+def time_to_first_200(data_dir: Path, timeout: float) -> float:
+    port = _free_port()
+    env = {**os.environ, "DATA_DIR": str(data_dir)}
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/login", timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except (urllib.error.URLError, ConnectionError, TimeoutError):
+                time.sleep(0.02)
+        raise TimeoutError(f"no 200 within {timeout}s")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=SCALES, default="10k")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=600)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pristine = Path(tmp) / "pristine"
+        db_path = prepare(pristine, SCALES[args.scale])
+        timings = []
+        for run in range(args.runs):
+            # Every run restarts against the same backlog.
+            data_dir = Path(tmp) / f"run{run}"
+            data_dir.mkdir()
+            shutil.copy(db_path, data_dir / db_path.name)
+            timings.append(time_to_first_200(data_dir, args.timeout))
+    result = {
+        "scale": args.scale,
+        "first_200_seconds": round(min(timings), 3),
+        "median_seconds": round(statistics.median(timings), 3),
+        "runs": args.runs,
+    }
+    print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import json
+import random
+import threading
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from benchmarks.corpus import WORDS
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers the handful of X, YouTube, CSE, RSS and OpenAI routes the workers call."""
+
+    server: "StubServer"
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002 - stdlib signature
+        return
+
+    def _send(self, body: str, content_type: str = "application/json") -> None:
+        payload = body.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _rng(self) -> random.Random:
+        return random.Random(self.path)
+
+    def do_GET(self) -> None:  # noqa: N802 - stdlib signature
+        parts = urlsplit(self.path)
+        query = parse_qs(parts.query)
+        rng = self._rng()
+        now = datetime.now(timezone.utc)
+        path = parts.path
+        if path.startswith("/x/users/by/username/"):
+            handle = path.rsplit("/", 1)[-1]
+            return self._send(json.dumps({"data": {"id": f"id-{handle}"}}))
+        if path.startswith("/x/users/") and path.endswith("/tweets"):
+            user_id = path.split("/")[3]
+            tweets = [
+                {
+                    "id": f"{user_id}-{index}",
+                    "text": _text(rng, 30),
+                    "created_at": (now - timedelta(minutes=index * 7)).isoformat(),
+                    "entities": {"urls": [{"expanded_url": f"https://example.com/{user_id}/{index}"}]},
+                }
+                for index in range(self.server.tweets_per_handle)
+            ]
+            return self._send(json.dumps({"data": tweets}))
+        if path == "/youtube/search":
+            if query.get("type") == ["channel"]:
+                return self._send(json.dumps({"items": [{"snippet": {"channelId": "UCbench"}}]}))
+            videos = [
+                {
+                    "id": {"kind": "youtube#video", "videoId": f"vid{index}"},
+                    "snippet": {
+                        "title": _text(rng, 8),
+                        "channelTitle": "Bench Channel",
+                        "publishedAt": (now - timedelta(hours=index)).isoformat(),
+                        "description": _text(rng, 40),
+                    },
+                }
+                for index in range(5)
+            ]
+            return self._send(json.dumps({"items": videos}))
+        if path == "/customsearch/v1":
+            results = [
+                {
+                    "link": f"https://example.com/search/{rng.randrange(10**9)}",
+                    "title": _text(rng, 8),
+                    "displayLink": "example.com",
+                    "snippet": _text(rng, 30),
+                    "pagemap": {"metatags": [{"article:published_time": now.isoformat()}]},
+                }
+                for _ in range(int(query.get("num", ["5"])[0]))
+            ]
+            return self._send(json.dumps({"items": results}))
+        if path.startswith("/feeds/"):
+            entries = "".join(
+                f"<item><title>{_text(rng, 8)}</title><link>https://example.com{path}/{index}</link>"
+                f"<description>{_text(rng, 40)}</description>"
+                f"<pubDate>{format_datetime(now - timedelta(hours=index), usegmt=True)}</pubDate></item>"
+                for index in range(10)
+            )
+            return self._send(
+                f'<?xml version="1.0"?><rss version="2.0"><channel><title>bench</title>{entries}</channel></rss>',
+                "application/rss+xml",
+            )
+        self.send_error(404)
+
+    def do_POST(self) -> None:  # noqa: N802 - stdlib signature
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = self.rfile.read(length)
+        if urlsplit(self.path).path.endswith("/embeddings"):
+            request = json.loads(payload or b"{}")
+            texts = request.get("input") or []
+            texts = [texts] if isinstance(texts, str) else texts
+            dimensions = request.get("dimensions") or 256
+            data = [
+                {
+                    "object": "embedding",
+                    "index": index,
+                    "embedding": [random.Random(f"{text}:{dim}").uniform(-1, 1) for dim in range(dimensions)],
+                }
+                for index, text in enumerate(texts)
+            ]
+            body = {
+                "object": "list",
+                "data": data,
+                "model": request.get("model", "bench"),
+                "usage": {"prompt_tokens": 8 * len(texts), "total_tokens": 8 * len(texts)},
+            }
+            return self._send(json.dumps(body))
+        if urlsplit(self.path).path.endswith("/chat/completions"):
+            rng = self._rng()
+            body = {
+                "id": "chatcmpl-bench",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "bench",
+                "choices": [
+                    {
+                        "index": 0,
+                        "finish_reason": "stop",
+                        "message": {"role": "assistant", "content": _text(rng, 60)},
+                    }
+                ],
+                "usage": {"prompt_tokens": 800, "completion_tokens": 120, "total_tokens": 920},
+            }
+            return self._send(json.dumps(body))
+        self.send_error(404)
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, tweets_per_handle: int = 20) -> None:
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.tweets_per_handle = tweets_per_handle
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "StubServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+def point_clients_at(server: StubServer, monkeypatch) -> None:
+    """Redirect every external client to ``server``.
+
+    ``monkeypatch`` is anything with pytest's ``setattr(target, name, value)`` shape.
+    """
+    from app.settings import settings
+    from workers import ingest, web_search, x_client, youtube_client
+    from workers.llm import LLMClient
+
+    base = server.base_url
+    monkeypatch.setattr(x_client, "API_BASE", f"{base}/x")
+    monkeypatch.setattr(youtube_client, "API_BASE", f"{base}/youtube")
+    monkeypatch.setattr(web_search, "API_BASE", f"{base}/customsearch/v1")
+    monkeypatch.setattr(youtube_client, "_fetch_transcript", lambda video_id: _text(random.Random(video_id), 8000))
+    for name, value in {
+        "x_api_bearer_token": "bench",
+        "youtube_api_key": "bench",
+        "google_cse_api_key": "bench",
+        "google_cse_cx": "bench",
+        "openai_api_key": "bench",
+        "openai_base_url": f"{base}/v1",
+        # The stub answers instantly; the benchmark measures our code, not the providers' limits.
+        "x_rate_per_minute": 0,
+        "youtube_rate_per_minute": 0,
+        "web_search_rate_per_minute": 0,
+        "openai_rate_per_minute": 0,
+    }.items():
+        monkeypatch.setattr(settings, name, value)
+    monkeypatch.setattr(ingest, "LLM", LLMClient())
+    monkeypatch.setattr(ingest, "extract_excerpt", lambda url: None)
+
+
+def stub_watchlist(server: StubServer, size: int) -> list[dict]:
+    entries = []
+    for index in range(size):
+        entry = {"name": f"Bench {index}", "entry_type": "person", "x_handle": f"bench{index}"}
+        if index % 10 == 0:
+            entry["rss_url"] = f"{server.base_url}/feeds/{index}.xml"
+        if index % 5 == 0:
+            entry["website"] = f"https://bench{index}.example.com"
+        if index == 0:
+            entry["youtube_channel"] = "https://www.youtube.com/@bench"
+        entries.append(entry)
+    return entries
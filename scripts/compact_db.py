@@ -0,0 +1,22 @@
+import argparse
+import os
+
+from app.db import DB_PATH, get_connection, init_db, migrate_item_payloads
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=(
+            "Move inline item payloads into item_payloads, switch to incremental auto_vacuum "
+            "and VACUUM to return the freed space."
+        )
+    )
+    parser.add_argument("--batch-size", type=int, default=2000)
+    args = parser.parse_args()
+    before = os.path.getsize(DB_PATH) if DB_PATH.exists() else 0
+    init_db()
+    conn = get_connection()
+    moved = migrate_item_payloads(conn, args.batch_size)
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    conn.execute("VACUUM")
+    conn.close()
+    print({"moved": moved, "size_before": before, "size_after": os.path.getsize(DB_PATH)})
@@ -1,9 +1,24 @@
+import argparse
+
 from app.db import init_db
+from app.settings import settings
 from workers.ingest import run_ingestion
+from workers.sharding import run_sharded_ingestion
 from workers.watchlist import load_watchlist
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run one ingestion pass over the watchlist.")
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=settings.ingest_shards,
+        help="Number of worker processes to partition the watchlist across.",
+    )
+    args = parser.parse_args()
     init_db()
     watchlist = load_watchlist()
-    result = run_ingestion(watchlist)
+    if args.shards > 1:
+        result = run_sharded_ingestion(watchlist, args.shards)
+    else:
+        result = run_ingestion(watchlist)
     print(result)
@@ -0,0 +1,19 @@
+import logging
+import signal
+import threading
+
+from app.db import init_db
+from workers.scheduler import LeaderScheduler
+
+if __name__ == "__main__":
+    # Pair with SCHEDULER_MODE=external on the web workers. Still takes the lease,
+    # so a second copy started by mistake stays idle.
+    logging.basicConfig(level=logging.INFO)
+    init_db(migrate=False)
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    scheduler = LeaderScheduler()
+    scheduler.start()
+    stop.wait()
+    scheduler.stop()
@@ -0,0 +1,153 @@
+import csv
+import importlib
+import io
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+def _client(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATA_DIR", str(tmp_path))
+    monkeypatch.setenv("API_TOKEN", "secret-token")
+    from app import settings as settings_module
+
+    importlib.reload(settings_module)
+    from app import db as db_module
+
+    importlib.reload(db_module)
+    from app import api as api_module
+    from app import page_cache as page_cache_module
+
+    importlib.reload(api_module)
+    importlib.reload(page_cache_module)
+    from app import main as main_module
+
+    importlib.reload(main_module)
+    db_module.init_db()
+    for index in range(25):
+        db_module.insert_item(
+            {
+                "source_type": "rss" if index % 2 else "x",
+                "title": f"Item {index}",
+                "url": f"https://example.com/{index}",
+                "published_at": f"2025-11-{index % 28 + 1:02d}T00:00:00+00:00",
+                "excerpt": "gpu news" if index % 5 == 0 else "other",
+                "content": f"transcript {index}",
+                "metadata": {"index": index},
+                "tags": ["chips", "policy"] if index % 5 == 0 else ["policy"],
+                "score": float(index),
+                "dedupe_hash": f"hash-{index}",
+            }
+        )
+    return TestClient(main_module.app, headers={"Authorization": "Bearer secret-token"})
+
+
+def test_items_keyset_pages_and_fields(tmp_path, monkeypatch):
+    client = _client(tmp_path, monkeypatch)
+    assert TestClient(client.app).get("/api/v1/items").status_code == 401
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 10, "fields": "title,tags", **({"cursor": cursor} if cursor else {})}
+        page = client.get("/api/v1/items", params=params).json()
+        seen.extend(page["data"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert len(seen) == 25
+    assert [row["id"] for row in seen] == sorted((row["id"] for row in seen), reverse=True)
+    assert set(seen[0]) == {"id", "title", "tags"}
+
+    filtered = client.get("/api/v1/items", params={"tag": "chips", "source": "x", "min_score": 5}).json()["data"]
+    assert {row["title"] for row in filtered} == {"Item 10", "Item 20"}
+    assert client.get("/api/v1/items", params={"fields": "nope"}).status_code == 400
+
+    item = client.get(f"/api/v1/items/{seen[0]['id']}", params={"fields": "content,metadata"}).json()
+    assert item == {"id": seen[0]["id"], "content": "transcript 24", "metadata": {"index": 24}}
+
+    tags = client.get("/api/v1/tags").json()["data"]
+    assert tags[0] == {"tag": "policy", "items": 25}
+
+
+def test_export_streams_ndjson_and_csv(tmp_path, monkeypatch):
+    client = _client(tmp_path, monkeypatch)
+    response = client.get("/api/v1/export/items", params={"fields": "title,content,metadata", "search": "gpu"})
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["title"] for row in rows] == ["Item 20", "Item 15", "Item 10", "Item 5", "Item 0"]
+    assert rows[0]["metadata"] == {"index": 20} and rows[0]["content"] == "transcript 20"
+
+    response = client.get("/api/v1/export/items", params={"format": "csv", "fields": "title,tags"})
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 25 and list(rows[0]) == ["id", "title", "tags"]
+    assert rows[-1]["tags"] == "chips,policy"
+
+
+def test_item_stats_from_rollups(tmp_path, monkeypatch):
+    client = _client(tmp_path, monkeypatch)
+    by_tag = client.get("/api/v1/stats/items", params={"group_by": "tag"}).json()["data"]
+    assert [(entry["tag"], entry["items"]) for entry in by_tag] == [("policy", 25), ("chips", 5)]
+
+    by_day = client.get(
+        "/api/v1/stats/items", params={"group_by": "day,source", "since": "2025-11-01", "until": "2025-11-01"}
+    ).json()["data"]
+    assert by_day == [
+        {"day": "2025-11-01", "source": "x", "items": 1, "avg_score": 0.0, "p50_score": 0.05, "p90_score": 0.09}
+    ]
+    assert client.get("/api/v1/stats/items", params={"group_by": "source,tag"}).status_code == 400
+
+
+def test_parquet_export(tmp_path, monkeypatch):
+    pq = pytest.importorskip("pyarrow.parquet")
+    client = _client(tmp_path, monkeypatch)
+    response = client.get("/api/v1/export/items", params={"format": "parquet", "fields": "published_at,tags,score"})
+    assert response.status_code == 200
+    table = pq.read_table(io.BytesIO(response.content))
+    assert table.num_rows == 25 and table.column_names == ["id", "published_at", "tags", "score"]
+    assert str(table.schema.field("published_at").type) == "timestamp[us, tz=UTC]"
+    assert not list((tmp_path / "exports").iterdir())
+
+
+def test_metrics_need_a_session_or_the_api_token(tmp_path, monkeypatch):
+    client = _client(tmp_path, monkeypatch)
+    assert client.get("/metrics").status_code == 200
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    client.headers.pop("Authorization")
+    assert client.get("/metrics").status_code == 401
+    client.post("/login", data={"password": "changeme"})
+    from app import main as main_module
+    from app.metrics import PAGE_CACHE_EVICTIONS
+
+    PAGE_CACHE_EVICTIONS.inc()
+    text = client.get("/metrics").text
+    assert "# TYPE radar_http_request_seconds histogram" in text
+    # Each worker serves its own registry; the labels tell scrapes of different workers apart.
+    series = [line for line in text.splitlines() if not line.startswith("#")]
+    assert series and all(f'leader="false",worker="{main_module.WORKER_ID}"' in line for line in series)
+
+
+def test_parquet_file_round_trips(tmp_path, monkeypatch):
+    pq = pytest.importorskip("pyarrow.parquet")
+    _client(tmp_path, monkeypatch)
+    from datetime import datetime, timezone
+
+    from workers import parquet_export as parquet_module
+
+    importlib.reload(parquet_module)
+    path = tmp_path / "items.parquet"
+    fields = ["title", "published_at", "tags", "score", "content", "metadata"]
+    assert parquet_module.export_items_parquet(path, {"search": "gpu"}, fields, batch_size=2) == 5
+    parquet = pq.ParquetFile(path)
+    assert parquet.metadata.num_row_groups == 3
+    rows = parquet.read().to_pylist()
+    assert [row["id"] for row in rows] == [21, 16, 11, 6, 1]
+    assert rows[0] == {
+        "id": 21,
+        "title": "Item 20",
+        "published_at": datetime(2025, 11, 21, tzinfo=timezone.utc),
+        "tags": ["chips", "policy"],
+        "score": 20.0,
+        "content": "transcript 20",
+        "metadata": '{"index": 20}',
+    }
@@ -0,0 +1,88 @@
+import importlib
+from datetime import datetime, timezone
+
+
+def test_canonicalize_url_strips_tracking():
+    from app.content import canonicalize_url
+
+    assert (
+        canonicalize_url("http://www.Example.com/post/?utm_source=x&b=2&a=1#top")
+        == "https://example.com/post?a=1&b=2"
+    )
+    assert canonicalize_url("https://twitter.com/openai/status/1?s=20") == "https://x.com/openai/status/1"
+    assert canonicalize_url("https://x.com/openai/status/1?t=abc&s=46") == "https://x.com/openai/status/1"
+    assert canonicalize_url("https://m.youtube.com/watch?v=abc&si=xyz&t=42") == "https://youtube.com/watch?t=42&v=abc"
+    # Elsewhere these names select a page: a WordPress search, a git ref.
+    assert canonicalize_url("https://blog.example.com/?s=agents") == "https://blog.example.com/?s=agents"
+    assert canonicalize_url("https://github.com/org/repo/blob/x?ref=v2") == "https://github.com/org/repo/blob/x?ref=v2"
+    assert canonicalize_url("not a url") is None
+
+
+def test_minhash_matches_near_duplicates():
+    from workers.clustering import minhash, similarity
+
+    base = "OpenAI releases a new reasoning model with stronger benchmark results on math and code"
+    near = "OpenAI releases a new reasoning model with stronger benchmark results on math and coding"
+    other = "Nvidia reports record datacenter revenue as demand for GPUs keeps growing this quarter"
+    assert similarity(minhash(base), minhash(near)) >= 0.7
+    assert similarity(minhash(base), minhash(other)) < 0.3
+    assert minhash("too short") is None
+
+
+def test_process_items_clusters_duplicates(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATA_DIR", str(tmp_path))
+    from app import settings as settings_module
+
+    importlib.reload(settings_module)
+    from app import db as db_module
+
+    importlib.reload(db_module)
+    from app import content as content_module
+
+    importlib.reload(content_module)
+    from workers import clustering as clustering_module
+
+    importlib.reload(clustering_module)
+    from workers import ingest as ingest_module
+
+    importlib.reload(ingest_module)
+
+    db_module.init_db()
+    fixed_now = datetime(2025, 11, 10, 12, 0, tzinfo=timezone.utc)
+    monkeypatch.setattr(content_module, "utc_now", lambda: fixed_now)
+    extracted: list[str] = []
+    monkeypatch.setattr(ingest_module, "extract_excerpt", lambda url: extracted.append(url) or None)
+
+    base = {
+        "title": "Anthropic publishes new alignment paper",
+        "author": "anthropic",
+        "published_at": "2025-11-09T10:00:00Z",
+        "excerpt": None,
+        "content": None,
+        "ingested_at": datetime.utcnow().isoformat(),
+    }
+    raw_items = [
+        {**base, "source_type": "rss", "url": "https://www.anthropic.com/news/paper", "dedupe_hash": "rss-1"},
+        {
+            **base,
+            "source_type": "web",
+            "url": "https://anthropic.com/news/paper/?utm_source=twitter",
+            "dedupe_hash": "web-1",
+        },
+        {
+            **base,
+            "source_type": "x",
+            "url": "https://x.com/AnthropicAI/status/1",
+            "excerpt": "New AI safety paper out today",
+            "metadata": {"links": ["https://anthropic.com/news/paper?utm_medium=social"]},
+            "dedupe_hash": "x-1",
+        },
+    ]
+
+    assert ingest_module.process_items(raw_items) == 3
+    assert extracted == ["https://www.anthropic.com/news/paper"]
+
+    rows = db_module.query_items({})
+    assert len(rows) == 1
+    assert rows[0]["cluster_size"] == 3
+    assert len(db_module.list_cluster_members(rows[0]["id"])) == 2
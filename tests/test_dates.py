@@ -0,0 +1,43 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app.dates import parse_datetime
+
+UTC_NOON = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "2024-05-01T12:00:00Z",
+        "2024-05-01T12:00:00.000Z",
+        "2024-05-01T08:00:00-04:00",
+        "2024-05-01 12:00:00",
+        "20240501T120000Z",
+        "Wed, 01 May 2024 12:00:00 GMT",
+        "Wed, 01 May 2024 14:00:00 +0200",
+        "01 May 2024 07:00:00 EST",
+        "1714564800",
+        "1714564800000",
+        "Wed May 01 12:00:00 +0000 2024",
+        "  2024-05-01T12:00:00+00:00 ",
+    ],
+)
+def test_parse_datetime_formats(value) -> None:
+    assert parse_datetime(value) == UTC_NOON
+
+
+def test_parse_datetime_rejects_garbage() -> None:
+    assert parse_datetime("not a date") is None
+    assert parse_datetime("") is None
+    assert parse_datetime(None) is None
+
+
+def test_parse_datetime_basic_iso_date_is_not_epoch() -> None:
+    assert parse_datetime("20240501") == datetime(2024, 5, 1, tzinfo=timezone.utc)
+
+
+def test_parse_datetime_passes_datetimes_through() -> None:
+    naive = datetime(2024, 5, 1, 12, 0)
+    assert parse_datetime(naive) == UTC_NOON
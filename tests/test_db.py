@@ -1,4 +1,5 @@
 import importlib
+from datetime import datetime, timezone
 from pathlib import Path
 
 import pytest
@@ -17,3 +18,219 @@ def test_init_db(tmp_path, monkeypatch):
     db_module.init_db()
     db_path = Path(settings_module.settings.data_dir) / "radar.db"
     assert db_path.exists()
+
+
+def _reload_db(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATA_DIR", str(tmp_path))
+    from app import settings as settings_module
+
+    importlib.reload(settings_module)
+    from app import db as db_module
+
+    importlib.reload(db_module)
+    return db_module
+
+
+def test_payloads_are_stored_off_the_items_row(tmp_path, monkeypatch):
+    db_module = _reload_db(tmp_path, monkeypatch)
+    db_module.init_db()
+    item_id = db_module.insert_item(
+        {
+            "source_type": "youtube",
+            "title": "Talk",
+            "url": "https://example.com/talk",
+            "content": "transcript " * 500,
+            "metadata": {"video_id": "abc"},
+            "dedupe_hash": "talk",
+        }
+    )
+    conn = db_module.get_connection()
+    row = conn.execute("SELECT content, metadata_json FROM items WHERE id = ?", (item_id,)).fetchone()
+    stored = conn.execute("SELECT length(content) FROM item_payloads WHERE item_id = ?", (item_id,)).fetchone()[0]
+    conn.close()
+    assert tuple(row) == (None, None)
+    assert stored < len("transcript " * 500)
+    item = db_module.get_item(item_id)
+    assert item["content"] == "transcript " * 500
+    assert item["metadata"] == {"video_id": "abc"}
+
+
+def test_init_db_migrates_inline_payloads(tmp_path, monkeypatch):
+    db_module = _reload_db(tmp_path, monkeypatch)
+    db_module.init_db()
+    conn = db_module.get_connection()
+    conn.execute(
+        """
+        INSERT INTO items (source_type, title, url, ingested_at, content, metadata_json, dedupe_hash)
+        VALUES ('x', 'Legacy', 'https://example.com/legacy', '2025-11-01T00:00:00', 'full text', '{"id": "1"}', 'legacy')
+        """
+    )
+    conn.execute("PRAGMA user_version = 0")
+    conn.commit()
+    conn.close()
+
+    db_module.init_db()
+    conn = db_module.get_connection()
+    row = conn.execute("SELECT id, content, metadata_json FROM items").fetchone()
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    conn.close()
+    assert (row["content"], row["metadata_json"]) == (None, None)
+    assert version == db_module.SCHEMA_VERSION
+    assert db_module.load_payloads([row["id"]]) == {row["id"]: {"content": "full text", "metadata": {"id": "1"}}}
+    assert [item["id"] for item in db_module.query_items({"search": "full text"})] == [row["id"]]
+
+
+def test_search_matches_payload_content(tmp_path, monkeypatch):
+    db_module = _reload_db(tmp_path, monkeypatch)
+    db_module.init_db()
+    talk = db_module.insert_item(
+        {
+            "source_type": "youtube",
+            "title": "Keynote",
+            "url": "https://example.com/keynote",
+            "published_at": "2025-11-19T08:00:00+00:00",
+            "content": "Today we announce a liquid-cooled rack for inference " * 50,
+            "dedupe_hash": "keynote",
+        }
+    )
+    post = db_module.insert_item(
+        {
+            "source_type": "x",
+            "title": "Liquid cooling thread",
+            "url": "https://example.com/thread",
+            "published_at": "2025-11-18T08:00:00+00:00",
+            "dedupe_hash": "thread",
+        }
+    )
+
+    def search(text):
+        return [row["id"] for row in db_module.query_items({"search": text})]
+
+    assert search("liquid cool") == [talk, post]
+    assert search("Liquid-Cooled Rack") == [talk]
+    assert search("cooling thread") == [post]
+    assert search("!!") == []
+    assert [item["id"] for item in db_module.iter_items({"search": "inference"}, ["title", "content"])] == [talk]
+
+    db_module.cleanup_old_items(now=datetime(2026, 6, 1, tzinfo=timezone.utc))
+    conn = db_module.get_connection()
+    assert conn.execute("SELECT rowid FROM item_content_fts WHERE item_content_fts MATCH 'inference'").fetchall() == []
+    conn.close()
+
+
+def test_cleanup_deletes_in_batches_and_cascades(tmp_path, monkeypatch):
+    from datetime import datetime, timedelta, timezone
+
+    db_module = _reload_db(tmp_path, monkeypatch)
+    db_module.init_db()
+    now = datetime(2025, 11, 20, 12, 0, tzinfo=timezone.utc)
+    stale = (now - timedelta(days=30)).isoformat()
+    fresh = (now - timedelta(days=1)).isoformat()
+
+    def add(key, published_at, cluster_id=None):
+        return db_module.insert_item(
+            {
+                "source_type": "rss",
+                "title": key,
+                "url": f"https://example.com/{key}",
+                "published_at": published_at,
+                "content": f"{key} body " * 200,
+                "tags": ["Frontier research"],
+                "fingerprint_keys": [f"url:{key}"],
+                "cluster_id": cluster_id,
+                "dedupe_hash": key,
+            }
+        )
+
+    leader = add("leader", stale)
+    member = add("member", fresh, cluster_id=leader)
+    expired = [add(f"old-{index}", stale if index % 2 else "  ") for index in range(5)]
+    archived: list[list[dict]] = []
+
+    assert db_module.cleanup_old_items(now=now, batch_size=2, archive=archived.append) == 6
+    assert [len(batch) for batch in archived] == [2, 2, 2]
+    rows = {row["id"]: row for batch in archived for row in batch}
+    assert set(rows) == {leader, *expired}
+    assert rows[leader]["content"].startswith("leader body")
+    assert rows[leader]["tags"] == ["Frontier research"]
+
+    conn = db_module.get_connection()
+    assert [tuple(row) for row in conn.execute("SELECT id, cluster_id FROM items")] == [(member, None)]
+    for table in db_module.ITEM_CHILD_TABLES:
+        assert {row[0] for row in conn.execute(f"SELECT item_id FROM {table}")} <= {member}
+    assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+    conn.close()
+
+
+def test_item_rollups_follow_inserts_and_cleanup(tmp_path, monkeypatch):
+    from datetime import datetime, timezone
+
+    db_module = _reload_db(tmp_path, monkeypatch)
+    db_module.init_db()
+    now = datetime(2025, 11, 20, 12, tzinfo=timezone.utc)
+    for index, (day, score) in enumerate([(19, 1.0), (19, 2.0), (19, 3.0), (19, 4.0), (5, 2.5)]):
+        db_module.insert_item(
+            {
+                "source_type": "rss" if index % 2 else "x",
+                "title": f"Item {index}",
+                "url": f"https://example.com/{index}",
+                "author": "alice",
+                "published_at": f"2025-11-{day:02d}T08:00:00+00:00",
+                "score": score,
+                "tags": ["chips"],
+                "dedupe_hash": f"hash-{index}",
+            }
+        )
+
+    assert db_module.item_rollup_stats() == [
+        {"day": "2025-11-05", "items": 1, "avg_score": 2.5, "p50_score": 2.55, "p90_score": 2.59},
+        {"day": "2025-11-19", "items": 4, "avg_score": 2.5, "p50_score": 2.1, "p90_score": 4.06},
+    ]
+    by_source = db_module.item_rollup_stats("source", by_day=False)
+    assert {entry["source"]: entry["items"] for entry in by_source} == {"x": 3, "rss": 2}
+
+    db_module.cleanup_old_items(now=now)
+    conn = db_module.get_connection()
+    maintained = conn.execute("SELECT * FROM item_rollups ORDER BY 1, 2, 3, 4").fetchall()
+    conn.close()
+    db_module.rebuild_item_rollups()
+    conn = db_module.get_connection()
+    rebuilt = conn.execute("SELECT * FROM item_rollups ORDER BY 1, 2, 3, 4").fetchall()
+    conn.close()
+    assert [tuple(row) for row in maintained] == [tuple(row) for row in rebuilt]
+    assert [entry["day"] for entry in db_module.item_rollup_stats("tag")] == ["2025-11-19"]
+
+
+def test_export_iteration_does_not_block_writers(tmp_path, monkeypatch):
+    import sqlite3
+
+    db_module = _reload_db(tmp_path, monkeypatch)
+    db_module.init_db()
+    for index in range(30):
+        db_module.insert_item(
+            {
+                "source_type": "rss",
+                "title": f"Item {index}",
+                "url": f"https://example.com/{index}",
+                "content": f"body {index}",
+                "dedupe_hash": str(index),
+            }
+        )
+    rows = db_module.iter_items({}, ["title", "content"], batch_size=10)
+    first = [next(rows)["id"] for _ in range(15)]
+
+    # A half-read export must not hold the lock a writer needs.
+    writer = sqlite3.connect(db_module.DB_PATH, timeout=0.1)
+    writer.execute("INSERT INTO leases (name, holder, expires_at) VALUES ('scheduler', 'other', 0)")
+    writer.commit()
+    writer.close()
+    late = db_module.insert_item(
+        {"source_type": "rss", "title": "Late", "url": "https://example.com/late", "dedupe_hash": "late"}
+    )
+
+    rest = [item["id"] for item in rows]
+    assert first + rest == list(range(30, 0, -1))
+    assert late not in first + rest
+    assert [item["id"] for item in db_module.iter_items({}, ["title"], limit=12, batch_size=5)] == list(
+        range(late, late - 12, -1)
+    )
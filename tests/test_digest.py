@@ -0,0 +1,103 @@
+import importlib
+import sqlite3
+from datetime import datetime, timedelta
+
+
+def _setup(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATA_DIR", str(tmp_path))
+    monkeypatch.setenv("DIGEST_TOP_K", "3")
+    from app import settings as settings_module
+
+    importlib.reload(settings_module)
+    from app import db as db_module
+
+    importlib.reload(db_module)
+    from workers import digest as digest_module
+
+    importlib.reload(digest_module)
+    db_module.init_db()
+    return db_module, digest_module
+
+
+def test_digest_candidates_match_full_query(tmp_path, monkeypatch):
+    db_module, digest_module = _setup(tmp_path, monkeypatch)
+    now = datetime.utcnow()
+    ages = [
+        timedelta(hours=1),
+        timedelta(hours=2),
+        timedelta(hours=2, minutes=30),
+        timedelta(hours=23, minutes=50),
+        timedelta(hours=30),
+        timedelta(hours=5),
+    ] + [timedelta(0)] * 6
+    for index, age in enumerate(ages):
+        item = {
+            "source_type": "rss",
+            "title": f"Item {index}",
+            "url": f"https://example.com/{index}",
+            "published_at": (now - age).isoformat(),
+            "ingested_at": (now - age).isoformat(),
+            "score": float(index % 4) + index / 10,
+            "tags": ["Infra & semis"] if index % 2 else ["Frontier research"],
+            "dedupe_hash": str(index),
+        }
+        digest_module.record_candidate(db_module.insert_item(item), item)
+
+    conn = db_module.get_connection()
+    per_bucket = conn.execute(
+        "SELECT MAX(n) FROM (SELECT COUNT(*) AS n FROM digest_candidates GROUP BY variant, bucket)"
+    ).fetchone()[0]
+    conn.close()
+    assert per_bucket == 3
+
+    for variant in ("all", "tag:Infra & semis", "tag:Frontier research"):
+        expected = [item["id"] for item in digest_module._query_top_items(3, variant)]
+        assert [item["id"] for item in digest_module.fetch_top_items(3, variant)] == expected
+    assert "Item 4" not in {item["title"] for item in digest_module.fetch_top_items(3)}
+
+    digest_module.rebuild_digest_candidates()
+    expected = [item["id"] for item in digest_module._query_top_items(3, "all")]
+    assert [item["id"] for item in digest_module.fetch_top_items(3)] == expected
+
+
+def test_cleanup_promotes_members_into_digest_and_semantic_search(tmp_path, monkeypatch):
+    db_module, digest_module = _setup(tmp_path, monkeypatch)
+    from workers import cleanup as cleanup_module
+    from workers import embeddings as embeddings_module
+
+    importlib.reload(embeddings_module)
+    importlib.reload(cleanup_module)
+    now = datetime.utcnow()
+    leader_item = {
+        "source_type": "rss",
+        "title": "Chip export rules tightened",
+        "url": "https://example.com/leader",
+        "published_at": (now - timedelta(days=30)).isoformat(),
+        "ingested_at": (now - timedelta(hours=3)).isoformat(),
+        "score": 2.0,
+        "dedupe_hash": "leader",
+    }
+    leader = db_module.insert_item(leader_item)
+    digest_module.record_candidate(leader, leader_item)
+    embeddings_module.store_embedding(leader, embeddings_module.embed_item(leader_item))
+    member_item = {
+        "source_type": "x",
+        "title": "Chip export rules tightened again",
+        "url": "https://example.com/member",
+        "published_at": (now - timedelta(hours=2)).isoformat(),
+        "ingested_at": (now - timedelta(hours=2)).isoformat(),
+        "score": 1.5,
+        "cluster_id": leader,
+        "dedupe_hash": "member",
+    }
+    member = db_module.insert_item(member_item)
+    assert [item["id"] for item in digest_module.fetch_top_items(3)] == [leader]
+
+    def locked(conn):
+        raise sqlite3.OperationalError("database is locked")
+
+    # A busy database at the vacuum must not cost the promoted leader its digest slot or embedding.
+    monkeypatch.setattr(db_module, "incremental_vacuum", locked)
+    assert cleanup_module.run_cleanup() == 1
+    assert [item["id"] for item in digest_module.fetch_top_items(3)] == [member]
+    assert [item_id for item_id, _ in embeddings_module.semantic_search("chip export rules")] == [member]
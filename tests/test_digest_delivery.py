@@ -0,0 +1,123 @@
+import importlib
+import socket
+from datetime import datetime
+
+import pytest
+
+aiosmtpd_controller = pytest.importorskip("aiosmtpd.controller")
+from aiosmtpd.smtp import AuthResult  # noqa: E402
+
+
+class RecordingHandler:
+    def __init__(self):
+        self.messages = []
+        self.logins = 0
+        self.flaky_seen = False
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address.startswith("bad@"):
+            return "550 no such user"
+        if address.startswith("flaky@") and not self.flaky_seen:
+            self.flaky_seen = True
+            return "451 try again later"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append((envelope.rcpt_tos[0], envelope.content.decode("utf-8", "replace")))
+        return "250 OK"
+
+    def authenticate(self, server, session, envelope, mechanism, auth_data):
+        self.logins += 1
+        return AuthResult(success=True)
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_deliver_digests_reuses_session_and_records_state(tmp_path, monkeypatch):
+    handler = RecordingHandler()
+    port = _free_port()
+    controller = aiosmtpd_controller.Controller(
+        handler,
+        hostname="127.0.0.1",
+        port=port,
+        authenticator=handler.authenticate,
+        auth_require_tls=False,
+    )
+    controller.start()
+    try:
+        for name, value in {
+            "DATA_DIR": str(tmp_path),
+            "SMTP_HOST": "127.0.0.1",
+            "SMTP_PORT": str(port),
+            "SMTP_USERNAME": "radar",
+            "SMTP_PASSWORD": "secret",
+            "SMTP_SENDER": "radar@example.com",
+            "SMTP_STARTTLS": "false",
+            "SMTP_RATE_PER_MINUTE": "600",
+        }.items():
+            monkeypatch.setenv(name, value)
+        from app import settings as settings_module
+
+        importlib.reload(settings_module)
+        from app import db as db_module
+
+        importlib.reload(db_module)
+        from workers import digest as digest_module
+
+        importlib.reload(digest_module)
+        from workers import send_email as send_email_module
+
+        importlib.reload(send_email_module)
+        from workers import digest_delivery as delivery_module
+
+        importlib.reload(delivery_module)
+        db_module.init_db()
+
+        now = datetime.utcnow().isoformat()
+        for index, tag in enumerate(["Infra & semis", "Frontier research", "Infra & semis"]):
+            item = {
+                "source_type": "rss",
+                "title": f"{tag} story {index}",
+                "url": f"https://example.com/{index}",
+                "published_at": now,
+                "ingested_at": now,
+                "score": 1.0 + index,
+                "tags": [tag],
+                "dedupe_hash": str(index),
+            }
+            digest_module.record_candidate(db_module.insert_item(item), item)
+
+        db_module.add_subscriber("all@example.com")
+        db_module.add_subscriber("infra@example.com", tags=["Infra & semis"], min_score=2.5)
+        db_module.add_subscriber("bad@example.com")
+        db_module.add_subscriber("flaky@example.com")
+
+        sleeps = []
+        result = delivery_module.deliver_digests("2025-11-10", sleep=sleeps.append)
+        assert (result["sent"], result["failed"]) == (3, 1)
+        assert handler.logins == 1
+        bodies = dict(handler.messages)
+        assert "Frontier research story 1" in bodies["all@example.com"]
+        assert "Infra & semis story 2" in bodies["infra@example.com"]
+        assert "story 0" not in bodies["infra@example.com"]
+        assert [seconds for seconds in sleeps if seconds >= 1] == [5]
+        assert all(seconds <= 0.1 for seconds in sleeps if seconds < 1)
+
+        statuses = db_module.get_delivery_statuses("2025-11-10")
+        assert statuses == {
+            "all@example.com": "sent",
+            "infra@example.com": "sent",
+            "bad@example.com": "failed",
+            "flaky@example.com": "sent",
+        }
+
+        rerun = delivery_module.deliver_digests("2025-11-10", sleep=sleeps.append)
+        assert (rerun["already_sent"], rerun["failed"]) == (3, 1)
+        assert len(handler.messages) == 3
+    finally:
+        controller.stop()
@@ -0,0 +1,127 @@
+import importlib
+import multiprocessing
+from datetime import datetime
+
+import numpy as np
+
+
+def _reload(tmp_path, monkeypatch, **env):
+    monkeypatch.setenv("DATA_DIR", str(tmp_path))
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    from app import settings as settings_module
+
+    importlib.reload(settings_module)
+    from app import db as db_module
+
+    importlib.reload(db_module)
+    from workers import embeddings as embeddings_module
+
+    importlib.reload(embeddings_module)
+    db_module.init_db()
+    return db_module, embeddings_module
+
+
+def test_vector_store_ivf_matches_exact_and_compacts(tmp_path, monkeypatch):
+    _, embeddings_module = _reload(tmp_path, monkeypatch)
+    rng = np.random.default_rng(3)
+    vectors = rng.normal(size=(3000, 32)).astype(np.float32)
+    store = embeddings_module.VectorStore(tmp_path / "vectors", 32)
+    store.append(list(range(1, 2001)), vectors[:2000])
+    assert store.train(lists_count=16) == 16
+    store.append(list(range(2001, 3001)), vectors[2000:])
+    assert len(store) == 3000
+
+    query = vectors[2500] + rng.normal(scale=0.1, size=32)
+    exact = store.search(query, 10, exact=True)
+    assert exact[0][0] == 2501
+    assert store.search(query, 10, nprobe=16) == exact
+    approximate = store.search(query, 10, nprobe=4)
+    assert approximate[0][0] == 2501
+
+    assert store.compact(range(1, 1001)) == 2000
+    assert len(store) == 1000
+    assert all(item_id <= 1000 for item_id, _ in store.search(query, 10))
+    assert store.vector_for(2501) is None
+
+
+def _append_rows(directory, first_id, count):
+    from workers.embeddings import VectorStore
+
+    store = VectorStore(directory, 8)
+    for item_id in range(first_id, first_id + count):
+        store.append([item_id], np.full((1, 8), item_id, dtype=np.float32))
+
+
+def test_vector_store_appends_from_several_processes_stay_aligned(tmp_path, monkeypatch):
+    _, embeddings_module = _reload(tmp_path, monkeypatch)
+    directory = tmp_path / "vectors"
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=_append_rows, args=(directory, first, 300)) for first in (1, 1001, 2001)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    store = embeddings_module.VectorStore(directory, 8)
+    assert len(store) == 900
+    for item_id in (1, 300, 1001, 1300, 2150):
+        assert np.all(store.vector_for(item_id) == item_id)
+
+
+def test_ingest_indexes_items_for_semantic_search(tmp_path, monkeypatch):
+    db_module, embeddings_module = _reload(tmp_path, monkeypatch, EMBEDDING_BACKEND="local")
+    from workers import ingest as ingest_module
+
+    importlib.reload(ingest_module)
+    monkeypatch.setattr(ingest_module, "extract_excerpt", lambda url: None)
+
+    now = datetime.utcnow().isoformat()
+    texts = [
+        "Nvidia unveils new datacenter GPU for AI training clusters",
+        "OpenAI releases a new reasoning model for agents and tooling",
+        "EU lawmakers agree AI policy rules for frontier model safety",
+    ]
+    raw = [
+        {
+            "source_type": "rss",
+            "title": text,
+            "url": f"https://example.com/{index}",
+            "published_at": now,
+            "ingested_at": now,
+            "excerpt": text,
+            "dedupe_hash": f"emb-{index}",
+        }
+        for index, text in enumerate(texts)
+    ]
+    assert ingest_module.process_items(raw) == 3
+
+    hits = embeddings_module.semantic_search("new GPU for AI datacenter training", k=3)
+    top = db_module.query_items({"ids": [item_id for item_id, _ in hits]})
+    assert top[0]["title"] == texts[0]
+    related = embeddings_module.related_items(top[0]["id"], k=2)
+    assert top[0]["id"] not in {item_id for item_id, _ in related}
+    assert len(related) == 2
+
+
+def test_openai_backend_against_stub(tmp_path, monkeypatch):
+    from benchmarks.stub_services import StubServer
+
+    from workers import llm as llm_module
+
+    _, embeddings_module = _reload(tmp_path, monkeypatch)
+    with StubServer() as server:
+        # workers.llm may still hold the settings object from an earlier reload.
+        targets = [embeddings_module.settings]
+        if llm_module.settings is not embeddings_module.settings:
+            targets.append(llm_module.settings)
+        for target in targets:
+            monkeypatch.setattr(target, "embedding_backend", "openai")
+            monkeypatch.setattr(target, "embedding_dim", 16)
+            monkeypatch.setattr(target, "openai_api_key", "test")
+            monkeypatch.setattr(target, "openai_base_url", f"{server.base_url}/v1")
+        embedder = embeddings_module.get_embedder()
+        vectors = embedder.embed(["alpha", "beta", "alpha"])
+    assert vectors.shape == (3, 16)
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0, atol=1e-5)
+    assert np.allclose(vectors[0], vectors[2])
+    assert not np.allclose(vectors[0], vectors[1])
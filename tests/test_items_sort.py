@@ -12,11 +12,15 @@ def test_items_sorted_by_published_at_desc(tmp_path, monkeypatch):
     from app import db as db_module
 
     importlib.reload(db_module)
+    from workers import scheduler as scheduler_module
+    from app import page_cache as page_cache_module
+
+    importlib.reload(page_cache_module)
     from app import main as main_module
 
     importlib.reload(main_module)
 
-    monkeypatch.setattr(main_module, "run_cleanup", lambda: None)
+    monkeypatch.setattr(scheduler_module, "run_cleanup", lambda: None)
 
     db_module.init_db()
     now = datetime(2025, 11, 10, 12, 0, tzinfo=timezone.utc)
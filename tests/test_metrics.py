@@ -0,0 +1,55 @@
+import importlib
+import json
+
+from app.metrics import Registry
+
+
+def test_registry_renders_prometheus_text():
+    registry = Registry()
+    latency = registry.histogram("test_latency_seconds", "Latency.", (0.1, 1.0))
+    dropped = registry.counter("test_dropped_total", "Dropped.")
+    latency.observe(0.05, host="api.x.com")
+    latency.observe(0.5, host="api.x.com")
+    dropped.inc(stage="filter", source="rss")
+
+    text = registry.render()
+    assert "# TYPE test_latency_seconds histogram" in text
+    assert 'test_latency_seconds_bucket{host="api.x.com",le="0.1"} 1' in text
+    assert 'test_latency_seconds_bucket{host="api.x.com",le="+Inf"} 2' in text
+    assert 'test_latency_seconds_count{host="api.x.com"} 2' in text
+    assert 'test_dropped_total{source="rss",stage="filter"} 1.0' in text
+
+
+def test_registry_merges_snapshots_from_other_processes():
+    parent, child = Registry(), Registry()
+    for registry in (parent, child):
+        registry.histogram("test_stage_seconds", "Stage.", (1.0,))
+    child._metrics["test_stage_seconds"].observe(0.5, stage="enrich")
+    parent.merge(child.snapshot())
+    assert parent._metrics["test_stage_seconds"].count(stage="enrich") == 1
+
+
+def test_run_ingestion_records_ingest_run(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATA_DIR", str(tmp_path))
+    from app import settings as settings_module
+
+    importlib.reload(settings_module)
+    from app import db as db_module
+
+    importlib.reload(db_module)
+    from workers import ingest as ingest_module
+
+    importlib.reload(ingest_module)
+    db_module.init_db()
+
+    for name in ("iter_x_posts", "iter_videos", "iter_web_results", "iter_feed_entries"):
+        monkeypatch.setattr(ingest_module, name, lambda values: iter(()))
+    ingest_module.run_ingestion([{"name": "Alice", "x_handle": "alice"}])
+
+    runs = db_module.list_ingest_runs()
+    assert len(runs) == 1
+    assert runs[0]["mode"] == "single"
+    assert runs[0]["watchlist_len"] == 1
+    breakdown = json.loads(runs[0]["breakdown_json"])
+    assert breakdown["fetched"] == {}
+    assert "stage_seconds" in breakdown
@@ -0,0 +1,94 @@
+import importlib
+from datetime import datetime, timezone
+
+from fastapi.testclient import TestClient
+
+
+def _app(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATA_DIR", str(tmp_path))
+    from app import settings as settings_module
+
+    importlib.reload(settings_module)
+    from app import db as db_module
+
+    importlib.reload(db_module)
+    from workers import scheduler as scheduler_module
+    from app import page_cache as page_cache_module
+
+    importlib.reload(page_cache_module)
+    from app import main as main_module
+
+    importlib.reload(main_module)
+    monkeypatch.setattr(scheduler_module, "run_cleanup", lambda: None)
+    db_module.init_db()
+    client = TestClient(main_module.app)
+    client.post("/login", data={"password": settings_module.settings.dashboard_password})
+    return db_module, page_cache_module, client
+
+
+def _item(title: str) -> dict:
+    now = datetime.now(timezone.utc).isoformat()
+    return {
+        "source_type": "rss",
+        "title": title,
+        "url": f"https://example.com/{title}",
+        "published_at": now,
+        "ingested_at": now,
+        "dedupe_hash": title,
+    }
+
+
+def test_items_page_cached_until_ingest(tmp_path, monkeypatch):
+    db_module, page_cache_module, client = _app(tmp_path, monkeypatch)
+    db_module.insert_item(_item("first"))
+
+    first = client.get("/items")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert first.headers["last-modified"]
+    second = client.get("/items")
+    assert second.text == first.text and second.headers["etag"] == etag
+    assert page_cache_module.PAGE_CACHE.stats()["hits"] == 1
+
+    revalidated = client.get("/items", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304 and revalidated.content == b""
+    since = client.get("/items", headers={"If-Modified-Since": first.headers["last-modified"]})
+    assert since.status_code == 304
+
+    # Other query parameters are a separate entry.
+    assert client.get("/items?source=x").headers["etag"] != etag
+
+    db_module.insert_item(_item("second"))
+    fresh = client.get("/items", headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert "second" in fresh.text and fresh.headers["etag"] != etag
+
+    stats = client.get("/stats/page-cache").json()
+    assert stats["not_modified"] == 2 and stats["misses"] == 4 and 0 < stats["hit_rate"] < 1
+
+
+def test_watchlist_page_follows_watchlist_edits(tmp_path, monkeypatch):
+    db_module, _, client = _app(tmp_path, monkeypatch)
+    etag = client.get("/watchlist").headers["etag"]
+    db_module.insert_item(_item("unrelated"))
+    assert client.get("/watchlist", headers={"If-None-Match": etag}).status_code == 304
+
+    db_module.upsert_watchlist([{"name": "Ada Lovelace", "entry_type": "person"}])
+    response = client.get("/watchlist", headers={"If-None-Match": etag})
+    assert response.status_code == 200 and "Ada Lovelace" in response.text
+
+
+def test_page_cache_evicts_least_recently_used():
+    from app.page_cache import CachedPage, PageCache
+
+    cache = PageCache(max_entries=2, max_bytes=10)
+    cache.put("a", CachedPage("1", b"aaaa", "text/html"))
+    cache.put("b", CachedPage("1", b"bbbb", "text/html"))
+    assert cache.get("a", "1")
+    cache.put("c", CachedPage("1", b"cccc", "text/html"))
+    assert cache.get("b", "1") is None and cache.get("a", "1") and cache.get("c", "1")
+    assert cache.get("a", "2") is None
+
+    cache.put("d", CachedPage("1", b"dddddddd", "text/html"))
+    stats = cache.stats()
+    assert stats["entries"] == 1 and stats["bytes"] == 8 and stats["evictions"] == 3
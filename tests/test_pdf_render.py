@@ -0,0 +1,64 @@
+import threading
+import time
+from pathlib import Path
+
+from workers.pdf_render import PdfRenderer
+
+
+def _fake_render(html_path, pdf_path):
+    if "slow" in html_path:
+        time.sleep(30)
+    if "steady" in html_path:
+        time.sleep(3)
+    Path(pdf_path).write_bytes(Path(html_path).read_bytes())
+    return None
+
+
+def test_renderer_recovers_after_timeout(tmp_path):
+    renderer = PdfRenderer(1, timeout=2, target=_fake_render)
+    try:
+        fast = tmp_path / "fast.html"
+        fast.write_text("<p>ok</p>", encoding="utf-8")
+        assert renderer.render(str(fast), str(tmp_path / "fast.pdf")) is None
+        assert (tmp_path / "fast.pdf").read_text(encoding="utf-8") == "<p>ok</p>"
+
+        slow = tmp_path / "slow.html"
+        slow.write_text("<p>slow</p>", encoding="utf-8")
+        error = renderer.render(str(slow), str(tmp_path / "slow.pdf"))
+        assert error == "PDF generation failed: timed out after 2s"
+
+        assert renderer.render(str(fast), str(tmp_path / "again.pdf")) is None
+    finally:
+        renderer.close()
+
+
+def test_timeout_kills_only_the_overrunning_worker(tmp_path):
+    renderer = PdfRenderer(2, timeout=4, target=_fake_render)
+    try:
+        pages = {}
+        for name in ("fast", "slow", "steady"):
+            pages[name] = tmp_path / f"{name}.html"
+            pages[name].write_text(f"<p>{name}</p>", encoding="utf-8")
+        # Start both workers so the timings below are render time only.
+        warm = [
+            threading.Thread(target=renderer.render, args=(str(pages["fast"]), str(tmp_path / f"warm{index}.pdf")))
+            for index in range(2)
+        ]
+        for thread in warm:
+            thread.start()
+        for thread in warm:
+            thread.join()
+
+        errors = {}
+        slow = threading.Thread(
+            target=lambda: errors.update(slow=renderer.render(str(pages["slow"]), str(tmp_path / "slow.pdf")))
+        )
+        slow.start()
+        time.sleep(2)
+        # Still rendering when the slow job is killed at 4s, and done well within its own timeout.
+        errors["steady"] = renderer.render(str(pages["steady"]), str(tmp_path / "steady.pdf"))
+        slow.join()
+        assert errors == {"slow": "PDF generation failed: timed out after 4s", "steady": None}
+        assert (tmp_path / "steady.pdf").read_text(encoding="utf-8") == "<p>steady</p>"
+    finally:
+        renderer.close()
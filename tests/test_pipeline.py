@@ -0,0 +1,113 @@
+import importlib
+import threading
+import time
+from datetime import datetime, timezone
+
+from workers.pipeline import Stage, run_pipeline
+
+
+def test_pipeline_streams_with_backpressure():
+    produced = []
+    sink_entered = threading.Event()
+    release_sink = threading.Event()
+
+    def source():
+        for index in range(50):
+            produced.append(index)
+            yield {"n": index}
+
+    persisted = []
+
+    def sink(item):
+        sink_entered.set()
+        # Persistence starts with the first item, while the source is still producing.
+        assert release_sink.wait(timeout=5)
+        persisted.append(item["n"])
+        return True
+
+    def watch():
+        sink_entered.wait(timeout=5)
+        time.sleep(0.2)
+        # A blocked sink stalls the fetcher once the bounded queues fill up.
+        stalled_at.append(len(produced))
+        release_sink.set()
+
+    stalled_at: list[int] = []
+    watcher = threading.Thread(target=watch)
+    watcher.start()
+    stats = run_pipeline(
+        {"numbers": source},
+        [Stage("odd", lambda item: item if item["n"] % 2 else None), Stage("noop", lambda item: item)],
+        sink,
+        maxsize=2,
+    )
+    watcher.join()
+    assert stalled_at and stalled_at[0] < 20
+    assert stats.fetched["numbers"] == 50
+    assert stats.dropped["odd"] == 25
+    assert stats.persisted == 25
+    assert sorted(persisted) == list(range(1, 50, 2))
+
+
+def test_pipeline_isolates_failures():
+    def broken():
+        yield {"n": 1}
+        raise RuntimeError("feed down")
+
+    def explode(item):
+        if item["n"] == 2:
+            raise ValueError("bad item")
+        return item
+
+    stats = run_pipeline(
+        {"broken": broken, "ok": lambda: iter([{"n": 2}, {"n": 3}])},
+        [Stage("explode", explode, workers=2)],
+        lambda item: True,
+    )
+    assert stats.persisted == 2
+    assert stats.errors["fetch:broken"] == 1
+    assert stats.errors["explode"] == 1
+
+
+def test_run_ingestion_streams_sources(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATA_DIR", str(tmp_path))
+    from app import settings as settings_module
+
+    importlib.reload(settings_module)
+    from app import db as db_module
+
+    importlib.reload(db_module)
+    from app import content as content_module
+
+    importlib.reload(content_module)
+    from workers import ingest as ingest_module
+
+    importlib.reload(ingest_module)
+    db_module.init_db()
+
+    fixed_now = datetime(2025, 11, 10, 12, 0, tzinfo=timezone.utc)
+    monkeypatch.setattr(content_module, "utc_now", lambda: fixed_now)
+
+    def fake_posts(handles):
+        for handle in handles:
+            yield {
+                "source_type": "x",
+                "title": f"{handle} on AI agents",
+                "url": f"https://x.com/{handle}/status/1",
+                "author": handle,
+                "published_at": "2025-11-09T10:00:00Z",
+                "excerpt": f"{handle} shares an AI agent benchmark",
+                "content": None,
+                "dedupe_hash": f"x-{handle}",
+                "ingested_at": fixed_now.isoformat(),
+            }
+
+    monkeypatch.setattr(ingest_module, "iter_x_posts", fake_posts)
+    monkeypatch.setattr(ingest_module, "iter_videos", lambda channels: iter(()))
+    monkeypatch.setattr(ingest_module, "iter_web_results", lambda queries: iter(()))
+    monkeypatch.setattr(ingest_module, "iter_feed_entries", lambda feeds: iter(()))
+
+    watchlist = [{"name": "Alice", "x_handle": "alice"}, {"name": "Bob", "x_handle": "bob"}]
+    result = ingest_module.run_ingestion(watchlist)
+    assert result["inserted"] == 2
+    assert result["sources"] == {"x": 2, "youtube": 0, "web": 0, "rss": 0}
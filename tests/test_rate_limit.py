@@ -0,0 +1,169 @@
+import importlib
+import threading
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+
+def _reload(tmp_path, monkeypatch, **env):
+    monkeypatch.setenv("DATA_DIR", str(tmp_path))
+    for name, value in env.items():
+        monkeypatch.setenv(name, str(value))
+    from app import settings as settings_module
+
+    importlib.reload(settings_module)
+    from app import db as db_module
+
+    importlib.reload(db_module)
+    from workers import http_client, rate_limit, source_health
+
+    for module in (rate_limit, http_client, source_health):
+        importlib.reload(module)
+    db_module.init_db()
+    return db_module, rate_limit
+
+
+class Response:
+    def __init__(self, status_code=200, headers=None, text=""):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.text = text
+
+
+def test_bucket_is_shared_and_refills(tmp_path, monkeypatch):
+    db_module, _ = _reload(tmp_path, monkeypatch)
+    taken = []
+
+    def take():
+        taken.append(db_module.take_rate_token("x", 60, 5, now=1000.0))
+
+    threads = [threading.Thread(target=take) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Burst of 5 at one instant, whoever asks; the rest are told when the next token is due.
+    assert taken.count(0.0) == 5
+    assert all(wait == pytest.approx(1.0) for wait in taken if wait)
+    assert db_module.take_rate_token("x", 60, 5, now=1001.0) == 0.0
+
+    db_module.update_rate_limit("x", remaining=0, blocked_until=1100.0, now=1001.0)
+    assert db_module.take_rate_token("x", 60, 5, now=1050.0) == pytest.approx(50.0)
+    assert db_module.take_rate_token("x", 60, 5, now=1100.0) == 0.0
+
+
+def test_headers_block_until_reset(tmp_path, monkeypatch):
+    _, rate_limit = _reload(tmp_path, monkeypatch)
+    now = 1_700_000_000.0
+    x_headers = {"x-rate-limit-remaining": "0", "x-rate-limit-reset": str(int(now) + 900)}
+    assert rate_limit.parse_rate_headers(x_headers, now) == (0, now + 900)
+    openai_headers = {
+        "x-ratelimit-remaining-requests": "499",
+        "x-ratelimit-reset-requests": "120ms",
+        "x-ratelimit-remaining-tokens": "0",
+        "x-ratelimit-reset-tokens": "1m30s",
+    }
+    assert rate_limit.parse_rate_headers(openai_headers, now) == (499, now + 90)
+    assert rate_limit.parse_rate_headers({"Retry-After": "Tue, 14 Nov 2023 22:13:20 GMT"}, now) == (None, now)
+    assert rate_limit.parse_rate_headers({"Content-Type": "application/json"}, now) == (None, None)
+
+
+def test_http_get_retries_429_and_charges_quota(tmp_path, monkeypatch):
+    _, rate_limit = _reload(tmp_path, monkeypatch, YOUTUBE_DAILY_QUOTA=250)
+    from workers import http_client
+
+    responses = [Response(429, {"Retry-After": "0"}), Response(200), Response(200)]
+    monkeypatch.setattr(http_client.requests, "get", lambda url, **kwargs: responses.pop(0))
+
+    assert http_client.http_get("https://yt.example/search", provider="youtube", units=100).status_code == 200
+    assert rate_limit.quota_remaining("youtube") == 150
+    http_client.http_get("https://yt.example/search", provider="youtube", units=100)
+    with pytest.raises(rate_limit.QuotaExceeded):
+        http_client.http_get("https://yt.example/search", provider="youtube", units=100)
+    assert responses == []
+
+    # Google's own word that the day's quota is gone closes the ledger too.
+    rate_limit.note_response("google_cse", Response(429, text="Quota exceeded for 'Queries per day'"))
+    assert rate_limit.quota_remaining("google_cse") == 0
+
+
+def test_acquire_gives_up_on_long_blocks_without_failing_the_source(tmp_path, monkeypatch):
+    db_module, rate_limit = _reload(tmp_path, monkeypatch, RATE_LIMIT_MAX_WAIT_SECONDS=5)
+    from workers import source_health
+
+    clock = [time.time()]
+    slept = []
+
+    def sleep(seconds):
+        slept.append(seconds)
+        clock[0] += seconds
+
+    monkeypatch.setattr(time, "time", lambda: clock[0])
+    rate_limit.acquire("x", sleep=sleep)
+    rate_limit.note_response("x", Response(429, {"Retry-After": "2"}))
+    rate_limit.acquire("x", sleep=sleep)
+    assert slept == [pytest.approx(2)]
+
+    reset = str(int(clock[0]) + 900)
+    rate_limit.note_response("x", Response(200, {"x-rate-limit-remaining": "0", "x-rate-limit-reset": reset}))
+    with pytest.raises(rate_limit.RateLimited):
+        rate_limit.acquire("x", sleep=sleep)
+
+    def fetch():
+        rate_limit.acquire("x")
+        return ["tweet"]
+
+    assert source_health.guarded("x", "karpathy", fetch) is None
+    assert db_module.get_source_health("x", "karpathy") is None
+    assert [row["provider"] for row in rate_limit.provider_status() if row["blocked_until"]] == ["x"]
+
+
+def test_ingest_keeps_items_when_the_llm_is_rate_limited(tmp_path, monkeypatch):
+    db_module, rate_limit = _reload(tmp_path, monkeypatch, OPENAI_API_KEY="test-key")
+    from app import content
+    from workers import ingest, llm
+
+    for module in (content, llm, ingest):
+        importlib.reload(module)
+    monkeypatch.setattr(content, "utc_now", lambda: datetime(2025, 11, 10, 12, 0, tzinfo=timezone.utc))
+
+    def acquire(provider, units=1, sleep=time.sleep):
+        raise rate_limit.RateLimited(provider, "next request slot in 600s")
+
+    monkeypatch.setattr(llm, "acquire", acquire)
+    item = {
+        "source_type": "x",
+        "title": "New frontier model release",
+        "url": "https://x.com/lab/status/1",
+        "author": "lab",
+        "published_at": "2025-11-09T10:00:00Z",
+        "excerpt": "The lab ships an AI agent benchmark",
+        "content": None,
+        "dedupe_hash": "x-lab-1",
+        "ingested_at": "2025-11-10T12:00:00+00:00",
+    }
+    assert ingest.process_items([item]) == 1
+    conn = db_module.get_connection()
+    row = conn.execute("SELECT score, summary FROM items WHERE url = ?", (item["url"],)).fetchone()
+    conn.close()
+    assert row["summary"] is None
+    assert row["score"] > 0
+
+
+def test_reported_remaining_zero_throttles_the_next_request(tmp_path, monkeypatch):
+    _, rate_limit = _reload(tmp_path, monkeypatch, X_RATE_PER_MINUTE=60)
+    clock = [1_700_000_000.0]
+    slept = []
+
+    def sleep(seconds):
+        slept.append(seconds)
+        clock[0] += seconds
+
+    monkeypatch.setattr(time, "time", lambda: clock[0])
+    rate_limit.acquire("x", sleep=sleep)
+    # Long enough for a full bucket, had the report not emptied it as of now.
+    clock[0] += 100
+    rate_limit.note_response("x", Response(200, {"x-rate-limit-remaining": "0"}))
+    rate_limit.acquire("x", sleep=sleep)
+    assert slept == [pytest.approx(1.0)]
@@ -0,0 +1,109 @@
+import importlib
+from datetime import datetime
+from pathlib import Path
+
+
+def test_build_report_streams_grouped_sections(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATA_DIR", str(tmp_path))
+    from app import settings as settings_module
+
+    importlib.reload(settings_module)
+    from app import db as db_module
+
+    importlib.reload(db_module)
+    from workers import report_generator as report_module
+
+    importlib.reload(report_module)
+    db_module.init_db()
+
+    now = datetime.utcnow().isoformat()
+    base = {"source_type": "rss", "author": "lab", "ingested_at": now, "content": "transcript " * 1000}
+    db_module.insert_item(
+        {
+            **base,
+            "title": "GPU <supply>",
+            "url": "https://example.com/gpu",
+            "published_at": "2025-11-09T10:00:00+00:00",
+            "tags": ["Infra & semis"],
+            "dedupe_hash": "gpu",
+        }
+    )
+    db_module.insert_item(
+        {
+            **base,
+            "title": "New paper",
+            "url": "https://example.com/paper",
+            "published_at": "2025-11-08T10:00:00+00:00",
+            "tags": ["Frontier research", "Infra & semis"],
+            "dedupe_hash": "paper",
+        }
+    )
+
+    rows = list(report_module.iter_report_rows(days=7))
+    assert [(tag, item["title"]) for tag, item in rows] == [
+        ("Frontier research", "New paper"),
+        ("Infra & semis", "GPU <supply>"),
+        ("Infra & semis", "New paper"),
+    ]
+    assert "content" not in rows[0][1]
+
+    monkeypatch.setattr(report_module, "render_pdf", lambda html_path, pdf_path: "PDF generation failed: test")
+    report_paths = report_module.build_report(days=7)
+    markdown_text = Path(report_paths["markdown"]).read_text(encoding="utf-8")
+    assert markdown_text == report_module.generate_markdown([dict(row) for row in db_module.query_items({})])
+    html_text = Path(report_paths["html"]).read_text(encoding="utf-8")
+    assert "<h2>Frontier research</h2>" in html_text
+    assert "GPU &lt;supply&gt;" in html_text
+    assert report_paths["pdf"] is None
+    assert report_paths["pdf_error"] == "PDF generation failed: test"
+
+
+def test_build_report_reuses_artifacts_until_data_changes(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATA_DIR", str(tmp_path))
+    from app import settings as settings_module
+
+    importlib.reload(settings_module)
+    from app import db as db_module
+
+    importlib.reload(db_module)
+    from workers import report_generator as report_module
+
+    importlib.reload(report_module)
+    db_module.init_db()
+
+    now = datetime.utcnow().isoformat()
+    base = {"source_type": "rss", "author": "lab", "ingested_at": now, "tags": ["Infra & semis"]}
+    db_module.insert_item({**base, "title": "First", "url": "https://example.com/1", "dedupe_hash": "1"})
+
+    renders = []
+
+    def fake_render(html_path, pdf_path):
+        renders.append(pdf_path)
+        Path(pdf_path).write_bytes(b"%PDF")
+        return None
+
+    monkeypatch.setattr(report_module, "render_pdf", fake_render)
+    first = report_module.build_report(days=7)
+    assert Path(first["pdf"]).exists()
+    # Rendered to a private temp file, then renamed into place; nothing is left behind.
+    assert Path(renders[0]) != Path(first["pdf"])
+    assert not list(Path(first["pdf"]).parent.glob("*.tmp"))
+
+    def fail_rows(days):
+        raise AssertionError("cached report should not be rebuilt")
+
+    monkeypatch.setattr(report_module, "iter_report_rows", fail_rows)
+    assert report_module.build_report(days=7) == first
+    assert len(renders) == 1
+
+    monkeypatch.undo()
+    monkeypatch.setenv("DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(report_module, "render_pdf", fake_render)
+    monkeypatch.setattr(report_module.settings, "report_cache_max_files", 3)
+    db_module.insert_item({**base, "title": "Second", "url": "https://example.com/2", "dedupe_hash": "2"})
+    second = report_module.build_report(days=7)
+    assert second["markdown"] != first["markdown"]
+    assert "Second" in Path(second["markdown"]).read_text(encoding="utf-8")
+    assert len(renders) == 2
+    assert not Path(first["markdown"]).exists()
+    assert Path(second["pdf"]).exists()
@@ -0,0 +1,105 @@
+import importlib
+
+from fastapi.testclient import TestClient
+
+
+def _setup(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATA_DIR", str(tmp_path))
+    from app import settings as settings_module
+
+    importlib.reload(settings_module)
+    from app import db as db_module
+
+    importlib.reload(db_module)
+    from workers import scheduler as scheduler_module
+
+    importlib.reload(scheduler_module)
+    db_module.init_db()
+    return db_module, scheduler_module
+
+
+def test_lease_is_exclusive_until_it_expires(tmp_path, monkeypatch):
+    db_module, _ = _setup(tmp_path, monkeypatch)
+    assert db_module.acquire_lease("jobs", "a", 30, now=1000)
+    assert not db_module.acquire_lease("jobs", "b", 30, now=1010)
+    assert db_module.acquire_lease("jobs", "a", 30, now=1020)
+    assert not db_module.acquire_lease("jobs", "b", 30, now=1049)
+    assert db_module.acquire_lease("jobs", "b", 30, now=1051)
+    db_module.release_lease("jobs", "a")
+    assert not db_module.acquire_lease("jobs", "a", 30, now=1052)
+    db_module.release_lease("jobs", "b")
+    assert db_module.acquire_lease("jobs", "a", 30, now=1053)
+
+
+class FakeScheduler:
+    def __init__(self, wrap):
+        self.wrap = wrap
+        self.running = False
+
+    def start(self):
+        self.running = True
+
+    def shutdown(self, wait=True):
+        self.running = False
+
+
+def test_only_one_process_runs_the_schedule(tmp_path, monkeypatch):
+    _, scheduler_module = _setup(tmp_path, monkeypatch)
+    built = []
+    monkeypatch.setattr(scheduler_module, "build_scheduler", lambda wrap: built.append(FakeScheduler(wrap)) or built[-1])
+    first = scheduler_module.LeaderScheduler(lease_seconds=30, holder="first")
+    second = scheduler_module.LeaderScheduler(lease_seconds=30, holder="second")
+
+    first.tick()
+    second.tick()
+    first.tick()
+    assert first.is_leader() and not second.is_leader()
+    assert [scheduler.running for scheduler in built] == [True]
+
+    ran = []
+    job = built[0].wrap(lambda: ran.append("job"))
+    job()
+    first._expires_at = 0.0
+    job()
+    assert ran == ["job"]
+
+    first.stop()
+    assert not built[0].running
+    second.tick()
+    assert second.is_leader()
+    assert [scheduler.running for scheduler in built] == [False, True]
+    second.stop()
+
+
+def test_ingest_button_queues_a_run_for_the_lease_holder(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATA_DIR", str(tmp_path))
+    from app import settings as settings_module
+
+    importlib.reload(settings_module)
+    from app import db as db_module
+
+    importlib.reload(db_module)
+    from app import page_cache as page_cache_module
+    from workers import scheduler as scheduler_module
+
+    importlib.reload(page_cache_module)
+    importlib.reload(scheduler_module)
+    from app import main as main_module
+
+    importlib.reload(main_module)
+    db_module.init_db()
+    runs = []
+    monkeypatch.setattr(scheduler_module, "run_ingestion", runs.append)
+    client = TestClient(main_module.app)
+    client.post("/login", data={"password": "changeme"})
+
+    for _ in range(2):
+        assert client.post("/ingest/run", follow_redirects=False).status_code == 302
+    # Nothing ran in the web worker; the lease holder waits out a running ingest, then runs one for both clicks.
+    assert runs == []
+    with scheduler_module.INGEST_LOCK:
+        scheduler_module.run_requested_ingest()
+    assert runs == []
+    scheduler_module.run_requested_ingest()
+    scheduler_module.run_requested_ingest()
+    assert len(runs) == 1
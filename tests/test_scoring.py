@@ -13,3 +13,56 @@ def test_rule_score_accepts_timezone_aware_published_at() -> None:
     published_at = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc).isoformat()
     score = rule_score({"published_at": published_at})
     assert isinstance(score, float)
+
+
+def test_rescore_items_matches_rule_score(tmp_path, monkeypatch) -> None:
+    import importlib
+    from datetime import timedelta
+
+    monkeypatch.setenv("DATA_DIR", str(tmp_path))
+    from app import settings as settings_module
+
+    importlib.reload(settings_module)
+    from app import db as db_module
+
+    importlib.reload(db_module)
+    from workers import scoring
+
+    importlib.reload(scoring)
+    db_module.init_db()
+
+    now = datetime.now(timezone.utc)
+    published = [
+        (now - timedelta(hours=3)).isoformat(),
+        (now - timedelta(hours=30)).replace(tzinfo=None).isoformat(),
+        (now - timedelta(hours=10)).astimezone(timezone(timedelta(hours=8))).isoformat(),
+        "2020-01-01T00:00:00Z",
+        "not a date",
+        None,
+    ]
+    items = []
+    for index, published_at in enumerate(published):
+        item = {
+            "source_type": ["x", "youtube", "web", "rss", "podcast", "web"][index],
+            "title": ["New Benchmark", "Export Control policy", "plain", "Paper launch", "", "LAUNCH day"][index],
+            "url": f"https://example.com/{index}",
+            "published_at": published_at,
+            "ingested_at": now.isoformat(),
+            "excerpt": "datacenter buildout" if index % 2 else None,
+            "score": 0.0,
+            "score_adjust": 0.5 if index == 1 else 0.0,
+            "tags": [],
+            "dedupe_hash": f"hash-{index}",
+        }
+        item["id"] = db_module.insert_item(item)
+        items.append(item)
+
+    changed = scoring.rescore_items(now=now, chunk_size=4)
+    assert changed == len(items)
+    conn = db_module.get_connection()
+    scores = dict(conn.execute("SELECT id, score FROM items").fetchall())
+    conn.close()
+    for item in items:
+        expected = scoring.rule_score(item) + item["score_adjust"]
+        assert abs(scores[item["id"]] - expected) < 0.011
+    assert scoring.rescore_items(now=now) == 0
@@ -0,0 +1,91 @@
+import importlib
+from datetime import datetime, timedelta, timezone
+
+from workers.sharding import HashRing, entry_key, partition_watchlist
+
+
+def test_hash_ring_moves_few_keys_when_growing():
+    keys = [f"x_handle:user{index}" for index in range(2000)]
+    before = HashRing(list(range(4)))
+    after = HashRing(list(range(5)))
+    moved = sum(1 for key in keys if before.node_for(key) != after.node_for(key))
+    assert moved < len(keys) * 0.35
+
+
+def test_partition_watchlist_covers_every_entry():
+    watchlist = [{"name": f"p{index}", "x_handle": f"h{index}"} for index in range(100)]
+    partitions = partition_watchlist(watchlist, 3)
+    assert sorted(entry["name"] for part in partitions for entry in part) == sorted(
+        entry["name"] for entry in watchlist
+    )
+    assert all(partitions)
+    assert entry_key({"name": "Feed", "rss_url": "https://Example.com/feed"}) == "rss_url:https://example.com/feed"
+
+
+def _write_feed(path, title, published):
+    path.write_text(
+        f"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>{title}</title>
+<item><title>{title} ships a new AI model</title><link>https://example.com/{title}</link>
+<description>{title} announces an AI model release</description>
+<pubDate>{published}</pubDate></item>
+</channel></rss>""",
+        encoding="utf-8",
+    )
+
+
+def test_sharded_ingestion_merges_through_single_writer(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATA_DIR", str(tmp_path))
+    from app import settings as settings_module
+
+    importlib.reload(settings_module)
+    from app import db as db_module
+
+    importlib.reload(db_module)
+    from workers import ingest as ingest_module
+
+    importlib.reload(ingest_module)
+    from workers import sharding as sharding_module
+
+    importlib.reload(sharding_module)
+    db_module.init_db()
+
+    published = (datetime.now(timezone.utc) - timedelta(hours=1)).strftime("%a, %d %b %Y %H:%M:%S GMT")
+    watchlist = []
+    for name in ("alpha", "beta", "gamma", "delta"):
+        feed = tmp_path / f"{name}.xml"
+        _write_feed(feed, name, published)
+        watchlist.append({"name": name, "entry_type": "rss", "rss_url": str(feed)})
+
+    result = sharding_module.run_sharded_ingestion(watchlist, 2)
+    assert result["inserted"] == 4
+    assert result["sources"]["rss"] == 4
+    assert len(result["shards"]) == 2
+    assert sum(shard["inserted"] for shard in result["shards"]) == 4
+    assert sum(shard["watchlist_len"] for shard in result["shards"]) == 4
+
+
+def test_sharded_ingestion_plans_web_queries_once(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATA_DIR", str(tmp_path))
+    monkeypatch.setenv("WEB_SEARCH_TERMS_PER_QUERY", "1")
+    from app import settings as settings_module
+
+    importlib.reload(settings_module)
+    from app import db as db_module
+
+    importlib.reload(db_module)
+    from workers import web_search as web_search_module
+
+    importlib.reload(web_search_module)
+    from workers import sharding as sharding_module
+
+    importlib.reload(sharding_module)
+    db_module.init_db()
+
+    # Three queries for the whole run, however many shards fetch them.
+    monkeypatch.setattr(web_search_module, "run_budget", lambda now: 3)
+    watchlist = [
+        {"name": f"lab{index}", "entry_type": "org", "website": f"https://lab{index}.ai"} for index in range(6)
+    ]
+    result = sharding_module.run_sharded_ingestion(watchlist, 2)
+    assert sorted(shard["queries_len"] for shard in result["shards"]) == [1, 2]
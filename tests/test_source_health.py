@@ -0,0 +1,102 @@
+import importlib
+
+from fastapi.testclient import TestClient
+
+
+def _reload(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATA_DIR", str(tmp_path))
+    from app import settings as settings_module
+
+    importlib.reload(settings_module)
+    from app import db as db_module
+
+    importlib.reload(db_module)
+    from workers import source_health as source_health_module
+
+    importlib.reload(source_health_module)
+    db_module.init_db()
+    return db_module, source_health_module
+
+
+def test_breaker_opens_after_repeated_failures_and_backs_off(tmp_path, monkeypatch):
+    db_module, health = _reload(tmp_path, monkeypatch)
+    calls = []
+
+    def broken():
+        calls.append(1)
+        raise health.SourceError("http_404", "gone")
+
+    for _ in range(3):
+        assert health.guarded("rss", "https://feed.example/rss", broken) is None
+    assert health.is_open("rss", "https://feed.example/rss")
+    assert health.guarded("rss", "https://feed.example/rss", broken) is None
+    assert len(calls) == 3
+
+    row = db_module.get_source_health("rss", "https://feed.example/rss")
+    assert row["consecutive_failures"] == 3 and row["error_class"] == "http_404"
+    assert row["open_until"] - row["last_failure_at"] == 3600
+
+    # Half-open: one more failure after the backoff doubles it.
+    later = row["open_until"] + 1
+    health.record_failure("rss", "https://feed.example/rss", "http_404", "gone", 0.1, now=later)
+    row = db_module.get_source_health("rss", "https://feed.example/rss")
+    assert row["open_until"] - later == 7200
+    assert health.backoff_seconds(20) == 48 * 3600
+
+    monkeypatch.setattr(health, "is_open", lambda source_type, source_key: False)
+    assert health.guarded("rss", "https://feed.example/rss", lambda: ["entry"]) == ["entry"]
+    row = db_module.get_source_health("rss", "https://feed.example/rss")
+    assert row["consecutive_failures"] == 0 and row["open_until"] == 0 and row["last_success_at"]
+
+
+def test_unreachable_feed_is_recorded_and_listed(tmp_path, monkeypatch):
+    db_module, health = _reload(tmp_path, monkeypatch)
+    from workers import rss_ingest as rss_module
+
+    importlib.reload(rss_module)
+    assert list(rss_module.iter_feed_entries(["http://127.0.0.1:9/feed.xml"])) == []
+    row = db_module.get_source_health("rss", "http://127.0.0.1:9/feed.xml")
+    assert row["consecutive_failures"] == 1 and row["error_class"] and row["latency_ewma"] is not None
+
+    from app import page_cache as page_cache_module
+    from app import main as main_module
+
+    importlib.reload(page_cache_module)
+    importlib.reload(main_module)
+    client = TestClient(main_module.app)
+    client.post("/login", data={"password": "changeme"})
+    page = client.get("/sources")
+    assert page.status_code == 200
+    assert "failing" in page.text and "http://127.0.0.1:9/feed.xml" in page.text
+
+
+def test_malformed_payload_fails_the_source_not_the_thread(tmp_path, monkeypatch):
+    monkeypatch.setenv("YOUTUBE_API_KEY", "test-key")
+    db_module, health = _reload(tmp_path, monkeypatch)
+    from workers import youtube_client as youtube_module
+
+    importlib.reload(youtube_module)
+
+    class Response:
+        status_code = 200
+
+        def __init__(self, payload):
+            self.payload = payload
+
+        def json(self):
+            return self.payload
+
+    def http_get(url, params, **kwargs):
+        if params.get("type") == "channel":
+            # The channel search answers with an item that lacks its snippet.
+            return Response({"items": [{"id": {"kind": "youtube#channel"}}]})
+        video = {"id": {"kind": "youtube#video", "videoId": "v1"}, "snippet": {"title": "Launch"}}
+        return Response({"items": [video]})
+
+    monkeypatch.setattr(youtube_module, "http_get", http_get)
+    monkeypatch.setattr(youtube_module, "_fetch_transcript", lambda video_id: "transcript")
+    channels = ["https://www.youtube.com/@broken", "https://www.youtube.com/channel/UC1"]
+    items = list(youtube_module.iter_videos(channels))
+    assert [(item["title"], item["content"]) for item in items] == [("Launch", "transcript")]
+    row = db_module.get_source_health("youtube", channels[0])
+    assert row["error_class"] == "bad_payload" and "KeyError" in row["error_message"]
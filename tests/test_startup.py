@@ -0,0 +1,41 @@
+import importlib
+import threading
+
+from fastapi.testclient import TestClient
+
+
+def test_startup_serves_before_maintenance_finishes(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATA_DIR", str(tmp_path))
+    from app import settings as settings_module
+
+    importlib.reload(settings_module)
+    from app import db as db_module
+
+    importlib.reload(db_module)
+    from workers import scheduler as scheduler_module
+
+    importlib.reload(scheduler_module)
+    from app import page_cache as page_cache_module
+
+    importlib.reload(page_cache_module)
+    from app import main as main_module
+
+    importlib.reload(main_module)
+
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_cleanup():
+        started.set()
+        release.wait(10)
+
+    monkeypatch.setattr(scheduler_module, "run_cleanup", slow_cleanup)
+    try:
+        with TestClient(main_module.app) as client:
+            assert client.get("/login").status_code == 200
+            assert started.wait(5)
+            assert client.get("/login").status_code == 200
+            release.set()
+    finally:
+        release.set()
+        main_module.scheduler.stop()
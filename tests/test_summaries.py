@@ -0,0 +1,130 @@
+import importlib
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+
+class FakeLLM:
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def enabled(self):
+        return True
+
+    def chinese_summary(self, text):
+        with self.lock:
+            self.calls.append(text)
+        return f"摘要 {len(self.calls)}"
+
+
+def test_summaries_are_cached_by_content_and_used_by_report(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATA_DIR", str(tmp_path))
+    from app import settings as settings_module
+
+    importlib.reload(settings_module)
+    from app import db as db_module
+
+    importlib.reload(db_module)
+    from workers import summaries as summaries_module
+
+    importlib.reload(summaries_module)
+    from workers import report_generator as report_module
+
+    importlib.reload(report_module)
+    db_module.init_db()
+
+    now = datetime.utcnow().isoformat()
+    base = {
+        "source_type": "rss",
+        "published_at": now,
+        "ingested_at": now,
+        "excerpt": "A new inference chip ships",
+        "tags": ["Infra & semis"],
+    }
+    for index, (title, score) in enumerate([("Chip ships", 3.0), ("Chip ships", 3.0), ("Minor note", 0.5)]):
+        db_module.insert_item(
+            {**base, "title": title, "url": f"https://example.com/{index}", "score": score, "dedupe_hash": str(index)}
+        )
+
+    fake = FakeLLM()
+    monkeypatch.setattr(summaries_module, "LLM", fake)
+    assert summaries_module.summarize_pending() == {
+        "pending": 2,
+        "cached": 0,
+        "generated": 1,
+        "failed": 0,
+        "deferred": 0,
+    }
+    assert len(fake.calls) == 1
+
+    conn = db_module.get_connection()
+    rows = dict(conn.execute("SELECT id, summary_zh FROM items").fetchall())
+    conn.execute("UPDATE items SET summary_zh = NULL WHERE id = 2")
+    conn.commit()
+    conn.close()
+    assert rows == {1: "摘要 1", 2: "摘要 1", 3: None}
+
+    assert summaries_module.summarize_pending()["cached"] == 1
+    assert len(fake.calls) == 1
+
+    monkeypatch.setattr(report_module, "render_pdf", lambda html_path, pdf_path: "skipped")
+    markdown_text = Path(report_module.build_report(days=7)["markdown"]).read_text(encoding="utf-8")
+    assert "- 中文摘要: 摘要 1" in markdown_text
+
+
+def test_failed_summaries_back_off(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATA_DIR", str(tmp_path))
+    from app import settings as settings_module
+
+    importlib.reload(settings_module)
+    from app import db as db_module
+
+    importlib.reload(db_module)
+    from workers import rate_limit as rate_limit_module
+    from workers import summaries as summaries_module
+
+    importlib.reload(summaries_module)
+    db_module.init_db()
+    now = datetime.utcnow().isoformat()
+    for index, title in enumerate(["Empty answer", "Rate limited"]):
+        db_module.insert_item(
+            {
+                "source_type": "rss",
+                "title": title,
+                "url": f"https://example.com/{index}",
+                "published_at": now,
+                "ingested_at": now,
+                "score": 3.0,
+                "dedupe_hash": str(index),
+            }
+        )
+
+    class FlakyLLM(FakeLLM):
+        def chinese_summary(self, text):
+            if text.startswith("Rate limited"):
+                raise rate_limit_module.RateLimited("openai", "next request slot in 600s")
+            super().chinese_summary(text)
+            return ""
+
+    fake = FlakyLLM()
+    monkeypatch.setattr(summaries_module, "LLM", fake)
+    stats = summaries_module.summarize_pending()
+    assert (stats["failed"], stats["deferred"]) == (1, 1)
+    # Only the rate-limited item comes back on the next run; the empty one waits out its backoff.
+    assert summaries_module.summarize_pending()["pending"] == 1
+    assert len(fake.calls) == 1
+
+    conn = db_module.get_connection()
+    due = (datetime.utcnow() - timedelta(minutes=1)).isoformat()
+    conn.execute("UPDATE summary_failures SET retry_after = ?", (due,))
+    conn.commit()
+    conn.close()
+    assert summaries_module.summarize_pending()["failed"] == 1
+    assert len(fake.calls) == 2
+    conn = db_module.get_connection()
+    attempts, retry_after = conn.execute("SELECT attempts, retry_after FROM summary_failures").fetchone()
+    conn.close()
+    assert attempts == 2
+    assert datetime.fromisoformat(retry_after) - datetime.utcnow() > timedelta(minutes=110)
+    assert summaries_module.retry_delay(10) == timedelta(hours=24)
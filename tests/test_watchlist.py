@@ -1,3 +1,5 @@
+import importlib
+
 import pytest
 
 pytest.importorskip("yaml")
@@ -9,3 +11,84 @@ def test_watchlist_load():
     data = load_watchlist()
     assert "people" in data
     assert len(data.get("people", [])) > 0
+
+
+def _reload(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATA_DIR", str(tmp_path))
+    from app import settings as settings_module
+
+    importlib.reload(settings_module)
+    from app import db as db_module
+
+    importlib.reload(db_module)
+    from workers import watchlist as watchlist_module
+
+    importlib.reload(watchlist_module)
+    db_module.init_db()
+    return db_module, watchlist_module
+
+
+def test_index_is_rebuilt_only_after_writes(tmp_path, monkeypatch):
+    db_module, watchlist_module = _reload(tmp_path, monkeypatch)
+    db_module.upsert_watchlist(
+        [
+            {"name": "Andrej Karpathy", "entry_type": "person", "lab": "Eureka Labs", "x_handle": "karpathy"},
+            {"name": "OpenAI", "entry_type": "org", "lab": "OpenAI", "website": "https://openai.com/news"},
+            {"name": "Import AI", "entry_type": "rss", "rss_url": "https://importai.substack.com/feed"},
+        ]
+    )
+    index = watchlist_module.get_watchlist_index()
+    assert watchlist_module.get_watchlist_index() is index
+    assert [entry["name"] for entry in index] == ["Andrej Karpathy", "Import AI", "OpenAI"]
+    assert index.find_handle("@Karpathy")["name"] == "Andrej Karpathy"
+    assert [entry["name"] for entry in index.for_lab("openai")] == ["OpenAI"]
+    assert [entry["name"] for entry in index.of_type("rss")] == ["Import AI"]
+    assert watchlist_module.all_websites(index) == ["https://openai.com/news"]
+
+    entry = watchlist_module.add_watchlist_entry({"name": "Sam Altman", "x_handle": "sama"})
+    assert entry["id"] and entry["entry_type"] == "person"
+    fresh = watchlist_module.get_watchlist_index()
+    assert fresh is not index and fresh.version > index.version
+    assert watchlist_module.all_x_handles(fresh) == ["karpathy", "sama"]
+    assert watchlist_module.load_watchlist() == list(fresh)
+
+
+def test_added_entry_is_backfilled_once(tmp_path, monkeypatch):
+    db_module, watchlist_module = _reload(tmp_path, monkeypatch)
+    from fastapi.testclient import TestClient
+
+    from app import main as main_module
+    from app import page_cache as page_cache_module
+    from workers import scheduler as scheduler_module
+
+    importlib.reload(page_cache_module)
+    importlib.reload(scheduler_module)
+    importlib.reload(main_module)
+    backfilled = []
+    monkeypatch.setattr(scheduler_module, "backfill_entry", backfilled.append)
+    client = TestClient(main_module.app)
+    client.post("/login", data={"password": "changeme"})
+
+    feed = {"name": "Import AI", "entry_type": "rss", "rss_url": "https://importai.substack.com/feed"}
+    client.post("/watchlist/add", data=feed)
+    # Queued for the lease holder, not fetched by the web worker; skipped while an hourly ingest runs.
+    assert backfilled == []
+    with scheduler_module.INGEST_LOCK:
+        scheduler_module.run_pending_backfills()
+    assert backfilled == []
+    scheduler_module.run_pending_backfills()
+    assert [entry["rss_url"] for entry in backfilled] == ["https://importai.substack.com/feed"]
+    assert watchlist_module.all_rss_feeds(watchlist_module.get_watchlist_index()) == [
+        "https://importai.substack.com/feed"
+    ]
+
+    db_module.add_suggested_person("Sam Altman", "mentioned often")
+    suggested_id = db_module.list_suggested_people()[0]["id"]
+    approval = {"suggested_id": suggested_id, "name": "Sam Altman", "x_handle": "@sama"}
+    for _ in range(2):
+        client.post("/suggested/approve", data=approval)
+    scheduler_module.run_pending_backfills()
+    scheduler_module.run_pending_backfills()
+    # The second approval finds the handle already watched.
+    assert [entry["name"] for entry in backfilled] == ["Import AI", "Sam Altman"]
+    assert len(watchlist_module.get_watchlist_index().of_type("person")) == 1
@@ -106,3 +106,76 @@ def test_web_search_inserts_only_recent_items(tmp_path, monkeypatch):
 
     for value in rows:
         assert value[0].endswith("+00:00")
+
+
+def _reload_web_search(tmp_path, monkeypatch, **env):
+    monkeypatch.setenv("DATA_DIR", str(tmp_path))
+    for name, value in env.items():
+        monkeypatch.setenv(name, str(value))
+    from app import settings as settings_module
+
+    importlib.reload(settings_module)
+    from app import db as db_module
+
+    importlib.reload(db_module)
+    from workers import http_client, rate_limit, source_health
+    from workers import web_search as web_search_module
+
+    for module in (rate_limit, http_client, source_health, web_search_module):
+        importlib.reload(module)
+    db_module.init_db()
+    return web_search_module
+
+
+def test_queries_are_grouped_with_or_and_site(tmp_path, monkeypatch):
+    web_search_module = _reload_web_search(tmp_path, monkeypatch, WEB_SEARCH_TERMS_PER_QUERY=3)
+    watchlist = [{"website": f"https://lab{index}.ai/blog/"} for index in range(4)]
+    watchlist += [{"x_handle": "@karpathy"}, {"x_handle": "sama"}]
+    assert web_search_module.build_queries_from_watchlist(watchlist) == [
+        "site:lab0.ai/blog OR site:lab1.ai/blog OR site:lab2.ai/blog",
+        "site:lab3.ai/blog",
+        '"karpathy" OR "sama"',
+    ]
+
+
+def test_planner_rotates_within_quota_and_caches(tmp_path, monkeypatch):
+    web_search_module = _reload_web_search(
+        tmp_path, monkeypatch, GOOGLE_CSE_API_KEY="key", GOOGLE_CSE_CX="cx", WEB_SEARCH_DAILY_QUOTA=3
+    )
+    calls = []
+
+    class Response:
+        status_code = 200
+        headers: dict = {}
+
+        def json(self):
+            return {"items": [{"link": f"https://example.com/{len(calls)}", "title": "t"}]}
+
+    def fake_get(url, params, timeout):
+        calls.append(params)
+        return Response()
+
+    from workers import http_client, rate_limit
+
+    monkeypatch.setattr(http_client.requests, "get", fake_get)
+    queries = [f"q{index}" for index in range(5)]
+    # 23:00 in Los Angeles: the last run of the quota day may spend everything left.
+    first = datetime(2025, 11, 11, 7, 0, tzinfo=timezone.utc)
+
+    monkeypatch.setattr(web_search_module, "utc_now", lambda: first)
+    monkeypatch.setattr(rate_limit, "utc_now", lambda: first)
+    assert len(list(web_search_module.iter_web_results(queries))) == 3
+    assert [call["q"] for call in calls] == ["q0", "q1", "q2"]
+    assert {call["dateRestrict"] for call in calls} == {"d7"} and calls[0]["num"] == 10
+    # Quota spent: nothing more today, and fresh queries come from the cache.
+    assert list(web_search_module.iter_web_results(queries)) == []
+    assert web_search_module.fetch_results("q0", now=first)[0]["link"] == "https://example.com/1"
+    assert len(calls) == 3
+
+    later = first + timedelta(days=2)
+    monkeypatch.setattr(web_search_module, "utc_now", lambda: later)
+    monkeypatch.setattr(rate_limit, "utc_now", lambda: later)
+    list(web_search_module.iter_web_results(queries))
+    # Never-fetched queries first, then the oldest; a refetch only asks for the days since.
+    assert [call["q"] for call in calls[3:]] == ["q3", "q4", "q0"]
+    assert calls[-1]["dateRestrict"] == "d2"
@@ -1,15 +1,70 @@
 from __future__ import annotations
 
+import gzip
+import json
 import logging
+from pathlib import Path
 
-from app.db import cleanup_old_items
+from app.dates import utc_now
+from app.db import cleanup_old_items, get_item, prune_search_cache
+from app.settings import settings
+from workers.digest import DIGEST, rebuild_digest_candidates, record_candidate
+from workers.embeddings import compact_index, embed_item, store_embedding
 
 LOGGER = logging.getLogger(__name__)
 
 
+def archive_path() -> Path:
+    return Path(settings.data_dir) / "archive" / f"items-{utc_now():%Y-%m}.jsonl.gz"
+
+
+def archive_items(rows: list[dict]) -> None:
+    """Append expired items to this month's gzip JSONL archive.
+
+    Each call writes one gzip member; readers (``gzip.open``, ``zcat``) see the
+    concatenation as a single stream. The file is flushed before the rows are deleted.
+    """
+    path = archive_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with gzip.open(path, "at", encoding="utf-8") as handle:
+        for row in rows:
+            handle.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+
+def adopt_promoted_leaders(item_ids: list[int]) -> int:
+    """Give leaders promoted by cleanup what ingest gives every leader: a digest candidacy and an embedding."""
+    adopted = 0
+    for item_id in item_ids:
+        item = get_item(item_id)
+        if item is None:
+            # Promoted, then deleted by a later batch.
+            continue
+        item["tags"] = [tag for tag in (item["tags"] or "").split(",") if tag]
+        record_candidate(item_id, item)
+        try:
+            vector = embed_item(item)
+        except Exception:
+            LOGGER.exception("embed_item_failed id=%s", item_id)
+            continue
+        if vector is not None:
+            store_embedding(item_id, vector)
+        adopted += 1
+    return adopted
+
+
 def run_cleanup() -> int:
-    deleted = cleanup_old_items()
-    LOGGER.info("cleanup_deleted=%s", deleted)
+    promoted: list[int] = []
+    deleted = cleanup_old_items(archive=archive_items if settings.cleanup_archive else None, promoted=promoted)
+    candidates = rebuild_digest_candidates()
+    # The rebuild replaced digest_candidates under any heaps this process holds.
+    DIGEST.reset()
+    adopted = adopt_promoted_leaders(promoted)
+    embeddings_removed = compact_index()
+    prune_search_cache(settings.content_max_age_days * 86400)
+    LOGGER.info(
+        "cleanup_deleted=%s promoted=%s digest_candidates=%s embeddings_removed=%s",
+        deleted, adopted, candidates, embeddings_removed,
+    )
     return deleted
 
 
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import hashlib
+import random
+import re
+import sqlite3
+from datetime import datetime, timedelta
+
+from app.content import canonicalize_url
+from app.settings import settings
+
+MINHASH_PERMUTATIONS = 64
+MINHASH_BANDS = 16
+BAND_ROWS = MINHASH_PERMUTATIONS // MINHASH_BANDS
+MIN_SHINGLE_TOKENS = 5
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+URL_RE = re.compile(r"https?://\S+")
+
+_rng = random.Random(20251101)
+PERMUTATIONS = [
+    (_rng.randrange(1, MERSENNE_PRIME), _rng.randrange(0, MERSENNE_PRIME))
+    for _ in range(MINHASH_PERMUTATIONS)
+]
+
+
+def _shingles(text: str) -> set[str]:
+    tokens = TOKEN_RE.findall(URL_RE.sub(" ", text.lower()))
+    if len(tokens) < MIN_SHINGLE_TOKENS:
+        return set()
+    return {*tokens, *(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))}
+
+
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=4).digest(), "big")
+
+
+def minhash(text: str) -> list[int] | None:
+    shingles = _shingles(text)
+    if not shingles:
+        return None
+    hashes = [_feature_hash(shingle) for shingle in shingles]
+    return [
+        min((a * value + b) % MERSENNE_PRIME for value in hashes) & MAX_HASH
+        for a, b in PERMUTATIONS
+    ]
+
+
+def similarity(left: list[int], right: list[int]) -> float:
+    return sum(1 for a, b in zip(left, right) if a == b) / MINHASH_PERMUTATIONS
+
+
+def encode_signature(signature: list[int]) -> str:
+    return "".join(f"{value:08x}" for value in signature)
+
+
+def decode_signature(value: str) -> list[int]:
+    return [int(value[i : i + 8], 16) for i in range(0, len(value), 8)]
+
+
+def signature_bands(signature: list[int]) -> list[str]:
+    keys = []
+    for band in range(MINHASH_BANDS):
+        rows = signature[band * BAND_ROWS : (band + 1) * BAND_ROWS]
+        digest = hashlib.blake2b(repr(rows).encode(), digest_size=6).hexdigest()
+        keys.append(f"mh:{band}:{digest}")
+    return keys
+
+
+def item_urls(item: dict) -> list[str]:
+    urls = [item.get("url"), *(item.get("metadata") or {}).get("links", [])]
+    canonical: list[str] = []
+    for url in urls:
+        value = canonicalize_url(url)
+        if value and value not in canonical:
+            canonical.append(value)
+    return canonical
+
+
+def fingerprint_item(item: dict) -> None:
+    """Attach canonical URL, MinHash signature and index keys used for story clustering."""
+    urls = item_urls(item)
+    item["canonical_url"] = urls[0] if urls else None
+    text = " ".join(filter(None, [item.get("title"), item.get("excerpt")]))
+    signature = minhash(text)
+    item["minhash"] = encode_signature(signature) if signature else None
+    keys = [f"url:{url}" for url in urls]
+    if signature:
+        keys.extend(signature_bands(signature))
+    item["fingerprint_keys"] = keys
+
+
+def find_cluster_leader(conn: sqlite3.Connection, item: dict) -> sqlite3.Row | None:
+    """Return the leader row of the story cluster ``item`` belongs to, if any.
+
+    URL keys match exactly; MinHash band keys only nominate candidates, whose
+    estimated Jaccard similarity must then reach ``settings.cluster_min_similarity``.
+    """
+    if "fingerprint_keys" not in item:
+        fingerprint_item(item)
+    keys = item["fingerprint_keys"]
+    if not keys:
+        return None
+    since = datetime.utcnow() - timedelta(days=settings.cluster_window_days)
+    placeholders = ",".join("?" for _ in keys)
+    rows = conn.execute(
+        f"""
+        SELECT f.key, i.id, i.cluster_id, i.minhash
+        FROM item_fingerprints f
+        JOIN items i ON i.id = f.item_id
+        WHERE f.key IN ({placeholders}) AND i.ingested_at >= ?
+        ORDER BY i.id
+        """,
+        (*keys, since.isoformat()),
+    ).fetchall()
+    own_signature = decode_signature(item["minhash"]) if item.get("minhash") else None
+    leader_id = None
+    for row in rows:
+        if row["key"].startswith("url:"):
+            leader_id = row["cluster_id"] or row["id"]
+            break
+        if leader_id is None and own_signature and row["minhash"]:
+            score = similarity(own_signature, decode_signature(row["minhash"]))
+            if score >= settings.cluster_min_similarity:
+                leader_id = row["cluster_id"] or row["id"]
+    if leader_id is None:
+        return None
+    return conn.execute(
+        "SELECT id, summary, analysis FROM items WHERE id = ?", (leader_id,)
+    ).fetchone()
@@ -1,9 +1,16 @@
 from __future__ import annotations
 
-import trafilatura
+from app.metrics import EXTRACT_SECONDS
 
 
 def extract_excerpt(url: str) -> str | None:
+    with EXTRACT_SECONDS.time():
+        return _extract_excerpt(url)
+
+
+def _extract_excerpt(url: str) -> str | None:
+    import trafilatura  # lxml and friends cost ~200 ms to import; only ingest needs them
+
     try:
         downloaded = trafilatura.fetch_url(url)
         if not downloaded:
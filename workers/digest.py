@@ -1,6 +1,10 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta
+import heapq
+import sqlite3
+import threading
+from typing import Iterable
 
 from app.db import get_connection
 from app.settings import settings
@@ -9,18 +13,200 @@ from workers.llm import LLMClient
 LLM = LLMClient()
 
 
-def fetch_top_items(limit: int = 12) -> list[dict]:
+DIGEST_WINDOW = timedelta(days=1)
+ALL_VARIANT = "all"
+
+
+def _bucket(ingested_at: str) -> str:
+    """Hour bucket of an ISO timestamp, e.g. ``2025-11-09T08``."""
+    return ingested_at[:13]
+
+
+def item_variants(tags: Iterable[str]) -> list[str]:
+    return [ALL_VARIANT, *(f"tag:{tag}" for tag in tags)]
+
+
+class DigestAccumulator:
+    """Keeps the top-K digest candidates per variant and hour bucket.
+
+    Each ``(variant, bucket)`` is a min-heap of ``(score, published_at, item_id)``
+    seeded from ``digest_candidates`` the first time it is touched; a new item
+    only costs a comparison against the heap's minimum and at most one insert and
+    one delete. Any window of whole hours is then covered exactly by the union of
+    its buckets, each holding at most K rows.
+    """
+
+    def __init__(self, top_k: int) -> None:
+        self.top_k = top_k
+        self._heaps: dict[tuple[str, str], list[tuple]] = {}
+        self._lock = threading.Lock()
+
+    def reset(self) -> None:
+        """Forget in-memory heaps so they are reloaded from SQLite (another process may have written)."""
+        with self._lock:
+            self._heaps.clear()
+
+    def _heap(self, cursor: sqlite3.Cursor, variant: str, bucket: str) -> list[tuple]:
+        key = (variant, bucket)
+        if key not in self._heaps:
+            rows = cursor.execute(
+                "SELECT score, published_at, item_id FROM digest_candidates WHERE variant = ? AND bucket = ?",
+                key,
+            ).fetchall()
+            heap = [(row[0], row[1] or "", row[2]) for row in rows]
+            heapq.heapify(heap)
+            self._heaps[key] = heap
+        return self._heaps[key]
+
+    def add(self, item_id: int, item: dict) -> None:
+        bucket = _bucket(item["ingested_at"])
+        entry = (item.get("score") or 0, item.get("published_at") or "", item_id)
+        with self._lock:
+            conn = get_connection()
+            cursor = conn.cursor()
+            stale = _bucket((datetime.utcnow() - DIGEST_WINDOW - timedelta(hours=1)).isoformat())
+            for key in [key for key in self._heaps if key[1] < stale]:
+                del self._heaps[key]
+            for variant in item_variants(item.get("tags") or []):
+                heap = self._heap(cursor, variant, bucket)
+                if len(heap) < self.top_k:
+                    heapq.heappush(heap, entry)
+                elif entry > heap[0]:
+                    evicted = heapq.heapreplace(heap, entry)
+                    cursor.execute(
+                        "DELETE FROM digest_candidates WHERE variant = ? AND bucket = ? AND item_id = ?",
+                        (variant, bucket, evicted[2]),
+                    )
+                else:
+                    continue
+                cursor.execute(
+                    """
+                    INSERT OR REPLACE INTO digest_candidates
+                    (variant, bucket, item_id, score, published_at, ingested_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    (variant, bucket, item_id, entry[0], item.get("published_at"), item["ingested_at"]),
+                )
+            conn.commit()
+            conn.close()
+
+
+DIGEST = DigestAccumulator(settings.digest_top_k)
+
+
+def record_candidate(item_id: int | None, item: dict) -> None:
+    """Offer a freshly inserted item to the digest; cluster duplicates never lead a digest."""
+    if item_id is not None and item.get("cluster_id") is None:
+        DIGEST.add(item_id, item)
+
+
+def rebuild_digest_candidates(now: datetime | None = None) -> int:
+    """Recompute ``digest_candidates`` for the current window from ``items``.
+
+    Used after cleanup (which can delete or promote cluster leaders) and for
+    databases filled without going through ingest.
+    """
+    now = now or datetime.utcnow()
+    since = now - DIGEST_WINDOW - timedelta(hours=1)
     conn = get_connection()
     cursor = conn.cursor()
-    since = datetime.utcnow() - timedelta(days=1)
-    rows = cursor.execute(
+    cursor.execute("DELETE FROM digest_candidates")
+    cursor.execute(
         """
-        SELECT * FROM items
-        WHERE ingested_at >= ?
+        INSERT INTO digest_candidates (variant, bucket, item_id, score, published_at, ingested_at)
+        SELECT variant, bucket, id, score, published_at, ingested_at FROM (
+            SELECT variant, bucket, id, score, published_at, ingested_at,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY variant, bucket ORDER BY score DESC, published_at DESC, id DESC
+                   ) AS rank
+            FROM (
+                SELECT ? AS variant, substr(ingested_at, 1, 13) AS bucket,
+                       id, score, published_at, ingested_at
+                FROM items WHERE ingested_at >= ? AND cluster_id IS NULL
+                UNION ALL
+                SELECT 'tag:' || t.tag, substr(i.ingested_at, 1, 13),
+                       i.id, i.score, i.published_at, i.ingested_at
+                FROM items i JOIN item_tags t ON t.item_id = i.id
+                WHERE i.ingested_at >= ? AND i.cluster_id IS NULL
+            )
+        )
+        WHERE rank <= ?
+        """,
+        (ALL_VARIANT, since.isoformat(), since.isoformat(), settings.digest_top_k),
+    )
+    rebuilt = cursor.rowcount
+    conn.commit()
+    conn.close()
+    DIGEST.reset()
+    return rebuilt
+
+
+_CLUSTER_SIZE = "1 + (SELECT COUNT(*) FROM items AS members WHERE members.cluster_id = items.id) AS cluster_size"
+
+
+def fetch_top_items(limit: int = 12, variant: str = ALL_VARIANT) -> list[dict]:
+    """Top leaders of the last day for ``variant`` ("all" or "tag:<tag>").
+
+    Whole hours of the window are read from ``digest_candidates``; only the
+    partial oldest hour is read from ``items`` directly.
+    """
+    if limit > settings.digest_top_k:
+        return _query_top_items(limit, variant)
+    since = datetime.utcnow() - DIGEST_WINDOW
+    first_full_bucket = _bucket((since.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)).isoformat())
+    conn = get_connection()
+    cursor = conn.cursor()
+    rows = cursor.execute(
+        f"""
+        SELECT items.*, {_CLUSTER_SIZE}
+        FROM digest_candidates c JOIN items ON items.id = c.item_id
+        WHERE c.variant = ? AND c.bucket >= ? AND items.cluster_id IS NULL
+        ORDER BY c.score DESC, c.published_at DESC
+        LIMIT ?
+        """,
+        (variant, first_full_bucket, limit),
+    ).fetchall()
+    # The unary ``+cluster_id`` keeps SQLite on the ingested_at range for this one
+    # hour instead of walking every cluster leader through idx_items_cluster_id.
+    tag_filter = ""
+    params: list = [since.isoformat(), first_full_bucket]
+    if variant != ALL_VARIANT:
+        tag_filter = "AND id IN (SELECT item_id FROM item_tags WHERE tag = ?)"
+        params.append(variant.removeprefix("tag:"))
+    rows += cursor.execute(
+        f"""
+        SELECT items.*, {_CLUSTER_SIZE}
+        FROM items
+        WHERE ingested_at >= ? AND ingested_at < ? AND +cluster_id IS NULL {tag_filter}
+        ORDER BY score DESC, published_at DESC
+        LIMIT ?
+        """,
+        (*params, limit),
+    ).fetchall()
+    conn.close()
+    items = [dict(row) for row in rows]
+    items.sort(key=lambda item: (item["score"] or 0, item["published_at"] or ""), reverse=True)
+    return items[:limit]
+
+
+def _query_top_items(limit: int, variant: str) -> list[dict]:
+    conn = get_connection()
+    cursor = conn.cursor()
+    since = datetime.utcnow() - DIGEST_WINDOW
+    tag_filter = ""
+    params: list = [since.isoformat()]
+    if variant != ALL_VARIANT:
+        tag_filter = "AND id IN (SELECT item_id FROM item_tags WHERE tag = ?)"
+        params.append(variant.removeprefix("tag:"))
+    rows = cursor.execute(
+        f"""
+        SELECT items.*, {_CLUSTER_SIZE}
+        FROM items
+        WHERE ingested_at >= ? AND cluster_id IS NULL {tag_filter}
         ORDER BY score DESC, published_at DESC
         LIMIT ?
         """,
-        (since.isoformat(), limit),
+        (*params, limit),
     ).fetchall()
     conn.close()
     return [dict(row) for row in rows]
@@ -31,10 +217,11 @@ def build_digest_html(items: list[dict]) -> str:
     for item in items:
         summary = item.get("summary") or item.get("excerpt") or ""
         analysis = item.get("analysis") or ""
+        related = _related_label(item)
         parts.append(
             f"<div style='margin-bottom:16px'>"
             f"<strong>{item['title']}</strong><br>"
-            f"<em>{item.get('source_type')} | {item.get('author') or ''}</em><br>"
+            f"<em>{item.get('source_type')} | {item.get('author') or ''}{related}</em><br>"
             f"<p>{summary}</p>"
             f"<p>{analysis}</p>"
             f"<a href='{settings.base_url}/items/{item['id']}'>View on dashboard</a>"
@@ -46,7 +233,12 @@ def build_digest_html(items: list[dict]) -> str:
 def build_digest_text(items: list[dict]) -> str:
     lines = ["AI Signal Radar - Morning Digest"]
     for item in items:
-        lines.append(f"- {item['title']} ({item.get('source_type')})")
+        lines.append(f"- {item['title']} ({item.get('source_type')}){_related_label(item)}")
         lines.append(f"  {item.get('summary') or item.get('excerpt') or ''}")
         lines.append(f"  {settings.base_url}/items/{item['id']}")
     return "\n".join(lines)
+
+
+def _related_label(item: dict) -> str:
+    related = (item.get("cluster_size") or 1) - 1
+    return f" | +{related} related" if related > 0 else ""
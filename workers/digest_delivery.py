@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import logging
+import smtplib
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable
+from zoneinfo import ZoneInfo
+
+from app.db import get_delivery_statuses, list_subscribers, record_delivery
+from app.metrics import DIGEST_DELIVERIES
+from app.settings import settings
+from workers.digest import ALL_VARIANT, build_digest_html, build_digest_text, fetch_top_items
+from workers.send_email import SMTPSession, build_message, smtp_configured
+
+LOGGER = logging.getLogger(__name__)
+
+SUBJECT = "AI Signal Radar Morning Digest"
+
+
+@dataclass
+class Recipient:
+    email: str
+    tags: list[str]
+    min_score: float = 0
+    max_items: int = 12
+
+    @property
+    def variants(self) -> list[str]:
+        return [f"tag:{tag}" for tag in self.tags] or [ALL_VARIANT]
+
+
+def load_recipients() -> list[Recipient]:
+    """Active subscribers, or the default recipient with an unfiltered digest when there are none."""
+    rows = list_subscribers(active_only=True)
+    if not rows:
+        return [Recipient(settings.default_email_recipient, [])]
+    return [
+        Recipient(
+            row["email"],
+            [tag.strip() for tag in (row["tags"] or "").split(",") if tag.strip()],
+            row["min_score"] or 0,
+            row["max_items"] or 12,
+        )
+        for row in rows
+    ]
+
+
+def select_items(recipient: Recipient, fetch: Callable[[int, str], list[dict]]) -> list[dict]:
+    merged: dict[int, dict] = {}
+    for variant in recipient.variants:
+        for item in fetch(recipient.max_items, variant):
+            merged[item["id"]] = item
+    items = [item for item in merged.values() if (item.get("score") or 0) >= recipient.min_score]
+    items.sort(key=lambda item: (item.get("score") or 0, item.get("published_at") or ""), reverse=True)
+    return items[: recipient.max_items]
+
+
+class Throttle:
+    """Spaces calls at least ``60 / per_minute`` seconds apart."""
+
+    def __init__(self, per_minute: int, sleep: Callable[[float], None] = time.sleep) -> None:
+        self.interval = 60 / per_minute if per_minute > 0 else 0
+        self.sleep = sleep
+        self._last: float | None = None
+
+    def wait(self) -> None:
+        if self._last is not None and self.interval:
+            remaining = self._last + self.interval - time.monotonic()
+            if remaining > 0:
+                self.sleep(remaining)
+        self._last = time.monotonic()
+
+
+def _is_permanent(exc: Exception) -> bool:
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in exc.recipients.values())
+    return isinstance(exc, smtplib.SMTPResponseException) and exc.smtp_code >= 500
+
+
+def deliver_digests(digest_date: str | None = None, sleep: Callable[[float], None] = time.sleep) -> dict:
+    """Send each active subscriber their filtered digest over one pooled SMTP session.
+
+    Recipients already marked ``sent`` for ``digest_date`` are skipped, so a rerun
+    after a partial failure only retries what is left. Transient SMTP errors are
+    retried with exponential backoff; 5xx replies fail the recipient immediately.
+    """
+    digest_date = digest_date or datetime.now(ZoneInfo(settings.timezone)).date().isoformat()
+    summary: Counter = Counter()
+    if not smtp_configured():
+        return {"digest_date": digest_date, "configured": False}
+
+    already = get_delivery_statuses(digest_date)
+    variant_cache: dict[tuple[int, str], list[dict]] = {}
+
+    def fetch(limit: int, variant: str) -> list[dict]:
+        if (limit, variant) not in variant_cache:
+            variant_cache[(limit, variant)] = fetch_top_items(limit=limit, variant=variant)
+        return variant_cache[(limit, variant)]
+
+    throttle = Throttle(settings.smtp_rate_per_minute, sleep)
+    with SMTPSession() as session:
+        for recipient in load_recipients():
+            if already.get(recipient.email) == "sent":
+                summary["already_sent"] += 1
+                continue
+            items = select_items(recipient, fetch)
+            if not items:
+                record_delivery(digest_date, recipient.email, "skipped", 0, 0)
+                summary["skipped"] += 1
+                continue
+            msg = build_message(SUBJECT, build_digest_html(items), build_digest_text(items), recipient.email)
+            status, attempts, error = "failed", 0, None
+            for attempt in range(1, settings.smtp_max_retries + 1):
+                attempts = attempt
+                throttle.wait()
+                try:
+                    session.send(msg, recipient.email)
+                except (smtplib.SMTPException, OSError) as exc:
+                    error = f"{type(exc).__name__}: {exc}"
+                    LOGGER.warning("digest_send_failed email=%s attempt=%s error=%s", recipient.email, attempt, error)
+                    if not isinstance(exc, (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused)):
+                        # smtplib already sent RSET for a refused reply; anything else may leave the
+                        # connection unusable, so reconnect on the next attempt.
+                        session.reset()
+                    if _is_permanent(exc):
+                        break
+                    if attempt < settings.smtp_max_retries:
+                        sleep(settings.smtp_retry_backoff_seconds * 2 ** (attempt - 1))
+                    continue
+                status, error = "sent", None
+                break
+            record_delivery(digest_date, recipient.email, status, attempts, len(items), error)
+            DIGEST_DELIVERIES.inc(status=status)
+            summary[status] += 1
+    LOGGER.info("digest_delivery date=%s %s", digest_date, dict(summary))
+    return {"digest_date": digest_date, "configured": True, **summary}
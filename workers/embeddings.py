@@ -0,0 +1,368 @@
+from __future__ import annotations
+
+import argparse
+import fcntl
+import hashlib
+import logging
+import math
+import os
+import re
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, Sequence
+
+import numpy as np
+
+from app.db import get_connection
+from app.settings import settings
+
+LOGGER = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+EMBED_CHARS = 2000
+# Below this many rows an exact scan is already only a few milliseconds.
+IVF_MIN_ROWS = 50_000
+KMEANS_ITERATIONS = 8
+KMEANS_SAMPLE = 65_536
+
+
+def embedding_text(item: dict) -> str:
+    parts = [item.get("title"), item.get("summary") or item.get("excerpt")]
+    return "\n".join(part for part in parts if part)[:EMBED_CHARS]
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class HashingEmbedder:
+    """CPU-only embedder: signed feature hashing of unigrams and bigrams.
+
+    Lexical rather than learned, but it needs no model download and makes
+    "more like this" work offline; switch ``EMBEDDING_BACKEND`` to ``openai``
+    for semantic embeddings.
+    """
+
+    name = "local"
+
+    def __init__(self, dim: int) -> None:
+        self.dim = dim
+
+    def _features(self, text: str) -> Counter:
+        tokens = TOKEN_RE.findall(text.lower())
+        return Counter([*tokens, *(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))])
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature, count in self._features(text).items():
+                digest = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "big")
+                sign = 1.0 if digest & 1 else -1.0
+                vectors[row, (digest >> 1) % self.dim] += sign * (1.0 + math.log(count))
+        return _normalize(vectors)
+
+
+class OpenAIEmbedder:
+    name = "openai"
+
+    def __init__(self, dim: int) -> None:
+        from workers.llm import LLMClient
+
+        self.dim = dim
+        self.client = LLMClient()
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = self.client.embed(list(texts), dimensions=self.dim)
+        return _normalize(np.asarray(vectors, dtype=np.float32).reshape(len(texts), self.dim))
+
+
+def get_embedder() -> HashingEmbedder | OpenAIEmbedder | None:
+    backend = settings.embedding_backend
+    if backend == "local":
+        return HashingEmbedder(settings.embedding_dim)
+    if backend == "openai" and settings.openai_api_key:
+        return OpenAIEmbedder(settings.embedding_dim)
+    return None
+
+
+class VectorStore:
+    """Append-only float32 vectors in a memory-mapped file with an optional IVF index.
+
+    ``vectors.f32`` holds one row per embedded item and ``ids.i64`` the matching
+    item ids. Once there are ``IVF_MIN_ROWS`` rows, ``train()`` clusters them with
+    spherical k-means; ``lists.i32`` then stores each row's nearest centroid and
+    a search only scans the ``nprobe`` lists closest to the query.
+    """
+
+    def __init__(self, directory: Path, dim: int) -> None:
+        self.directory = directory
+        self.dim = dim
+        self._lock = threading.Lock()
+        self._loaded: tuple | None = None
+        self._vectors: np.ndarray | None = None
+        self._ids: np.ndarray | None = None
+        self._centroids: np.ndarray | None = None
+        self._order: np.ndarray | None = None
+        self._offsets: np.ndarray | None = None
+
+    def _path(self, name: str) -> Path:
+        return self.directory / name
+
+    def _row_count(self) -> int:
+        try:
+            ids_rows = self._path("ids.i64").stat().st_size // 8
+            vector_rows = self._path("vectors.f32").stat().st_size // (4 * self.dim)
+        except FileNotFoundError:
+            return 0
+        return min(ids_rows, vector_rows)
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        """Held by every writer: the thread lock, plus an flock on ``store.lock`` for other processes.
+
+        Ingest, backfills, shards and cleanup's compaction all write the same files,
+        and a row is only consistent if its vector, list and id land together.
+        """
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with self._path("store.lock").open("a") as handle:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _load_centroids(self) -> np.ndarray | None:
+        path = self._path("centroids.npy")
+        return np.load(path) if path.exists() else None
+
+    def append(self, item_ids: Sequence[int], vectors: np.ndarray) -> None:
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(item_ids), self.dim)
+        with self._exclusive():
+            centroids = self._load_centroids()
+            with self._path("vectors.f32").open("ab") as handle:
+                handle.write(vectors.tobytes())
+            if centroids is not None:
+                lists = np.argmax(vectors @ centroids.T, axis=1).astype(np.int32)
+                with self._path("lists.i32").open("ab") as handle:
+                    handle.write(lists.tobytes())
+            # ids last: readers size the store by it, so a row is only visible once complete.
+            with self._path("ids.i64").open("ab") as handle:
+                handle.write(np.asarray(item_ids, dtype=np.int64).tobytes())
+
+    def _refresh(self) -> int:
+        rows = self._row_count()
+        try:
+            trained = self._path("centroids.npy").stat().st_mtime_ns
+        except FileNotFoundError:
+            trained = None
+        if (rows, trained) == self._loaded:
+            return rows
+        self._loaded = (rows, trained)
+        if rows == 0:
+            self._vectors = self._ids = self._centroids = self._order = self._offsets = None
+            return 0
+        self._vectors = np.memmap(self._path("vectors.f32"), dtype=np.float32, mode="r", shape=(rows, self.dim))
+        self._ids = np.fromfile(self._path("ids.i64"), dtype=np.int64, count=rows)
+        self._centroids = self._load_centroids()
+        self._order = self._offsets = None
+        if self._centroids is not None and self._path("lists.i32").exists():
+            lists = np.fromfile(self._path("lists.i32"), dtype=np.int32, count=rows)
+            if len(lists) == rows:
+                self._order = np.argsort(lists, kind="stable")
+                self._offsets = np.searchsorted(lists[self._order], np.arange(len(self._centroids) + 1))
+        return rows
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._refresh()
+
+    def vector_for(self, item_id: int) -> np.ndarray | None:
+        with self._lock:
+            if not self._refresh():
+                return None
+            rows = np.flatnonzero(self._ids == item_id)
+            return np.array(self._vectors[rows[-1]]) if len(rows) else None
+
+    def search(
+        self, query: np.ndarray, k: int = 10, *, exact: bool = False, nprobe: int | None = None
+    ) -> list[tuple[int, float]]:
+        """Return up to ``k`` ``(item_id, cosine)`` pairs, best first."""
+        query = _normalize(query).reshape(self.dim)
+        with self._lock:
+            if not self._refresh():
+                return []
+            vectors, ids = self._vectors, self._ids
+            if not exact and self._order is not None:
+                probes = np.argsort(self._centroids @ query)[::-1][: nprobe or settings.embedding_nprobe]
+                rows = np.concatenate([self._order[self._offsets[p] : self._offsets[p + 1]] for p in probes])
+                rows.sort()
+                scores = vectors[rows] @ query
+            else:
+                rows = None
+                scores = vectors @ query
+        k = min(k, len(scores))
+        if k == 0:
+            return []
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+        picked = rows[best] if rows is not None else best
+        return [(int(ids[row]), float(scores[index])) for row, index in zip(picked, best)]
+
+    def train(self, lists_count: int | None = None, seed: int = 0) -> int:
+        """(Re)build the IVF index over the current rows; returns the number of lists."""
+        with self._exclusive():
+            rows = self._refresh()
+            if rows < IVF_MIN_ROWS and lists_count is None:
+                return 0
+            nlist = lists_count or min(4096, int(math.sqrt(rows)))
+            rng = np.random.default_rng(seed)
+            sample = np.array(self._vectors[np.sort(rng.choice(rows, min(rows, KMEANS_SAMPLE), replace=False))])
+            centroids = sample[rng.choice(len(sample), nlist, replace=False)]
+            for _ in range(KMEANS_ITERATIONS):
+                assignment = np.argmax(sample @ centroids.T, axis=1)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, assignment, sample)
+                empty = np.bincount(assignment, minlength=nlist) == 0
+                sums[empty] = centroids[empty]
+                centroids = _normalize(sums)
+            lists = np.empty(rows, dtype=np.int32)
+            for start in range(0, rows, KMEANS_SAMPLE):
+                chunk = np.asarray(self._vectors[start : start + KMEANS_SAMPLE])
+                lists[start : start + len(chunk)] = np.argmax(chunk @ centroids.T, axis=1)
+            lists.tofile(self._path("lists.i32.tmp"))
+            np.save(self._path("centroids.tmp.npy"), centroids)
+            os.replace(self._path("lists.i32.tmp"), self._path("lists.i32"))
+            os.replace(self._path("centroids.tmp.npy"), self._path("centroids.npy"))
+            self._loaded = None
+            return nlist
+
+    def compact(self, keep_ids: Iterable[int]) -> int:
+        """Drop rows whose item is gone (and older duplicates); returns rows removed."""
+        keep = np.fromiter(keep_ids, dtype=np.int64)
+        with self._exclusive():
+            rows = self._refresh()
+            if not rows:
+                return 0
+            ids = self._ids
+            _, last = np.unique(ids[::-1], return_index=True)
+            latest = np.zeros(rows, dtype=bool)
+            latest[rows - 1 - last] = True
+            mask = latest & np.isin(ids, keep)
+            removed = rows - int(mask.sum())
+            if removed:
+                np.asarray(self._vectors[mask]).tofile(self._path("vectors.f32.tmp"))
+                ids[mask].tofile(self._path("ids.i64.tmp"))
+                if self._centroids is not None and self._path("lists.i32").exists():
+                    lists = np.fromfile(self._path("lists.i32"), dtype=np.int32, count=rows)
+                    lists[mask].tofile(self._path("lists.i32.tmp"))
+                    os.replace(self._path("lists.i32.tmp"), self._path("lists.i32"))
+                self._vectors = None
+                os.replace(self._path("vectors.f32.tmp"), self._path("vectors.f32"))
+                os.replace(self._path("ids.i64.tmp"), self._path("ids.i64"))
+                self._loaded = None
+            return removed
+
+
+_STORE: VectorStore | None = None
+_EMBEDDER = None
+_SINGLETON_LOCK = threading.Lock()
+
+
+def get_store() -> VectorStore:
+    global _STORE
+    with _SINGLETON_LOCK:
+        directory = Path(settings.data_dir) / "embeddings" / f"{settings.embedding_backend}-{settings.embedding_dim}"
+        if _STORE is None or _STORE.directory != directory:
+            _STORE = VectorStore(directory, settings.embedding_dim)
+        return _STORE
+
+
+def _embedder():
+    global _EMBEDDER
+    with _SINGLETON_LOCK:
+        if _EMBEDDER is None:
+            _EMBEDDER = get_embedder()
+        return _EMBEDDER
+
+
+def embed_item(item: dict) -> np.ndarray | None:
+    embedder = _embedder()
+    text = embedding_text(item)
+    if embedder is None or not text:
+        return None
+    return embedder.embed([text])[0]
+
+
+def store_embedding(item_id: int, vector: np.ndarray) -> None:
+    get_store().append([item_id], vector[None, :])
+
+
+def semantic_search(text: str, k: int = 20) -> list[tuple[int, float]]:
+    embedder = _embedder()
+    if embedder is None or not text.strip():
+        return []
+    return get_store().search(embedder.embed([text])[0], k)
+
+
+def related_items(item_id: int, k: int = 5) -> list[tuple[int, float]]:
+    store = get_store()
+    vector = store.vector_for(item_id)
+    if vector is None:
+        return []
+    return [(other, score) for other, score in store.search(vector, k + 1) if other != item_id][:k]
+
+
+def rebuild_index(batch_size: int = 256) -> int:
+    """Embed every cluster leader from scratch, e.g. after switching backends."""
+    embedder = _embedder()
+    if embedder is None:
+        return 0
+    store = get_store()
+    store.directory.mkdir(parents=True, exist_ok=True)
+    for name in ("vectors.f32", "ids.i64", "lists.i32", "centroids.npy"):
+        (store.directory / name).unlink(missing_ok=True)
+    conn = get_connection()
+    cursor = conn.execute("SELECT id, title, summary, excerpt FROM items WHERE cluster_id IS NULL ORDER BY id")
+    total = 0
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        items = [dict(row) for row in rows]
+        texts = [embedding_text(item) for item in items]
+        store.append([item["id"] for item in items], embedder.embed(texts))
+        total += len(items)
+    conn.close()
+    store.train()
+    return total
+
+
+def compact_index() -> int:
+    conn = get_connection()
+    keep = [row[0] for row in conn.execute("SELECT id FROM items WHERE cluster_id IS NULL")]
+    conn.close()
+    store = get_store()
+    removed = store.compact(keep)
+    if len(store) >= IVF_MIN_ROWS:
+        store.train()
+    return removed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Maintain the item embedding index.")
+    parser.add_argument("--rebuild", action="store_true", help="Re-embed all items.")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    if args.rebuild:
+        LOGGER.info("embeddings_rebuilt items=%s", rebuild_index())
+    else:
+        LOGGER.info("embeddings_compacted removed=%s", compact_index())
+
+
+if __name__ == "__main__":
+    main()
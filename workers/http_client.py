@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import time
+from urllib.parse import urlsplit
+
+import requests
+
+from app.metrics import HTTP_REQUEST_SECONDS
+from workers.rate_limit import RateLimited, acquire, note_response
+
+
+def _get(url: str, **kwargs) -> requests.Response:
+    host = urlsplit(url).hostname or "unknown"
+    started = time.perf_counter()
+    status = "error"
+    try:
+        response = requests.get(url, **kwargs)
+        status = str(response.status_code)
+        return response
+    finally:
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, host=host, status=status)
+
+
+def http_get(url: str, *, provider: str | None = None, units: int = 1, **kwargs) -> requests.Response:
+    """``requests.get`` that records latency per host and status for ``/metrics``.
+
+    With ``provider`` the call first waits for that provider's shared rate limit and
+    charges ``units`` to its daily quota (see ``workers.rate_limit``), and the
+    response's rate-limit headers are fed back. A 429 is retried once after its
+    ``Retry-After``; a second one raises ``RateLimited``.
+    """
+    if provider is None:
+        return _get(url, **kwargs)
+    acquire(provider, units)
+    response = _get(url, **kwargs)
+    note_response(provider, response)
+    if response.status_code == 429:
+        acquire(provider, 0)
+        response = _get(url, **kwargs)
+        note_response(provider, response)
+        if response.status_code == 429:
+            raise RateLimited(provider, "still answering 429 after Retry-After")
+    return response
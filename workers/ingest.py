@@ -2,11 +2,19 @@ from __future__ import annotations
 
 from datetime import datetime
 import logging
+from typing import Iterable, Sequence
 
-from app.content import normalize_published_at
-from app.db import insert_item
+from app.content import parse_published_at
+from app.db import get_connection, insert_item, record_ingest_run
+from app.metrics import INGEST_RUN_SECONDS
+from app.settings import settings
+from workers.clustering import find_cluster_leader, fingerprint_item
 from workers.content_extract import extract_excerpt
+from workers.digest import DIGEST, record_candidate
+from workers.embeddings import embed_item, store_embedding
 from workers.llm import LLMClient
+from workers.pipeline import Stage, run_pipeline
+from workers.rate_limit import ProviderUnavailable
 from workers.relevance import normalize_text, rule_filter
 from workers.scoring import rule_score
 from workers.watchlist import (
@@ -14,10 +22,10 @@ from workers.watchlist import (
     all_x_handles,
     all_youtube_channels,
 )
-from workers.web_search import build_queries_from_watchlist, search_web
-from workers.rss_ingest import ingest_feeds
-from workers.x_client import fetch_x_posts
-from workers.youtube_client import fetch_videos
+from workers.web_search import build_queries_from_watchlist, iter_planned_results, iter_web_results
+from workers.rss_ingest import iter_feed_entries
+from workers.x_client import iter_x_posts
+from workers.youtube_client import iter_videos
 from workers.watchlist import load_watchlist
 
 
@@ -25,71 +33,186 @@ LLM = LLMClient()
 LOGGER = logging.getLogger(__name__)
 
 
-def process_items(raw_items: list[dict]) -> int:
-    inserted = 0
-    for item in raw_items:
-        published_at = normalize_published_at(item.get("published_at"))
-        if not published_at:
-            continue
-        item["published_at"] = published_at
-        text = normalize_text(" ".join(filter(None, [item.get("title"), item.get("excerpt"), item.get("content")])) )
-        filter_result = rule_filter(text)
-        if not filter_result.keep:
-            continue
-        if item.get("excerpt") is None and item["source_type"] in {"web", "rss"}:
-            excerpt = extract_excerpt(item["url"])
-            if excerpt:
-                item["excerpt"] = excerpt
-        item["tags"] = filter_result.tags
+def _item_text(item: dict) -> str:
+    return normalize_text(" ".join(filter(None, [item.get("title"), item.get("excerpt"), item.get("content")])))
+
+
+def normalize_item(item: dict) -> dict | None:
+    published_dt = parse_published_at(item.get("published_at"))
+    if not published_dt:
+        return None
+    # Later stages (scoring) use the datetime instead of re-parsing the string.
+    item["published_dt"] = published_dt
+    item["published_at"] = published_dt.isoformat()
+    return item
+
+
+def filter_item(item: dict) -> dict | None:
+    filter_result = rule_filter(_item_text(item))
+    if not filter_result.keep:
+        return None
+    item["tags"] = filter_result.tags
+    return item
+
+
+def enrich_item(item: dict) -> dict:
+    text = _item_text(item)
+    fingerprint_item(item)
+    conn = get_connection()
+    try:
+        leader = find_cluster_leader(conn, item)
+    finally:
+        conn.close()
+    if leader:
+        # Duplicates of a known story reuse the leader's enrichment.
+        item["cluster_id"] = leader["id"]
+        item["summary"] = leader["summary"]
+        item["analysis"] = leader["analysis"]
         item["score"] = rule_score(item)
+        return item
+
+    if item.get("excerpt") is None and item["source_type"] in {"web", "rss"}:
+        excerpt = extract_excerpt(item["url"])
+        if excerpt:
+            item["excerpt"] = excerpt
+    item["score"] = rule_score(item)
 
-        if LLM.enabled():
+    if LLM.enabled():
+        try:
             llm_result = LLM.classify(text)
+        except ProviderUnavailable as exc:
+            # Keep the rule score and store the item; the summary pass picks it up later.
+            LOGGER.info("llm_enrichment_deferred url=%s reason=%s", item.get("url"), exc)
+        else:
             item["summary"] = llm_result.get("summary")
             item["analysis"] = llm_result.get("analysis")
-            item["score"] = item["score"] + llm_result.get("score_adjust", 0)
+            item["score_adjust"] = llm_result.get("score_adjust", 0)
+            item["score"] = item["score"] + item["score_adjust"]
+    try:
+        item["embedding"] = embed_item(item)
+    except Exception:
+        LOGGER.exception("embed_item_failed url=%s", item.get("url"))
+    return item
+
+
+def persist_item(item: dict) -> bool:
+    if item.get("cluster_id") is None:
+        # A duplicate enriched concurrently with its leader is only detectable here.
+        conn = get_connection()
+        try:
+            leader = find_cluster_leader(conn, item)
+        finally:
+            conn.close()
+        if leader:
+            item["cluster_id"] = leader["id"]
+    item_id = insert_item(item)
+    record_candidate(item_id, item)
+    if item_id is not None and item.get("cluster_id") is None and item.get("embedding") is not None:
+        store_embedding(item_id, item["embedding"])
+    return item_id is not None
+
+
+def ingest_stages() -> list[Stage]:
+    return [
+        Stage("normalize", normalize_item),
+        Stage("filter", filter_item),
+        Stage("enrich", enrich_item, workers=settings.ingest_enrich_workers),
+    ]
+
 
-        item_id = insert_item(item)
-        if item_id:
-            inserted += 1
+def process_items(raw_items: Iterable[dict]) -> int:
+    inserted = 0
+    stages = ingest_stages()
+    for item in raw_items:
+        for stage in stages:
+            item = stage.func(item)
+            if item is None:
+                break
+        else:
+            if persist_item(item):
+                inserted += 1
     return inserted
 
 
-def run_ingestion(watchlist: list[dict]) -> dict:
+def build_sources(
+    watchlist: Sequence[dict], web_queries: list[str], web_plan: list[tuple[str, str]] | None = None
+) -> dict:
+    """``web_plan``, if given, replaces planning ``web_queries`` here (sharded runs plan once, in the parent)."""
+    return {
+        "x": lambda: iter_x_posts(all_x_handles(watchlist)),
+        "youtube": lambda: iter_videos(all_youtube_channels(watchlist)),
+        "web": lambda: iter_web_results(web_queries) if web_plan is None else iter_planned_results(web_plan),
+        "rss": lambda: iter_feed_entries(all_rss_feeds(watchlist)),
+    }
+
+
+def record_run(
+    mode: str, started_at: datetime, watchlist_len: int, fetched_count: int, inserted: int, breakdown: dict
+) -> None:
+    finished_at = datetime.utcnow()
+    duration = (finished_at - started_at).total_seconds()
+    INGEST_RUN_SECONDS.observe(duration, mode=mode)
+    record_ingest_run(
+        {
+            "started_at": started_at.isoformat(),
+            "finished_at": finished_at.isoformat(),
+            "duration_seconds": duration,
+            "mode": mode,
+            "watchlist_len": watchlist_len,
+            "fetched_count": fetched_count,
+            "inserted_count": inserted,
+            "breakdown": breakdown,
+        }
+    )
+
+
+def run_ingestion(watchlist: Sequence[dict], mode: str = "single") -> dict:
+    started_at = datetime.utcnow()
+    DIGEST.reset()
     watchlist_len = len(watchlist)
-    x_items = fetch_x_posts(all_x_handles(watchlist))
-    yt_items = fetch_videos(all_youtube_channels(watchlist))
     web_queries = build_queries_from_watchlist(watchlist)
-    web_items = search_web(web_queries)
-    rss_items = ingest_feeds(all_rss_feeds(watchlist))
+    sources = build_sources(watchlist, web_queries)
+    stats = run_pipeline(sources, ingest_stages(), persist_item, maxsize=settings.ingest_queue_size)
 
-    total = 0
-    total += process_items(x_items)
-    total += process_items(yt_items)
-    total += process_items(web_items)
-    total += process_items(rss_items)
-
-    fetched_count = len(x_items) + len(yt_items) + len(web_items) + len(rss_items)
+    fetched_count = sum(stats.fetched.values())
+    record_run(mode, started_at, watchlist_len, fetched_count, stats.persisted, stats.as_dict())
     LOGGER.info(
-        "ingest_summary watchlist_len=%s queries_len=%s fetched_count=%s inserted_count=%s",
+        "ingest_summary mode=%s watchlist_len=%s queries_len=%s fetched_count=%s inserted_count=%s "
+        "dropped=%s errors=%s",
+        mode,
         watchlist_len,
         len(web_queries),
         fetched_count,
-        total,
+        stats.persisted,
+        dict(stats.dropped),
+        dict(stats.errors),
     )
 
     return {
         "timestamp": datetime.utcnow().isoformat(),
-        "inserted": total,
-        "sources": {
-            "x": len(x_items),
-            "youtube": len(yt_items),
-            "web": len(web_items),
-            "rss": len(rss_items),
-        },
+        "inserted": stats.persisted,
+        "sources": {name: stats.fetched[name] for name in sources},
     }
 
 
+def backfill_entry(entry: dict) -> dict:
+    """Fetch just ``entry``'s sources now, rather than at the next hourly run, after it is added.
+
+    Run by the scheduler's lease holder (``run_pending_backfills``), never alongside another ingest.
+    """
+    try:
+        return run_ingestion([entry], mode="backfill")
+    except Exception:
+        # The hourly run will pick the entry up anyway.
+        LOGGER.exception("watchlist_backfill_failed name=%s", entry.get("name"))
+        return {"inserted": 0, "failed": True}
+
+
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
-    run_ingestion(load_watchlist())
+    if settings.ingest_shards > 1:
+        from workers.sharding import run_sharded_ingestion
+
+        run_sharded_ingestion(load_watchlist(), settings.ingest_shards)
+    else:
+        run_ingestion(load_watchlist())
@@ -2,23 +2,61 @@ from __future__ import annotations
 
 from typing import Any
 
-from openai import OpenAI
-
+from app.metrics import LLM_REQUEST_SECONDS, LLM_TOKENS
 from app.settings import settings
+from workers.rate_limit import acquire, note_response
+
+PROVIDER = "openai"
 
 
 class LLMClient:
     def __init__(self) -> None:
-        if not settings.openai_api_key:
-            self.client = None
-        else:
-            self.client = OpenAI(api_key=settings.openai_api_key)
+        self._api_key = settings.openai_api_key
+        self._base_url = settings.openai_base_url
+        self._client: Any = None
+
+    @property
+    def client(self) -> Any:
+        """The OpenAI client, created (and the SDK imported) on first use."""
+        if self._client is None and self._api_key:
+            from openai import OpenAI
+
+            self._client = OpenAI(api_key=self._api_key, base_url=self._base_url)
+        return self._client
 
     def enabled(self) -> bool:
-        return self.client is not None
+        return bool(self._api_key)
+
+    def _create(self, resource: Any, operation: str, **kwargs: Any) -> Any:
+        """``resource.create(**kwargs)`` behind the shared OpenAI rate limit, feeding its headers back."""
+        acquire(PROVIDER)
+        try:
+            with LLM_REQUEST_SECONDS.time(operation=operation):
+                raw = resource.with_raw_response.create(**kwargs)
+        except Exception as exc:
+            # APIStatusError (429s included) carries the HTTP response.
+            if getattr(exc, "response", None) is not None:
+                note_response(PROVIDER, exc.response)
+            raise
+        note_response(PROVIDER, raw)
+        return raw.parse()
+
+    def _complete(self, operation: str, messages: list[dict[str, str]]) -> Any:
+        response = self._create(
+            self.client.chat.completions,
+            operation,
+            model=settings.openai_model,
+            messages=messages,
+            temperature=0.2,
+        )
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            LLM_TOKENS.inc(usage.prompt_tokens or 0, operation=operation, kind="prompt")
+            LLM_TOKENS.inc(usage.completion_tokens or 0, operation=operation, kind="completion")
+        return response
 
     def classify(self, text: str) -> dict[str, Any]:
-        if not self.client:
+        if not self.enabled():
             return {"keep": True, "tags": [], "summary": None, "analysis": None, "score_adjust": 0}
         prompt = (
             "You are a buy-side AI signal filter. Decide KEEP or DROP, assign tags, summarize,"
@@ -27,26 +65,34 @@ class LLMClient:
             "Markets & investing, People & org moves, Energy & Datacenter (Power/Cooling/Grid/Nuclear/Real Estate),"
             "AI for Science & Physical World, Data Strategy & Supply, Edge & On-Device AI."
         )
-        response = self.client.chat.completions.create(
-            model=settings.openai_model,
-            messages=[
+        response = self._complete(
+            "classify",
+            [
                 {"role": "system", "content": prompt},
                 {"role": "user", "content": text[:6000]},
             ],
-            temperature=0.2,
         )
         content = response.choices[0].message.content or ""
         return {"keep": True, "tags": [], "summary": content, "analysis": None, "score_adjust": 0}
 
+    def embed(self, texts: list[str], dimensions: int | None = None) -> list[list[float]]:
+        extra = {"dimensions": dimensions} if dimensions else {}
+        response = self._create(
+            self.client.embeddings, "embed", model=settings.openai_embedding_model, input=texts, **extra
+        )
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            LLM_TOKENS.inc(usage.prompt_tokens or 0, operation="embed", kind="prompt")
+        return [record.embedding for record in sorted(response.data, key=lambda record: record.index)]
+
     def chinese_summary(self, text: str) -> str | None:
-        if not self.client:
+        if not self.enabled():
             return None
-        response = self.client.chat.completions.create(
-            model=settings.openai_model,
-            messages=[
+        response = self._complete(
+            "chinese_summary",
+            [
                 {"role": "system", "content": "用中文总结以下内容，简洁清晰。"},
                 {"role": "user", "content": text[:6000]},
             ],
-            temperature=0.2,
         )
         return response.choices[0].message.content
@@ -0,0 +1,96 @@
+"""Columnar snapshot of the items table for notebooks and offline analysis.
+
+Usage::
+
+    python -m workers.parquet_export data/exports/items.parquet --since 2025-11-01
+
+Needs ``pyarrow`` (in requirements.txt); it is imported on first use only, so the
+rest of the app runs without it.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+from itertools import islice
+from pathlib import Path
+from typing import Iterable
+
+from app.dates import parse_datetime
+from app.db import ITEM_FIELDS, iter_items
+
+LOGGER = logging.getLogger(__name__)
+
+TIMESTAMP_FIELDS = ("published_at", "ingested_at")
+
+
+def _schema(fields: list[str]):
+    import pyarrow as pa
+
+    types = {
+        "id": pa.int64(),
+        "score": pa.float64(),
+        "cluster_id": pa.int64(),
+        "tags": pa.list_(pa.string()),
+        "published_at": pa.timestamp("us", tz="UTC"),
+        "ingested_at": pa.timestamp("us", tz="UTC"),
+    }
+    return pa.schema([(field, types.get(field, pa.string())) for field in fields])
+
+
+def _column(field: str, rows: list[dict]) -> list:
+    values = [row[field] for row in rows]
+    if field in TIMESTAMP_FIELDS:
+        return [parse_datetime(value) for value in values]
+    if field == "metadata":
+        return [json.dumps(value, ensure_ascii=False) for value in values]
+    return values
+
+
+def export_items_parquet(
+    path: str | Path,
+    filters: dict | None = None,
+    fields: Iterable[str] = ITEM_FIELDS,
+    batch_size: int = 50_000,
+) -> int:
+    """Write matching items to a Parquet file one row group per ``batch_size`` rows; returns the row count.
+
+    Timestamps become UTC ``timestamp[us]`` and tags a list column, so the file can
+    be grouped and filtered without re-parsing strings. ``metadata``, if requested,
+    is kept as JSON text.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise RuntimeError("Parquet export needs pyarrow: pip install pyarrow") from exc
+
+    fields = ["id"] + [field for field in dict.fromkeys(fields) if field != "id"]
+    schema = _schema(fields)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    rows = iter_items(filters or {}, fields, batch_size=min(batch_size, 5000))
+    written = 0
+    with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+        while batch := list(islice(rows, batch_size)):
+            columns = [pa.array(_column(field, batch), type=schema.field(field).type) for field in fields]
+            writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+            written += len(batch)
+    return written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export items to Parquet.")
+    parser.add_argument("path")
+    parser.add_argument("--since", help="Only items published at or after this ISO date.")
+    parser.add_argument("--until", help="Only items published before this ISO date.")
+    parser.add_argument("--with-payloads", action="store_true", help="Include content and metadata.")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    fields = ITEM_FIELDS + (("content", "metadata") if args.with_payloads else ())
+    written = export_items_parquet(args.path, {"since": args.since, "until": args.until}, fields)
+    LOGGER.info("parquet_export rows=%s path=%s", written, args.path)
+
+
+if __name__ == "__main__":
+    main()
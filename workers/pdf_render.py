@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import queue
+import threading
+from typing import Callable
+
+from app.settings import settings
+
+LOGGER = logging.getLogger(__name__)
+
+# Per-process state, set up once by _init_worker.
+_FONT_CONFIG = None
+_SETUP_ERROR: str | None = None
+
+
+def _limit_memory(max_memory_mb: int) -> None:
+    try:
+        import resource
+    except ImportError:  # not available on Windows
+        return
+    limit = max_memory_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _init_worker(max_memory_mb: int) -> None:
+    """Cap the worker's address space and load WeasyPrint and fonts once."""
+    global _FONT_CONFIG, _SETUP_ERROR
+    if max_memory_mb:
+        _limit_memory(max_memory_mb)
+    try:
+        from weasyprint.text.fonts import FontConfiguration
+
+        _FONT_CONFIG = FontConfiguration()
+    except Exception as exc:  # WeasyPrint needs system libraries that may be absent
+        _SETUP_ERROR = str(exc)
+
+
+def _render(html_path: str, pdf_path: str) -> str | None:
+    if _SETUP_ERROR is not None:
+        return _SETUP_ERROR
+    try:
+        from weasyprint import HTML
+
+        HTML(filename=html_path).write_pdf(pdf_path, font_config=_FONT_CONFIG)
+    except MemoryError:
+        return "worker ran out of memory"
+    except Exception as exc:
+        return str(exc)
+    return None
+
+
+def _serve(conn, target: Callable[[str, str], str | None], max_memory_mb: int) -> None:
+    """Worker process: render jobs from ``conn`` one at a time until told to stop."""
+    _init_worker(max_memory_mb)
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return
+        if job is None:
+            return
+        try:
+            conn.send(target(*job))
+        except Exception as exc:
+            conn.send(str(exc))
+
+
+class _Worker:
+    """One render process and the pipe that feeds it jobs."""
+
+    def __init__(self, context, target: Callable[[str, str], str | None], max_memory_mb: int) -> None:
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_serve, args=(child_conn, target, max_memory_mb), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.jobs = 0
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(5)
+        self.kill()
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class PdfRenderer:
+    """Render PDFs in a small set of worker processes.
+
+    At most ``workers + queue_size`` jobs are admitted at once; callers beyond
+    that wait up to ``timeout`` seconds for a slot and then get an error instead
+    of piling more work onto the workers. Each job has a worker process to
+    itself, so a job that exceeds ``timeout`` (or crashes) has just that process
+    killed and replaced while jobs on the other workers carry on.
+    Workers are recycled after ``max_jobs_per_worker`` jobs.
+    """
+
+    def __init__(
+        self,
+        workers: int = 1,
+        *,
+        timeout: float = 120,
+        max_memory_mb: int = 0,
+        queue_size: int = 4,
+        max_jobs_per_worker: int = 20,
+        target: Callable[[str, str], str | None] = _render,
+    ) -> None:
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.max_memory_mb = max_memory_mb
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.target = target
+        self._slots = threading.BoundedSemaphore(self.workers + max(0, queue_size))
+        self._context = multiprocessing.get_context("spawn")
+        # Idle workers; None stands for one not started yet.
+        self._idle: queue.Queue[_Worker | None] = queue.Queue()
+        self._closed = False
+        for _ in range(self.workers):
+            self._idle.put(None)
+
+    def render(self, html_path: str, pdf_path: str) -> str | None:
+        """Render ``html_path`` to ``pdf_path``; returns an error message on failure."""
+        if not self._slots.acquire(timeout=self.timeout):
+            return "PDF generation failed: renderer is busy"
+        try:
+            try:
+                worker = self._idle.get(timeout=self.timeout)
+            except queue.Empty:
+                return "PDF generation failed: renderer is busy"
+            error = None
+            try:
+                if worker is None:
+                    worker = _Worker(self._context, self.target, self.max_memory_mb)
+                worker.conn.send((str(html_path), str(pdf_path)))
+                if not worker.conn.poll(self.timeout):
+                    LOGGER.error("pdf_render_timeout html=%s timeout=%s", html_path, self.timeout)
+                    worker.kill()
+                    worker = None
+                    return f"PDF generation failed: timed out after {self.timeout}s"
+                error = worker.conn.recv()
+                worker.jobs += 1
+            except (EOFError, OSError):
+                # The process died mid-job, e.g. killed for memory.
+                if worker is not None:
+                    worker.kill()
+                    worker = None
+                return "PDF generation failed: renderer process exited"
+            finally:
+                if worker is not None and (self._closed or worker.jobs >= self.max_jobs_per_worker):
+                    worker.stop()
+                    worker = None
+                self._idle.put(worker)
+        finally:
+            self._slots.release()
+        if error is not None:
+            return f"PDF generation failed: {error}"
+        return None
+
+    def close(self) -> None:
+        """Stop the idle workers; one busy with a job is stopped when the job returns it."""
+        self._closed = True
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            if worker is not None:
+                worker.stop()
+
+
+_RENDERER: PdfRenderer | None = None
+_RENDERER_LOCK = threading.Lock()
+
+
+def get_renderer() -> PdfRenderer:
+    global _RENDERER
+    with _RENDERER_LOCK:
+        if _RENDERER is None:
+            _RENDERER = PdfRenderer(
+                settings.pdf_workers,
+                timeout=settings.pdf_timeout_seconds,
+                max_memory_mb=settings.pdf_max_memory_mb,
+                queue_size=settings.pdf_queue_size,
+            )
+        return _RENDERER
+
+
+def shutdown_renderer() -> None:
+    global _RENDERER
+    with _RENDERER_LOCK:
+        renderer, _RENDERER = _RENDERER, None
+    if renderer is not None:
+        renderer.close()
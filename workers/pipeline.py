@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable, Iterable
+
+from app.metrics import DROPPED_ITEMS, FETCHED_ITEMS, STAGE_SECONDS
+
+LOGGER = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+@dataclass
+class Stage:
+    """One pipeline step. ``func`` returns the item to pass on, or None to drop it."""
+
+    name: str
+    func: Callable[[dict], dict | None]
+    workers: int = 1
+
+
+@dataclass
+class PipelineStats:
+    fetched: Counter = field(default_factory=Counter)
+    dropped: Counter = field(default_factory=Counter)
+    errors: Counter = field(default_factory=Counter)
+    stage_seconds: Counter = field(default_factory=Counter)
+    persisted: int = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "fetched": dict(self.fetched),
+            "dropped": dict(self.dropped),
+            "errors": dict(self.errors),
+            "stage_seconds": {name: round(value, 3) for name, value in self.stage_seconds.items()},
+            "persisted": self.persisted,
+        }
+
+
+def run_pipeline(
+    sources: dict[str, Callable[[], Iterable[dict]]],
+    stages: list[Stage],
+    sink: Callable[[dict], bool],
+    *,
+    maxsize: int = 100,
+) -> PipelineStats:
+    """Stream items from ``sources`` through ``stages`` into ``sink``.
+
+    Every source runs in its own fetch thread and every stage in ``workers``
+    threads; they are connected by queues bounded at ``maxsize`` so a slow stage
+    applies backpressure instead of letting fetched items pile up in memory. The
+    sink runs on the calling thread, so persistence has a single writer.
+    """
+    stats = PipelineStats()
+    lock = threading.Lock()
+    queues = [queue.Queue(maxsize=maxsize) for _ in range(len(stages) + 1)]
+    threads: list[threading.Thread] = []
+
+    def record(stage: str, item: dict, started: float, dropped: bool = False) -> None:
+        elapsed = time.perf_counter() - started
+        source = item.get("source_type") or "unknown"
+        STAGE_SECONDS.observe(elapsed, stage=stage, source=source)
+        if dropped:
+            DROPPED_ITEMS.inc(stage=stage, source=source)
+        with lock:
+            stats.stage_seconds[stage] += elapsed
+            if dropped:
+                stats.dropped[stage] += 1
+
+    def fetch(name: str, produce: Callable[[], Iterable[dict]]) -> None:
+        started = time.perf_counter()
+        try:
+            for item in produce():
+                with lock:
+                    stats.fetched[name] += 1
+                    stats.stage_seconds[f"fetch:{name}"] += time.perf_counter() - started
+                FETCHED_ITEMS.inc(source=name)
+                queues[0].put(item)
+                started = time.perf_counter()
+        except Exception:
+            LOGGER.exception("pipeline_fetch_failed source=%s", name)
+            with lock:
+                stats.errors[f"fetch:{name}"] += 1
+
+    def work(stage: Stage, inbox: queue.Queue, outbox: queue.Queue) -> None:
+        while True:
+            item = inbox.get()
+            if item is _DONE:
+                inbox.put(_DONE)
+                return
+            started = time.perf_counter()
+            try:
+                result = stage.func(item)
+            except Exception:
+                LOGGER.exception("pipeline_stage_failed stage=%s url=%s", stage.name, item.get("url"))
+                with lock:
+                    stats.errors[stage.name] += 1
+                continue
+            record(stage.name, item, started, dropped=result is None)
+            if result is not None:
+                outbox.put(result)
+
+    def close_when_done(group: list[threading.Thread], outbox: queue.Queue) -> None:
+        for thread in group:
+            thread.join()
+        outbox.put(_DONE)
+
+    fetchers = [
+        threading.Thread(target=fetch, args=(name, produce), name=f"fetch-{name}", daemon=True)
+        for name, produce in sources.items()
+    ]
+    threads.extend(fetchers)
+    threads.append(threading.Thread(target=close_when_done, args=(fetchers, queues[0]), daemon=True))
+    for index, stage in enumerate(stages):
+        group = [
+            threading.Thread(
+                target=work,
+                args=(stage, queues[index], queues[index + 1]),
+                name=f"{stage.name}-{worker}",
+                daemon=True,
+            )
+            for worker in range(max(1, stage.workers))
+        ]
+        threads.extend(group)
+        threads.append(
+            threading.Thread(target=close_when_done, args=(group, queues[index + 1]), daemon=True)
+        )
+    for thread in threads:
+        thread.start()
+
+    outbox = queues[-1]
+    while True:
+        item = outbox.get()
+        if item is _DONE:
+            break
+        started = time.perf_counter()
+        try:
+            persisted = sink(item)
+            record("persist", item, started, dropped=not persisted)
+            if persisted:
+                stats.persisted += 1
+        except Exception:
+            LOGGER.exception("pipeline_sink_failed url=%s", item.get("url"))
+            stats.errors["persist"] += 1
+    for thread in threads:
+        thread.join()
+    return stats
@@ -0,0 +1,214 @@
+"""Shared rate limits and daily quotas for the external APIs.
+
+Token buckets and the quota ledger live in SQLite (``rate_limits`` and
+``quota_usage``), so ingest threads, ingest shards, the scheduler and the web
+app all draw from one budget per provider. Responses feed back into the bucket:
+an exhausted rate-limit window or a ``Retry-After`` holds it shut until the
+provider is ready again.
+"""
+from __future__ import annotations
+
+import logging
+import re
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Mapping
+from zoneinfo import ZoneInfo
+
+from app.dates import utc_now
+from app.db import exhaust_quota, get_rate_limits, quota_used, reserve_quota, take_rate_token, update_rate_limit
+from app.metrics import RATE_LIMIT_REJECTIONS, RATE_LIMIT_WAIT_SECONDS
+from app.settings import settings
+
+LOGGER = logging.getLogger(__name__)
+
+PROVIDERS = ("x", "youtube", "google_cse", "openai")
+# Google's API quotas (YouTube Data, Custom Search) reset at midnight Pacific time.
+PACIFIC = ZoneInfo("America/Los_Angeles")
+# A full bucket holds this many seconds' worth of requests.
+BURST_SECONDS = 10
+# How long a 429 without Retry-After holds the bucket shut.
+DEFAULT_RETRY_SECONDS = 60
+# (remaining, reset) header pairs: X, GitHub-style, the IETF draft, OpenAI requests and tokens.
+RATE_HEADERS = (
+    ("x-rate-limit-remaining", "x-rate-limit-reset"),
+    ("x-ratelimit-remaining", "x-ratelimit-reset"),
+    ("ratelimit-remaining", "ratelimit-reset"),
+    ("x-ratelimit-remaining-requests", "x-ratelimit-reset-requests"),
+    ("x-ratelimit-remaining-tokens", "x-ratelimit-reset-tokens"),
+)
+# Google error reasons for a spent daily quota; CSE says "Queries per day".
+QUOTA_MARKERS = ("quotaExceeded", "dailyLimitExceeded", "per day")
+DURATION = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+DURATION_UNITS = {"h": 3600, "m": 60, "s": 1, "ms": 0.001}
+
+
+@dataclass(frozen=True)
+class Limits:
+    """``per_minute <= 0`` turns rate limiting off; ``daily_units=None`` only counts usage."""
+
+    per_minute: float
+    daily_units: int | None = None
+    quota_tz: Any = timezone.utc
+
+    @property
+    def burst(self) -> float:
+        return max(1.0, self.per_minute * BURST_SECONDS / 60)
+
+
+def limits(provider: str) -> Limits:
+    return {
+        "x": Limits(settings.x_rate_per_minute),
+        "youtube": Limits(settings.youtube_rate_per_minute, settings.youtube_daily_quota, PACIFIC),
+        "google_cse": Limits(settings.web_search_rate_per_minute, settings.web_search_daily_quota, PACIFIC),
+        "openai": Limits(settings.openai_rate_per_minute),
+    }[provider]
+
+
+class ProviderUnavailable(Exception):
+    """``provider`` cannot be called right now; nothing is wrong with the source that asked."""
+
+    def __init__(self, provider: str, message: str) -> None:
+        super().__init__(f"{provider}: {message}")
+        self.provider = provider
+
+
+class RateLimited(ProviderUnavailable):
+    pass
+
+
+class QuotaExceeded(ProviderUnavailable):
+    pass
+
+
+def quota_day(provider: str, now: datetime | None = None) -> str:
+    return (now or utc_now()).astimezone(limits(provider).quota_tz).date().isoformat()
+
+
+def quota_remaining(provider: str, now: datetime | None = None) -> int | None:
+    daily_units = limits(provider).daily_units
+    if daily_units is None:
+        return None
+    return max(0, daily_units - quota_used(provider, quota_day(provider, now)))
+
+
+def acquire(provider: str, units: int = 1, sleep: Callable[[float], None] = time.sleep) -> None:
+    """Wait for a request slot on ``provider``, then charge ``units`` to today's quota.
+
+    Raises ``RateLimited`` rather than wait longer than ``RATE_LIMIT_MAX_WAIT_SECONDS``
+    (e.g. while the provider has us blocked until its window resets), and
+    ``QuotaExceeded`` once today's quota is spent.
+    """
+    provider_limits = limits(provider)
+    if provider_limits.per_minute > 0:
+        waited = 0.0
+        while wait := take_rate_token(provider, provider_limits.per_minute, provider_limits.burst):
+            if waited + wait > settings.rate_limit_max_wait_seconds:
+                RATE_LIMIT_REJECTIONS.inc(provider=provider, reason="rate")
+                raise RateLimited(provider, f"next request slot in {wait:.0f}s")
+            sleep(wait)
+            waited += wait
+        if waited:
+            RATE_LIMIT_WAIT_SECONDS.inc(waited, provider=provider)
+    if units:
+        day = quota_day(provider)
+        if not reserve_quota(provider, day, provider_limits.daily_units, units):
+            RATE_LIMIT_REJECTIONS.inc(provider=provider, reason="quota")
+            raise QuotaExceeded(provider, f"daily quota of {provider_limits.daily_units} units spent for {day}")
+
+
+def _seconds(value: str) -> float | None:
+    """``"30"``, ``"1.5"`` or a Go-style duration such as ``"6m0s"`` or ``"20ms"`` (OpenAI)."""
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = DURATION.findall(value)
+    if not parts or "".join(number + unit for number, unit in parts) != value:
+        return None
+    return sum(float(number) * DURATION_UNITS[unit] for number, unit in parts)
+
+
+def _reset_at(value: str, now: float) -> float | None:
+    seconds = _seconds(value)
+    if seconds is None:
+        return None
+    # X and GitHub send an epoch timestamp, the IETF draft and OpenAI a delay.
+    return seconds if seconds > 1e9 else now + seconds
+
+
+def _retry_at(value: str, now: float) -> float | None:
+    seconds = _seconds(value)
+    if seconds is not None:
+        return now + seconds
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_rate_headers(headers: Mapping[str, str], now: float) -> tuple[float | None, float | None]:
+    """``(remaining, blocked_until)`` from a response's rate-limit headers; ``None`` where they say nothing.
+
+    ``remaining`` is the fewest requests left in any window. A window with nothing
+    left (requests or tokens) blocks until it resets, and ``Retry-After`` at least
+    as long as it asks.
+    """
+    headers = {name.lower(): value for name, value in headers.items()}
+    remaining = None
+    blocked = []
+    for remaining_name, reset_name in RATE_HEADERS:
+        left = _seconds(headers.get(remaining_name, ""))
+        if left is None:
+            continue
+        if not remaining_name.endswith("tokens"):
+            remaining = left if remaining is None else min(remaining, left)
+        if left <= 0 and (reset_at := _reset_at(headers.get(reset_name, ""), now)) is not None:
+            blocked.append(reset_at)
+    if "retry-after" in headers and (retry_at := _retry_at(headers["retry-after"], now)) is not None:
+        blocked.append(retry_at)
+    return remaining, max(blocked, default=None)
+
+
+def note_response(provider: str, response: Any, now: float | None = None) -> None:
+    """Feed what a response (requests, httpx or OpenAI raw) says about ``provider``'s limits back into the bucket."""
+    now = time.time() if now is None else now
+    remaining, blocked_until = parse_rate_headers(response.headers, now)
+    if response.status_code == 429 and blocked_until is None:
+        blocked_until = now + DEFAULT_RETRY_SECONDS
+    if response.status_code in (403, 429) and any(marker in response.text for marker in QUOTA_MARKERS):
+        daily_units = limits(provider).daily_units
+        if daily_units is not None:
+            exhaust_quota(provider, quota_day(provider), daily_units)
+        LOGGER.warning("provider_quota_exhausted provider=%s status=%s", provider, response.status_code)
+    if remaining is not None or blocked_until is not None:
+        update_rate_limit(provider, remaining, blocked_until, now)
+        if blocked_until is not None and blocked_until > now:
+            LOGGER.info("provider_rate_limited provider=%s seconds=%s", provider, round(blocked_until - now))
+
+
+def provider_status(now: datetime | None = None) -> list[dict]:
+    """Today's quota use and any provider-imposed block per provider, for /sources."""
+    now = now or utc_now()
+    buckets = get_rate_limits()
+    status = []
+    for provider in PROVIDERS:
+        provider_limits = limits(provider)
+        blocked_until = buckets[provider]["blocked_until"] if provider in buckets else 0
+        status.append(
+            {
+                "provider": provider,
+                "per_minute": provider_limits.per_minute,
+                "used": quota_used(provider, quota_day(provider, now)),
+                "daily_units": provider_limits.daily_units,
+                "blocked_until": (
+                    datetime.fromtimestamp(blocked_until, timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+                    if blocked_until > now.timestamp()
+                    else None
+                ),
+            }
+        )
+    return status
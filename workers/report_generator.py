@@ -2,18 +2,31 @@ from __future__ import annotations
 
 from datetime import datetime, timedelta
 import argparse
+import hashlib
+from html import escape
+import io
+import os
 from pathlib import Path
+import tempfile
+from typing import Iterable, Iterator, TextIO
 
 from markdown import markdown
-from weasyprint import HTML
 
-from app.db import get_connection
+from app.db import evict_report_artifacts, get_connection, get_report_artifact, record_report_artifact
+from app.metrics import REPORT_CACHE_LOOKUPS
 from app.settings import settings
 from workers.llm import LLMClient
+from workers.pdf_render import get_renderer
 from workers.relevance import TAG_RULES
 
 LLM = LLMClient()
 
+REPORT_COLUMNS = (
+    "id", "title", "source_type", "author", "published_at", "summary", "summary_zh", "excerpt", "url",
+)
+REPORT_FORMATS = ("markdown", "html", "pdf")
+SUFFIXES = {"markdown": ".md", "html": ".html", "pdf": ".pdf"}
+
 
 def fetch_items(days: int = 7) -> list[dict]:
     conn = get_connection()
@@ -27,85 +40,265 @@ def fetch_items(days: int = 7) -> list[dict]:
     return [dict(row) for row in rows]
 
 
-def generate_markdown(items: list[dict]) -> str:
-    lines = ["# AI Signal Radar 阅读报告", ""]
-    lines.append("## 执行摘要")
-    lines.append("（自动生成）")
-    lines.append("")
+def iter_report_rows(days: int = 7) -> Iterator[tuple[str, dict]]:
+    """Yield ``(tag, item)`` pairs for the report in a single pass over ``item_tags``.
 
+    Rows come back grouped in ``TAG_RULES`` order and only carry the columns the
+    report renders, so transcripts and raw metadata never leave SQLite.
+    """
     tags = list(TAG_RULES.keys())
-    for tag in tags:
-        tagged_items = [item for item in items if tag in (item.get("tags") or "")]
-        if not tagged_items:
-            continue
-        lines.append(f"## {tag}")
-        for item in tagged_items:
-            lines.append(f"### {item['title']}")
-            lines.append(f"- 来源: {item.get('source_type')} | 作者: {item.get('author')} | 日期: {item.get('published_at')}")
-            summary = item.get("summary") or ""
-            excerpt = item.get("excerpt") or ""
-            lines.append(f"- 中文摘要: {summary or '（无）'}")
-            lines.append(f"- 英文摘录: {excerpt or '（无）'}")
-            lines.append(f"- 原文链接: {item.get('url')}")
-            lines.append("")
-    return "\n".join(lines)
+    since = datetime.utcnow() - timedelta(days=days)
+    order = " ".join(f"WHEN ? THEN {index}" for index in range(len(tags)))
+    columns = ", ".join(f"i.{column}" for column in REPORT_COLUMNS)
+    placeholders = ",".join("?" for _ in tags)
+    conn = get_connection()
+    try:
+        cursor = conn.execute(
+            f"""
+            SELECT t.tag, {columns}
+            FROM item_tags t
+            JOIN items i ON i.id = t.item_id
+            WHERE i.ingested_at >= ? AND i.cluster_id IS NULL AND t.tag IN ({placeholders})
+            ORDER BY CASE t.tag {order} END, i.published_at DESC
+            """,
+            (since.isoformat(), *tags, *tags),
+        )
+        for row in cursor:
+            item = dict(row)
+            yield item.pop("tag"), item
+    finally:
+        conn.close()
 
 
-def build_html(markdown_content: str) -> str:
-    html_body = markdown(markdown_content)
-    return f"""<!doctype html>
+def _header_lines() -> list[str]:
+    return ["# AI Signal Radar 阅读报告", "", "## 执行摘要", "（自动生成）", ""]
+
+
+def _item_lines(item: dict) -> list[str]:
+    summary_zh = item.get("summary_zh") or ""
+    summary = item.get("summary") or ""
+    excerpt = item.get("excerpt") or ""
+    return [
+        f"### {item['title']}",
+        f"- 来源: {item.get('source_type')} | 作者: {item.get('author')} | 日期: {item.get('published_at')}",
+        f"- 中文摘要: {summary_zh or '（无）'}",
+        f"- 英文摘要: {summary or '（无）'}",
+        f"- 英文摘录: {excerpt or '（无）'}",
+        f"- 原文链接: {item.get('url')}",
+        "",
+    ]
+
+
+def _group_by_tag(items: list[dict]) -> Iterator[tuple[str, dict]]:
+    grouped: dict[str, list[dict]] = {tag: [] for tag in TAG_RULES}
+    for item in items:
+        for tag in grouped:
+            if tag in (item.get("tags") or ""):
+                grouped[tag].append(item)
+    return ((tag, item) for tag, tagged in grouped.items() for item in tagged)
+
+
+def generate_markdown(items: list[dict]) -> str:
+    buffer = io.StringIO()
+    _write_sections(_group_by_tag(items), buffer)
+    return buffer.getvalue()
+
+
+HTML_HEAD = """<!doctype html>
 <html lang="zh-CN">
   <head>
     <meta charset="utf-8" />
     <style>
-      body {{
+      body {
         font-family: "Noto Sans CJK SC", "Noto Sans CJK", "Noto Sans", "PingFang SC", "Hiragino Sans GB", "Microsoft YaHei", sans-serif;
         line-height: 1.6;
         color: #111827;
         margin: 32px;
-      }}
-      h1, h2, h3 {{
+      }
+      h1, h2, h3 {
         color: #0f172a;
-      }}
-      a {{
+      }
+      a {
         color: #2563eb;
-      }}
-      ul {{
+      }
+      ul {
         padding-left: 1.2rem;
-      }}
+      }
     </style>
   </head>
   <body>
-    {html_body}
+    """
+HTML_TAIL = """
   </body>
 </html>
 """
 
 
-def write_report(items: list[dict]) -> dict:
+def build_html(markdown_content: str) -> str:
+    return f"{HTML_HEAD}{markdown(markdown_content)}{HTML_TAIL}"
+
+
+def _header_html() -> str:
+    return "<h1>AI Signal Radar 阅读报告</h1>\n<h2>执行摘要</h2>\n<p>（自动生成）</p>\n"
+
+
+def _item_html(item: dict) -> str:
+    summary_zh = item.get("summary_zh") or "（无）"
+    summary = item.get("summary") or "（无）"
+    excerpt = item.get("excerpt") or "（无）"
+    url = item.get("url") or ""
+    return (
+        f"<h3>{escape(str(item['title']))}</h3>\n<ul>\n"
+        f"<li>来源: {escape(str(item.get('source_type')))} | 作者: {escape(str(item.get('author')))}"
+        f" | 日期: {escape(str(item.get('published_at')))}</li>\n"
+        f"<li>中文摘要: {escape(summary_zh)}</li>\n"
+        f"<li>英文摘要: {escape(summary)}</li>\n"
+        f"<li>英文摘录: {escape(excerpt)}</li>\n"
+        f'<li>原文链接: <a href="{escape(url)}">{escape(url)}</a></li>\n</ul>\n'
+    )
+
+
+def _write_sections(
+    tagged_items: Iterable[tuple[str, dict]], md_handle: TextIO, html_handle: TextIO | None = None
+) -> None:
+    """Write ``(tag, item)`` pairs, already grouped by tag, one item at a time."""
+    md_handle.write("\n".join(_header_lines()))
+    if html_handle:
+        html_handle.write(HTML_HEAD)
+        html_handle.write(_header_html())
+    current_tag = None
+    for tag, item in tagged_items:
+        if tag != current_tag:
+            current_tag = tag
+            md_handle.write(f"\n## {tag}")
+            if html_handle:
+                html_handle.write(f"<h2>{escape(tag)}</h2>\n")
+        md_handle.write("\n" + "\n".join(_item_lines(item)))
+        if html_handle:
+            html_handle.write(_item_html(item))
+    if html_handle:
+        html_handle.write(HTML_TAIL)
+
+
+def render_pdf(html_path: Path, pdf_path: Path) -> str | None:
+    """Render ``html_path`` to ``pdf_path``; returns an error message on failure."""
+    return get_renderer().render(str(html_path), str(pdf_path))
+
+
+def _write_report_files(tagged_items: Iterable[tuple[str, dict]]) -> dict:
     reports_dir = Path(settings.data_dir) / "reports"
     reports_dir.mkdir(parents=True, exist_ok=True)
     timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
-    markdown_content = generate_markdown(items)
     md_path = reports_dir / f"report_{timestamp}.md"
-    md_path.write_text(markdown_content, encoding="utf-8")
-
     html_path = reports_dir / f"report_{timestamp}.html"
-    html_content = build_html(markdown_content)
-    html_path.write_text(html_content, encoding="utf-8")
+    with md_path.open("w", encoding="utf-8") as md_handle, html_path.open("w", encoding="utf-8") as html_handle:
+        _write_sections(tagged_items, md_handle, html_handle)
 
     pdf_path = reports_dir / f"report_{timestamp}.pdf"
-    pdf_error = None
-    try:
-        HTML(string=html_content).write_pdf(str(pdf_path))
-    except Exception as exc:
-        pdf_error = f"PDF generation failed: {exc}"
-        pdf_path = None
-
+    pdf_error = render_pdf(html_path, pdf_path)
     return {
         "markdown": str(md_path),
         "html": str(html_path),
-        "pdf": str(pdf_path) if pdf_path else None,
+        "pdf": str(pdf_path) if pdf_error is None else None,
+        "pdf_error": pdf_error,
+    }
+
+
+def write_report(items: list[dict]) -> dict:
+    return _write_report_files(_group_by_tag(items))
+
+
+def report_watermark(days: int = 7) -> str:
+    """Identify the data behind a ``days`` report without reading it.
+
+    New items raise ``MAX(id)``; items ageing out of the window or removed by
+    cleanup lower ``COUNT(*)``; background Chinese summaries raise
+    ``COUNT(summary_zh)``. Any of them changes the watermark.
+    """
+    since = datetime.utcnow() - timedelta(days=days)
+    conn = get_connection()
+    count, max_id, max_ingested_at, summarized = conn.execute(
+        "SELECT COUNT(*), MAX(id), MAX(ingested_at), COUNT(summary_zh) FROM items WHERE ingested_at >= ?",
+        (since.isoformat(),),
+    ).fetchone()
+    conn.close()
+    return f"{count}:{max_id}:{max_ingested_at}:{summarized}"
+
+
+def _cached_path(days: int, fmt: str, watermark: str) -> Path | None:
+    row = get_report_artifact(days, fmt, watermark)
+    if row and Path(row["path"]).exists():
+        REPORT_CACHE_LOOKUPS.inc(format=fmt, result="hit")
+        return Path(row["path"])
+    REPORT_CACHE_LOOKUPS.inc(format=fmt, result="miss")
+    return None
+
+
+def _store(days: int, fmt: str, watermark: str, path: Path) -> None:
+    record_report_artifact(days, fmt, watermark, str(path), path.stat().st_size)
+
+
+def _evict(keep_watermark: str) -> None:
+    for path in evict_report_artifacts(
+        settings.report_cache_max_bytes, settings.report_cache_max_files, keep_watermark
+    ):
+        Path(path).unlink(missing_ok=True)
+
+
+def _temp_path(directory: Path, suffix: str) -> Path:
+    """A fresh file next to the final artifact, so concurrent builds never share one and ``os.replace`` is atomic."""
+    with tempfile.NamedTemporaryFile(dir=directory, prefix=".report-", suffix=suffix, delete=False) as handle:
+        return Path(handle.name)
+
+
+def build_report(days: int = 7, formats: Iterable[str] = REPORT_FORMATS) -> dict:
+    """Stream the last ``days`` of items from SQLite straight into report files.
+
+    Artifacts are cached per ``(days, format, report_watermark(days))``; when
+    nothing changed since the last call the existing files are returned as-is.
+    """
+    formats = set(formats)
+    watermark = report_watermark(days)
+    key = hashlib.sha1(f"{days}:{watermark}".encode()).hexdigest()[:12]
+    reports_dir = Path(settings.data_dir) / "reports"
+    reports_dir.mkdir(parents=True, exist_ok=True)
+    paths = {fmt: _cached_path(days, fmt, watermark) for fmt in formats | {"markdown", "html"}}
+
+    if paths["markdown"] is None or paths["html"] is None:
+        md_path = reports_dir / f"report_{days}d_{key}.md"
+        html_path = reports_dir / f"report_{days}d_{key}.html"
+        md_tmp = _temp_path(reports_dir, ".md.tmp")
+        html_tmp = _temp_path(reports_dir, ".html.tmp")
+        try:
+            with md_tmp.open("w", encoding="utf-8") as md_handle, html_tmp.open("w", encoding="utf-8") as html_handle:
+                _write_sections(iter_report_rows(days), md_handle, html_handle)
+            os.replace(md_tmp, md_path)
+            os.replace(html_tmp, html_path)
+        finally:
+            md_tmp.unlink(missing_ok=True)
+            html_tmp.unlink(missing_ok=True)
+        _store(days, "markdown", watermark, md_path)
+        _store(days, "html", watermark, html_path)
+        paths["markdown"], paths["html"] = md_path, html_path
+
+    pdf_error = None
+    if "pdf" in formats and paths["pdf"] is None:
+        pdf_path = reports_dir / f"report_{days}d_{key}.pdf"
+        pdf_tmp = _temp_path(reports_dir, ".pdf.tmp")
+        try:
+            # Readers only ever see a complete PDF: it is renamed into place once rendered.
+            pdf_error = render_pdf(paths["html"], pdf_tmp)
+            if pdf_error is None:
+                os.replace(pdf_tmp, pdf_path)
+                _store(days, "pdf", watermark, pdf_path)
+                paths["pdf"] = pdf_path
+        finally:
+            pdf_tmp.unlink(missing_ok=True)
+    _evict(watermark)
+    return {
+        "markdown": str(paths["markdown"]),
+        "html": str(paths["html"]),
+        "pdf": str(paths["pdf"]) if paths.get("pdf") else None,
         "pdf_error": pdf_error,
     }
 
@@ -124,8 +317,8 @@ def _parse_args() -> argparse.Namespace:
 
 def main() -> None:
     args = _parse_args()
-    items = fetch_items(days=args.days)
-    report_paths = write_report(items)
+    formats = ("markdown", "html", "pdf") if args.format == "pdf" else ("markdown", "html")
+    report_paths = build_report(days=args.days, formats=formats)
     if args.format == "pdf":
         if not report_paths["pdf"]:
             raise SystemExit(report_paths.get("pdf_error") or "PDF generation failed.")
@@ -1,31 +1,56 @@
 from __future__ import annotations
 
 import hashlib
+import time
 from datetime import datetime
-from typing import Iterable
+from typing import Iterable, Iterator
+from urllib.parse import urlsplit
 
 import feedparser
 
+from app.metrics import HTTP_REQUEST_SECONDS
+from workers.source_health import SourceError, guarded
+
 
 def ingest_feeds(feeds: Iterable[str]) -> list[dict]:
-    items: list[dict] = []
+    return list(iter_feed_entries(feeds))
+
+
+def _parse_feed(feed_url: str) -> list:
+    started = time.perf_counter()
+    parsed = feedparser.parse(feed_url)
+    HTTP_REQUEST_SECONDS.observe(
+        time.perf_counter() - started,
+        host=urlsplit(feed_url).hostname or "local",
+        status=str(parsed.get("status", "error" if parsed.get("bozo") else "ok")),
+    )
+    status = parsed.get("status")
+    if status and status >= 400:
+        raise SourceError(f"http_{status}")
+    if parsed.get("bozo") and not parsed.entries:
+        # Unreachable host, or a body that is not a feed at all.
+        error = parsed.get("bozo_exception")
+        raise SourceError(type(error).__name__ if error else "parse_error", str(error or ""))
+    return parsed.entries[:10]
+
+
+def iter_feed_entries(feeds: Iterable[str]) -> Iterator[dict]:
     for feed_url in feeds:
-        parsed = feedparser.parse(feed_url)
-        for entry in parsed.entries[:10]:
+        entries = guarded("rss", feed_url, lambda: _parse_feed(feed_url))
+        if entries is None:
+            continue
+        for entry in entries:
             url = entry.get("link")
             dedupe_hash = hashlib.sha256(f"rss-{url}".encode()).hexdigest()
-            items.append(
-                {
-                    "source_type": "rss",
-                    "title": entry.get("title"),
-                    "url": url,
-                    "author": entry.get("author"),
-                    "published_at": entry.get("published"),
-                    "excerpt": entry.get("summary"),
-                    "content": None,
-                    "dedupe_hash": dedupe_hash,
-                    "metadata": {"feed": feed_url},
-                    "ingested_at": datetime.utcnow().isoformat(),
-                }
-            )
-    return items
+            yield {
+                "source_type": "rss",
+                "title": entry.get("title"),
+                "url": url,
+                "author": entry.get("author"),
+                "published_at": entry.get("published"),
+                "excerpt": entry.get("summary"),
+                "content": None,
+                "dedupe_hash": dedupe_hash,
+                "metadata": {"feed": feed_url},
+                "ingested_at": datetime.utcnow().isoformat(),
+            }
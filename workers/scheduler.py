@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import functools
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Callable
+
+from apscheduler.schedulers.background import BackgroundScheduler
+
+from app.db import (
+    acquire_lease,
+    finish_backfill,
+    list_pending_backfills,
+    migrate_db,
+    release_lease,
+    take_queued_job,
+    upsert_watchlist,
+)
+from app.settings import settings
+from workers.cleanup import run_cleanup
+from workers.digest_delivery import deliver_digests
+from workers.ingest import backfill_entry, run_ingestion
+from workers.sharding import run_sharded_ingestion
+from workers.summaries import summarize_pending
+from workers.watchlist import flatten_watchlist, get_watchlist_index, load_watchlist_yaml
+
+LOGGER = logging.getLogger(__name__)
+
+LEASE_NAME = "scheduler"
+# The queued_jobs name under which /ingest/run asks for an ingest.
+INGEST_JOB = "ingest"
+# Ingest runs share the digest accumulator, vector store and CSE budget, so one at a time.
+INGEST_LOCK = threading.Lock()
+
+
+def run_daily_digest() -> None:
+    deliver_digests()
+
+
+def run_summaries() -> None:
+    summarize_pending()
+
+
+def _ingest() -> None:
+    watchlist = get_watchlist_index()
+    if settings.ingest_shards > 1:
+        run_sharded_ingestion(watchlist, settings.ingest_shards)
+    else:
+        run_ingestion(watchlist)
+
+
+def run_hourly_ingest() -> None:
+    with INGEST_LOCK:
+        _ingest()
+
+
+def run_requested_ingest() -> None:
+    """Run an ingest queued by /ingest/run; left for the next minute while another ingest runs."""
+    if not INGEST_LOCK.acquire(blocking=False):
+        return
+    try:
+        if take_queued_job(INGEST_JOB):
+            _ingest()
+    finally:
+        INGEST_LOCK.release()
+
+
+def run_pending_backfills() -> None:
+    """Fetch the entries queued by /watchlist/add; left for the next minute while an hourly ingest runs."""
+    if not INGEST_LOCK.acquire(blocking=False):
+        return
+    try:
+        for entry in list_pending_backfills():
+            backfill_entry(entry)
+            finish_backfill(entry["id"])
+    finally:
+        INGEST_LOCK.release()
+
+
+def run_startup_maintenance() -> None:
+    """Data migrations, retention cleanup and the legacy watchlist import, off the request path."""
+    migrate_db()
+    if not get_watchlist_index():
+        legacy_watchlist = load_watchlist_yaml()
+        legacy_entries = flatten_watchlist(legacy_watchlist)
+        if legacy_entries:
+            upsert_watchlist(legacy_entries)
+    run_cleanup()
+
+
+class LeaderScheduler:
+    """Runs the job schedule in whichever process holds the ``scheduler`` lease.
+
+    Every process that calls ``start()`` contends for a SQLite lease of
+    ``lease_seconds``, renewing it every third of that. The holder runs an
+    APScheduler ``BackgroundScheduler``; the others only keep trying, and take
+    over once the holder stops renewing. A job that fires after the lease has
+    lapsed locally is skipped rather than risk running twice.
+    """
+
+    def __init__(self, lease_seconds: float | None = None, holder: str | None = None) -> None:
+        self.lease_seconds = lease_seconds or settings.scheduler_lease_seconds
+        self.holder = holder or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._expires_at = 0.0
+        self._scheduler: BackgroundScheduler | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def is_leader(self) -> bool:
+        return time.time() < self._expires_at
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="scheduler-lease", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._demote()
+        # Hand over at once instead of making the others wait out the lease.
+        release_lease(LEASE_NAME, self.holder)
+        self._expires_at = 0.0
+
+    def _run(self) -> None:
+        while True:
+            self.tick()
+            if self._stop.wait(self.lease_seconds / 3):
+                return
+
+    def tick(self) -> None:
+        """One election round: renew or take the lease, then start or stop the schedule to match."""
+        now = time.time()
+        try:
+            held = acquire_lease(LEASE_NAME, self.holder, self.lease_seconds, now)
+        except sqlite3.OperationalError:
+            # Database busy (e.g. a long write); keep the current role until the lease runs out.
+            LOGGER.warning("scheduler_lease_renew_failed holder=%s", self.holder)
+            held = self.is_leader()
+        else:
+            if held:
+                self._expires_at = now + self.lease_seconds
+        if held and self._scheduler is None:
+            LOGGER.info("scheduler_leader_elected holder=%s", self.holder)
+            self._scheduler = build_scheduler(self._guard)
+            self._scheduler.start()
+        elif not held:
+            self._expires_at = 0.0
+            self._demote()
+
+    def _demote(self) -> None:
+        if self._scheduler is not None:
+            LOGGER.info("scheduler_leader_stepped_down holder=%s", self.holder)
+            self._scheduler.shutdown(wait=False)
+            self._scheduler = None
+
+    def _guard(self, func: Callable[[], None]) -> Callable[[], None]:
+        @functools.wraps(func)
+        def run() -> None:
+            if not self.is_leader():
+                LOGGER.warning("scheduler_job_skipped job=%s reason=lease_lapsed", func.__name__)
+                return
+            func()
+
+        return run
+
+
+def build_scheduler(wrap: Callable[[Callable[[], None]], Callable[[], None]] = lambda func: func) -> BackgroundScheduler:
+    scheduler = BackgroundScheduler(timezone=settings.timezone)
+    # No trigger: runs once, as soon as the scheduler starts.
+    scheduler.add_job(wrap(run_startup_maintenance), id="startup_maintenance")
+    scheduler.add_job(wrap(run_hourly_ingest), "interval", hours=1)
+    scheduler.add_job(wrap(run_pending_backfills), "interval", minutes=1)
+    scheduler.add_job(wrap(run_requested_ingest), "interval", minutes=1)
+    scheduler.add_job(wrap(run_summaries), "interval", minutes=10)
+    scheduler.add_job(wrap(run_daily_digest), "cron", hour=8, minute=30)
+    scheduler.add_job(wrap(run_cleanup), "cron", hour=2, minute=0)
+    return scheduler
@@ -1,5 +1,16 @@
+from __future__ import annotations
+
+import argparse
+import logging
 from datetime import datetime, timezone
 
+import numpy as np
+
+from app.dates import parse_datetime
+from app.db import bump_data_version, get_connection, rebuild_item_rollups
+
+LOGGER = logging.getLogger(__name__)
+
 IMPORTANT_KEYWORDS = ["launch", "paper", "benchmark", "policy", "export control", "datacenter"]
 SOURCE_WEIGHT = {"x": 1.0, "youtube": 1.2, "web": 1.1, "rss": 1.0}
 
@@ -11,17 +22,100 @@ def rule_score(item: dict) -> float:
     for kw in IMPORTANT_KEYWORDS:
         if kw in title or kw in excerpt:
             score += 1.0
-    published_at = item.get("published_at")
-    if published_at:
-        try:
-            published_dt = datetime.fromisoformat(published_at)
-            if published_dt.tzinfo is None:
-                published_dt = published_dt.replace(tzinfo=timezone.utc)
-            else:
-                published_dt = published_dt.astimezone(timezone.utc)
-            now = datetime.now(timezone.utc)
-            age_hours = (now - published_dt).total_seconds() / 3600
-            score += max(0.0, 2.0 - age_hours / 24)
-        except (ValueError, TypeError):
-            pass
+    published_dt = parse_datetime(item.get("published_dt") or item.get("published_at"))
+    if published_dt:
+        age_hours = (datetime.now(timezone.utc) - published_dt).total_seconds() / 3600
+        score += max(0.0, 2.0 - age_hours / 24)
     return round(score, 2)
+
+
+def keyword_hits(titles: list[str | None], excerpts: list[str | None]) -> np.ndarray:
+    texts = (f"{title or ''}\n{excerpt or ''}".lower() for title, excerpt in zip(titles, excerpts))
+    return np.fromiter(
+        (sum(kw in text for kw in IMPORTANT_KEYWORDS) for text in texts), dtype=np.float64, count=len(titles)
+    )
+
+
+def _to_utc_naive(value: str | None) -> str:
+    """ISO string without offset, in UTC; "" when unparseable (becomes NaT)."""
+    if not value:
+        return ""
+    if value.endswith("+00:00"):
+        return value[:-6]
+    if value.endswith("Z"):
+        return value[:-1]
+    parsed = parse_datetime(value)
+    return parsed.replace(tzinfo=None).isoformat() if parsed else ""
+
+
+def batch_scores(
+    source_types: np.ndarray,
+    published_at: list[str | None],
+    keyword_hits: np.ndarray,
+    now: datetime | None = None,
+) -> np.ndarray:
+    """Vectorized ``rule_score`` over parallel column arrays."""
+    now = now or datetime.now(timezone.utc)
+    kinds, inverse = np.unique(source_types.astype(str), return_inverse=True)
+    weights = np.array([SOURCE_WEIGHT.get(kind, 1.0) for kind in kinds], dtype=np.float64)[inverse]
+
+    published = np.array([_to_utc_naive(value) for value in published_at], dtype="datetime64[us]")
+    now64 = np.datetime64(now.astimezone(timezone.utc).replace(tzinfo=None), "us")
+    age_hours = (now64 - published) / np.timedelta64(1, "h")
+    recency = np.where(np.isnan(age_hours), 0.0, np.maximum(0.0, 2.0 - age_hours / 24))
+    return np.round(weights + keyword_hits + recency, 2)
+
+
+def rescore_items(now: datetime | None = None, chunk_size: int = 100_000) -> int:
+    """Recompute every item's score with the current weights; returns rows changed.
+
+    Columns are paged by id in chunks of ``chunk_size`` rows, scored as arrays and
+    only rows whose score actually moved are written back. The LLM's
+    ``score_adjust`` is preserved on top of the rule score. The score rollups are
+    rebuilt afterwards if anything moved.
+    """
+    now = now or datetime.now(timezone.utc)
+    conn = get_connection()
+    changed, last_id = 0, 0
+    while True:
+        rows = conn.execute(
+            "SELECT id, source_type, published_at, coalesce(score_adjust, 0), coalesce(score, 0), title, excerpt "
+            "FROM items WHERE id > ? ORDER BY id LIMIT ?",
+            (last_id, chunk_size),
+        ).fetchall()
+        if not rows:
+            break
+        ids, source_types, published_at, adjust, current, titles, excerpts = zip(*rows)
+        last_id = ids[-1]
+        hits = keyword_hits(titles, excerpts)
+        scores = batch_scores(np.array(source_types, dtype=object), list(published_at), hits, now)
+        scores += np.array(adjust, dtype=np.float64)
+        moved = np.flatnonzero(np.abs(scores - np.array(current, dtype=np.float64)) > 1e-9)
+        conn.executemany(
+            "UPDATE items SET score = ? WHERE id = ?",
+            [(float(scores[index]), ids[index]) for index in moved],
+        )
+        if len(moved):
+            bump_data_version(conn.cursor(), "items")
+        conn.commit()
+        changed += len(moved)
+    if changed:
+        rebuild_item_rollups(conn)
+    conn.close()
+    return changed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Recompute item scores after a weights change.")
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    from workers.digest import rebuild_digest_candidates
+
+    changed = rescore_items(chunk_size=args.chunk_size)
+    rebuild_digest_candidates()
+    LOGGER.info("rescore_changed=%s", changed)
+
+
+if __name__ == "__main__":
+    main()
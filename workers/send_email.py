@@ -7,12 +7,11 @@ from email.mime.text import MIMEText
 from app.settings import settings
 
 
-def send_email(subject: str, html_body: str, text_body: str, recipient: str | None = None) -> bool:
-    if not all(
-        [settings.smtp_host, settings.smtp_username, settings.smtp_password, settings.smtp_sender]
-    ):
-        return False
-    to_addr = recipient or settings.default_email_recipient
+def smtp_configured() -> bool:
+    return all([settings.smtp_host, settings.smtp_username, settings.smtp_password, settings.smtp_sender])
+
+
+def build_message(subject: str, html_body: str, text_body: str, to_addr: str) -> MIMEMultipart:
     msg = MIMEMultipart("alternative")
     msg["Subject"] = subject
     msg["From"] = settings.smtp_sender
@@ -20,9 +19,66 @@ def send_email(subject: str, html_body: str, text_body: str, recipient: str | No
 
     msg.attach(MIMEText(text_body, "plain"))
     msg.attach(MIMEText(html_body, "html"))
+    return msg
+
+
+class SMTPSession:
+    """One authenticated SMTP connection reused across a batch of messages.
+
+    The connection is opened lazily, reopened after ``max_messages`` sends (most
+    providers cap messages per connection) and dropped by ``reset()`` after an
+    error so the next send reconnects.
+    """
+
+    def __init__(self, max_messages: int | None = None) -> None:
+        self.max_messages = max_messages or settings.smtp_batch_size
+        self._server: smtplib.SMTP | None = None
+        self._sent = 0
 
-    with smtplib.SMTP(settings.smtp_host, settings.smtp_port) as server:
-        server.starttls()
-        server.login(settings.smtp_username, settings.smtp_password)
-        server.sendmail(settings.smtp_sender, [to_addr], msg.as_string())
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(settings.smtp_host, settings.smtp_port, timeout=30)
+        try:
+            if settings.smtp_starttls:
+                server.starttls()
+            server.login(settings.smtp_username, settings.smtp_password)
+        except Exception:
+            server.close()
+            raise
+        self._sent = 0
+        return server
+
+    def send(self, msg: MIMEMultipart, to_addr: str) -> None:
+        if self._server is not None and self._sent >= self.max_messages:
+            self.reset()
+        if self._server is None:
+            self._server = self._connect()
+        try:
+            self._server.sendmail(settings.smtp_sender, [to_addr], msg.as_string())
+        except smtplib.SMTPServerDisconnected:
+            self._server = None
+            raise
+        self._sent += 1
+
+    def reset(self) -> None:
+        server, self._server = self._server, None
+        if server is None:
+            return
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+
+    def __enter__(self) -> "SMTPSession":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.reset()
+
+
+def send_email(subject: str, html_body: str, text_body: str, recipient: str | None = None) -> bool:
+    if not smtp_configured():
+        return False
+    to_addr = recipient or settings.default_email_recipient
+    with SMTPSession() as session:
+        session.send(build_message(subject, html_body, text_body, to_addr), to_addr)
     return True
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import bisect
+import hashlib
+import logging
+import multiprocessing
+import queue
+from collections import Counter
+from datetime import datetime
+
+from app.metrics import REGISTRY
+from app.settings import settings
+
+LOGGER = logging.getLogger(__name__)
+
+
+class HashRing:
+    """Consistent hash ring; adding a shard only moves about 1/N of the keys."""
+
+    def __init__(self, nodes: list[int], replicas: int = 64) -> None:
+        self._ring: list[tuple[int, int]] = sorted(
+            (self._hash(f"{node}:{replica}"), node) for node in nodes for replica in range(replicas)
+        )
+        self._keys = [point for point, _ in self._ring]
+
+    @staticmethod
+    def _hash(value: str) -> int:
+        return int.from_bytes(hashlib.md5(value.encode()).digest()[:8], "big")
+
+    def node_for(self, key: str) -> int:
+        index = bisect.bisect(self._keys, self._hash(key)) % len(self._ring)
+        return self._ring[index][1]
+
+
+def entry_key(entry: dict) -> str:
+    for field in ("x_handle", "youtube_channel", "rss_url", "website"):
+        if entry.get(field):
+            return f"{field}:{entry[field].lower()}"
+    return f"name:{entry.get('name')}"
+
+
+def partition_watchlist(watchlist: list[dict], shards: int) -> list[list[dict]]:
+    ring = HashRing(list(range(shards)))
+    partitions: list[list[dict]] = [[] for _ in range(shards)]
+    for entry in watchlist:
+        partitions[ring.node_for(entry_key(entry))].append(entry)
+    return partitions
+
+
+def _shard_worker(
+    shard_id: int, entries: list[dict], web_plan: list[tuple[str, str]], out: multiprocessing.Queue
+) -> None:
+    from workers.ingest import build_sources, ingest_stages
+    from workers.pipeline import run_pipeline
+
+    logging.basicConfig(level=logging.INFO)
+
+    def forward(item: dict) -> bool:
+        out.put(("item", shard_id, item))
+        return True
+
+    stats = run_pipeline(
+        build_sources(entries, [], web_plan),
+        ingest_stages(),
+        forward,
+        maxsize=settings.ingest_queue_size,
+    )
+    out.put(
+        (
+            "done",
+            shard_id,
+            {
+                "watchlist_len": len(entries),
+                "queries_len": len(web_plan),
+                **stats.as_dict(),
+                "metrics": REGISTRY.snapshot(),
+            },
+        )
+    )
+
+
+def run_sharded_ingestion(watchlist: list[dict], shards: int) -> dict:
+    """Fan the watchlist out to ``shards`` processes and persist through one writer.
+
+    Each shard fetches, normalizes, filters and enriches its partition; items are
+    sent back to this process, which is the only one writing to SQLite.
+    """
+    from workers.digest import DIGEST
+    from workers.ingest import persist_item, record_run
+    from workers.web_search import build_queries_from_watchlist, plan_queries
+
+    started_at = datetime.utcnow()
+    DIGEST.reset()
+    shards = max(1, shards)
+    context = multiprocessing.get_context("spawn")
+    out = context.Queue(maxsize=settings.ingest_queue_size)
+    partitions = partition_watchlist(watchlist, shards)
+    # One plan and one run budget for the whole watchlist, dealt out round-robin; planning per
+    # shard would spend each shard's own "share of what is left", N times the intended slice.
+    web_plan = plan_queries(build_queries_from_watchlist(watchlist))
+    processes = {
+        shard_id: context.Process(
+            target=_shard_worker,
+            args=(shard_id, entries, web_plan[shard_id::shards], out),
+            name=f"ingest-shard-{shard_id}",
+        )
+        for shard_id, entries in enumerate(partitions)
+    }
+    for process in processes.values():
+        process.start()
+
+    shard_stats: dict[int, dict] = {}
+    inserted: Counter = Counter()
+    while len(shard_stats) < shards:
+        try:
+            kind, shard_id, payload = out.get(timeout=1)
+        except queue.Empty:
+            for shard_id, process in processes.items():
+                if shard_id not in shard_stats and not process.is_alive():
+                    LOGGER.error("ingest_shard_died shard=%s exitcode=%s", shard_id, process.exitcode)
+                    shard_stats[shard_id] = {"watchlist_len": len(partitions[shard_id]), "failed": True}
+            continue
+        if kind == "item":
+            if persist_item(payload):
+                inserted[shard_id] += 1
+        else:
+            REGISTRY.merge(payload.pop("metrics", {}))
+            shard_stats[shard_id] = payload
+    for process in processes.values():
+        process.join()
+
+    sources: Counter = Counter()
+    for shard_id, stats in shard_stats.items():
+        stats["inserted"] = inserted[shard_id]
+        stats["forwarded"] = stats.pop("persisted", 0)
+        sources.update(stats.get("fetched", {}))
+    record_run(
+        "sharded",
+        started_at,
+        len(watchlist),
+        sum(sources.values()),
+        sum(inserted.values()),
+        {"shards": {str(shard_id): stats for shard_id, stats in shard_stats.items()}},
+    )
+    LOGGER.info(
+        "ingest_summary shards=%s watchlist_len=%s fetched_count=%s inserted_count=%s",
+        shards,
+        len(watchlist),
+        sum(sources.values()),
+        sum(inserted.values()),
+    )
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "inserted": sum(inserted.values()),
+        "sources": {name: sources[name] for name in ("x", "youtube", "web", "rss")},
+        "shards": [shard_stats[shard_id] for shard_id in sorted(shard_stats)],
+    }
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Callable, TypeVar
+
+import requests
+
+from app.db import get_source_health, save_source_health
+from app.metrics import SOURCE_BREAKER_SKIPS
+from app.settings import settings
+from workers.rate_limit import ProviderUnavailable
+
+LOGGER = logging.getLogger(__name__)
+
+# Weight of the newest sample in the latency moving average.
+EWMA_ALPHA = 0.3
+# What indexing into a response of an unexpected shape raises, e.g. ``data[0]["snippet"]`` on a changed API.
+PAYLOAD_ERRORS = (KeyError, IndexError, TypeError, AttributeError)
+T = TypeVar("T")
+
+
+class SourceError(Exception):
+    """A source answered, but unusably. ``error_class`` (e.g. ``http_404``) is what /sources shows."""
+
+    def __init__(self, error_class: str, message: str = "") -> None:
+        super().__init__(message or error_class)
+        self.error_class = error_class
+
+
+def http_error(response: requests.Response) -> SourceError:
+    return SourceError(f"http_{response.status_code}", response.text[:200])
+
+
+def backoff_seconds(failures: int) -> float:
+    """How long the breaker stays open after ``failures`` consecutive failures; 0 below the threshold.
+
+    Doubles with every further failure, from ``SOURCE_BACKOFF_BASE_MINUTES`` up to
+    ``SOURCE_BACKOFF_MAX_HOURS``.
+    """
+    excess = failures - settings.source_failure_threshold
+    if excess < 0:
+        return 0.0
+    return min(settings.source_backoff_base_minutes * 60 * 2**excess, settings.source_backoff_max_hours * 3600)
+
+
+def _health(source_type: str, source_key: str) -> dict:
+    return get_source_health(source_type, source_key) or {
+        "source_type": source_type,
+        "source_key": source_key,
+        "consecutive_failures": 0,
+        "open_until": 0.0,
+    }
+
+
+def _ewma(previous: float | None, latency: float) -> float:
+    return latency if previous is None else (1 - EWMA_ALPHA) * previous + EWMA_ALPHA * latency
+
+
+def record_success(source_type: str, source_key: str, latency: float, now: float | None = None) -> None:
+    health = _health(source_type, source_key)
+    health.update(
+        last_success_at=time.time() if now is None else now,
+        consecutive_failures=0,
+        error_class=None,
+        error_message=None,
+        latency_ewma=_ewma(health.get("latency_ewma"), latency),
+        open_until=0.0,
+    )
+    save_source_health(health)
+
+
+def record_failure(
+    source_type: str, source_key: str, error_class: str, message: str, latency: float, now: float | None = None
+) -> None:
+    now = time.time() if now is None else now
+    health = _health(source_type, source_key)
+    failures = health["consecutive_failures"] + 1
+    health.update(
+        last_failure_at=now,
+        consecutive_failures=failures,
+        error_class=error_class,
+        error_message=message[:500],
+        latency_ewma=_ewma(health.get("latency_ewma"), latency),
+        open_until=now + backoff_seconds(failures),
+    )
+    save_source_health(health)
+    if failures >= settings.source_failure_threshold:
+        LOGGER.warning(
+            "source_breaker_open source=%s:%s failures=%s error=%s until=%s",
+            source_type, source_key, failures, error_class, round(health["open_until"]),
+        )
+
+
+def is_open(source_type: str, source_key: str, now: float | None = None) -> bool:
+    health = get_source_health(source_type, source_key)
+    return bool(health) and health["open_until"] > (time.time() if now is None else now)
+
+
+def guarded(source_type: str, source_key: str, fetch: Callable[[], T | None]) -> T | None:
+    """Run one source's ``fetch`` behind its circuit breaker; ``None`` if skipped or failed.
+
+    While the breaker is open the fetch is skipped. After the backoff one attempt
+    goes through: success closes the breaker, failure reopens it for twice as long.
+    ``fetch`` signals failure by raising (``SourceError`` for bad answers). Lookups
+    failing on a malformed payload count as ``SourceError("bad_payload")``, so
+    ``fetch`` should parse the response as well as fetch it. A ``None`` return means
+    it chose not to call and is not recorded; neither is ``ProviderUnavailable``,
+    since a spent quota or rate limit is not this source's fault.
+    """
+    if is_open(source_type, source_key):
+        SOURCE_BREAKER_SKIPS.inc(source=source_type)
+        return None
+    started = time.perf_counter()
+    try:
+        try:
+            result = fetch()
+        except PAYLOAD_ERRORS as exc:
+            LOGGER.warning("source_bad_payload source=%s:%s", source_type, source_key, exc_info=True)
+            raise SourceError("bad_payload", f"{type(exc).__name__}: {exc}") from exc
+    except ProviderUnavailable as exc:
+        LOGGER.info("source_deferred source=%s:%s reason=%s", source_type, source_key, exc)
+        return None
+    except SourceError as exc:
+        record_failure(source_type, source_key, exc.error_class, str(exc), time.perf_counter() - started)
+        return None
+    except (requests.RequestException, ValueError) as exc:
+        # Timeouts, connection errors and undecodable JSON.
+        record_failure(source_type, source_key, type(exc).__name__, str(exc), time.perf_counter() - started)
+        return None
+    if result is not None:
+        record_success(source_type, source_key, time.perf_counter() - started)
+    return result
+
+
+def _format_time(value: float | None) -> str | None:
+    return datetime.fromtimestamp(value, timezone.utc).strftime("%Y-%m-%d %H:%M UTC") if value else None
+
+
+def describe(health: dict, now: float | None = None) -> dict:
+    """A ``source_health`` row for display: ``status`` is open, failing or ok, times are formatted."""
+    now = time.time() if now is None else now
+    if health["open_until"] > now:
+        status = "open"
+    elif health["consecutive_failures"]:
+        status = "failing"
+    else:
+        status = "ok"
+    return {
+        **health,
+        "status": status,
+        "last_success": _format_time(health["last_success_at"]),
+        "last_failure": _format_time(health["last_failure_at"]),
+        "retry_at": _format_time(health["open_until"]) if status == "open" else None,
+        "latency_ms": round(health["latency_ewma"] * 1000) if health["latency_ewma"] is not None else None,
+    }
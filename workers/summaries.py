@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from app.db import bump_data_version, get_connection, load_payloads
+from app.settings import settings
+from workers.llm import LLMClient
+from workers.rate_limit import ProviderUnavailable
+
+LLM = LLMClient()
+LOGGER = logging.getLogger(__name__)
+
+SOURCE_CHARS = 6000
+
+
+def summary_source(item: dict) -> str:
+    """The text sent to the model; also what the cache key is derived from."""
+    parts = [item.get("title"), item.get("summary") or item.get("excerpt"), item.get("content")]
+    return "\n\n".join(part for part in parts if part)[:SOURCE_CHARS]
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(f"{settings.openai_model}\n{text}".encode()).hexdigest()
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """How long an item waits after its summary failed ``attempts`` times in a row.
+
+    Doubles with every failure, from ``SUMMARY_RETRY_BASE_MINUTES`` up to ``SUMMARY_RETRY_MAX_HOURS``.
+    """
+    return min(
+        timedelta(minutes=settings.summary_retry_base_minutes) * 2 ** (attempts - 1),
+        timedelta(hours=settings.summary_retry_max_hours),
+    )
+
+
+def pending_items(limit: int, min_score: float) -> list[dict]:
+    """Leaders still lacking ``summary_zh``, skipping those whose last failure's retry time has not come."""
+    now = datetime.utcnow()
+    since = now - timedelta(days=settings.content_max_age_days)
+    conn = get_connection()
+    rows = conn.execute(
+        """
+        SELECT items.id, title, summary, excerpt, COALESCE(failures.attempts, 0) AS attempts
+        FROM items LEFT JOIN summary_failures AS failures ON failures.item_id = items.id
+        WHERE summary_zh IS NULL AND cluster_id IS NULL AND score >= ? AND ingested_at >= ?
+          AND (failures.retry_after IS NULL OR failures.retry_after <= ?)
+        ORDER BY score DESC, ingested_at DESC
+        LIMIT ?
+        """,
+        (min_score, since.isoformat(), now.isoformat(), limit),
+    ).fetchall()
+    conn.close()
+    payloads = load_payloads(row["id"] for row in rows)
+    items = [dict(row) for row in rows]
+    for item in items:
+        item["content"] = (payloads.get(item["id"], {}).get("content") or "")[:SOURCE_CHARS] or None
+    return items
+
+
+def _cached(hashes: list[str]) -> dict[str, str]:
+    if not hashes:
+        return {}
+    placeholders = ",".join("?" for _ in hashes)
+    conn = get_connection()
+    rows = conn.execute(
+        f"SELECT content_hash, summary_zh FROM summary_cache WHERE content_hash IN ({placeholders})", hashes
+    ).fetchall()
+    conn.close()
+    return {row["content_hash"]: row["summary_zh"] for row in rows}
+
+
+def _summarize(text: str) -> str | None:
+    """The model's summary, ``None`` if the request failed or came back empty.
+
+    ``ProviderUnavailable`` propagates: nothing was sent, so it is no failure of this text.
+    """
+    try:
+        return LLM.chinese_summary(text) or None
+    except ProviderUnavailable:
+        raise
+    except Exception:
+        LOGGER.exception("chinese_summary_failed")
+        return None
+
+
+def summarize_pending(limit: int | None = None, workers: int | None = None) -> dict:
+    """Fill ``items.summary_zh`` for the highest scoring leaders that lack one.
+
+    Texts already summarized (same content hash, e.g. a re-ingested or edited
+    copy) come from ``summary_cache``; the rest go to the model concurrently on
+    ``workers`` threads. Items whose request failed or came back empty are put in
+    ``summary_failures`` and left out until ``retry_delay`` has passed; those turned
+    away by the rate limit are only deferred to the next run. All writes happen
+    afterwards on this thread.
+    """
+    if not LLM.enabled():
+        return {"pending": 0, "cached": 0, "generated": 0, "failed": 0, "deferred": 0}
+    items = pending_items(limit or settings.summary_batch_size, settings.summary_min_score)
+    by_hash: dict[str, list[int]] = {}
+    texts: dict[str, str] = {}
+    attempts: dict[int, int] = {}
+    for item in items:
+        text = summary_source(item)
+        key = content_hash(text)
+        by_hash.setdefault(key, []).append(item["id"])
+        texts[key] = text
+        attempts[item["id"]] = item["attempts"]
+
+    results = _cached(list(by_hash))
+    cached = len(results)
+    missing = [key for key in by_hash if key not in results]
+    deferred: set[str] = set()
+
+    def generate(key: str) -> str | None:
+        try:
+            return _summarize(texts[key])
+        except ProviderUnavailable as exc:
+            LOGGER.info("chinese_summary_deferred reason=%s", exc)
+            deferred.add(key)
+            return None
+
+    with ThreadPoolExecutor(max_workers=workers or settings.summary_workers) as pool:
+        generated = dict(zip(missing, pool.map(generate, missing)))
+    fresh = {key: value for key, value in generated.items() if value}
+    failed = [key for key, value in generated.items() if not value and key not in deferred]
+
+    now = datetime.utcnow()
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.executemany(
+        "INSERT OR REPLACE INTO summary_cache (content_hash, summary_zh, model, created_at) VALUES (?, ?, ?, ?)",
+        [(key, value, settings.openai_model, now.isoformat()) for key, value in fresh.items()],
+    )
+    results.update(fresh)
+    cursor.executemany(
+        "UPDATE items SET summary_zh = ? WHERE id = ?",
+        [(results[key], item_id) for key, ids in by_hash.items() if key in results for item_id in ids],
+    )
+    cursor.executemany(
+        "DELETE FROM summary_failures WHERE item_id = ?",
+        [(item_id,) for key in results for item_id in by_hash[key] if attempts[item_id]],
+    )
+    cursor.executemany(
+        "INSERT OR REPLACE INTO summary_failures (item_id, attempts, retry_after) VALUES (?, ?, ?)",
+        [
+            (item_id, attempts[item_id] + 1, (now + retry_delay(attempts[item_id] + 1)).isoformat())
+            for key in failed
+            for item_id in by_hash[key]
+        ],
+    )
+    if results:
+        bump_data_version(cursor, "items")
+    conn.commit()
+    conn.close()
+    stats = {
+        "pending": len(items),
+        "cached": cached,
+        "generated": len(fresh),
+        "failed": len(failed),
+        "deferred": len(deferred),
+    }
+    LOGGER.info("summary_stage %s", stats)
+    return stats
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    summarize_pending()
@@ -1,34 +1,117 @@
 from __future__ import annotations
 
-from pathlib import Path
 import sqlite3
-from typing import Any
+import threading
+from collections import defaultdict
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any, Iterable
 
 import yaml
 
+from app.db import bump_data_version, get_connection, get_data_versions
+
 
 WATCHLIST_PATH = Path("config/watchlist.yaml")
+ENTRY_FIELDS = ("name", "entry_type", "lab", "x_handle", "website", "youtube_channel", "rss_url")
+SOURCE_FIELDS = ("x_handle", "youtube_channel", "website", "rss_url")
+
+
+def _normalize_handle(handle: str) -> str:
+    return handle.strip().lstrip("@").lower()
+
+
+class WatchlistIndex(Sequence):
+    """Watchlist entries in name order, indexed by type, X handle and lab.
+
+    Built once per ``watchlist`` data version by ``get_watchlist_index``; treat it
+    as read-only. Being a sequence of entry dicts, it goes wherever a watchlist
+    list does.
+    """
+
+    def __init__(self, entries: Iterable[dict[str, Any]], version: int = 0) -> None:
+        self.version = version
+        self._entries = list(entries)
+        self._by_type: dict[str, list[dict]] = defaultdict(list)
+        self._by_lab: dict[str, list[dict]] = defaultdict(list)
+        self._by_handle: dict[str, dict] = {}
+        self._values: dict[str, list[str]] = {field: [] for field in SOURCE_FIELDS}
+        for entry in self._entries:
+            self._by_type[entry.get("entry_type")].append(entry)
+            if entry.get("lab"):
+                self._by_lab[entry["lab"].lower()].append(entry)
+            if entry.get("x_handle"):
+                self._by_handle.setdefault(_normalize_handle(entry["x_handle"]), entry)
+            for field in SOURCE_FIELDS:
+                if entry.get(field):
+                    self._values[field].append(entry[field])
+
+    def __getitem__(self, index):
+        return self._entries[index]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def of_type(self, entry_type: str) -> list[dict]:
+        return list(self._by_type.get(entry_type, ()))
+
+    def for_lab(self, lab: str) -> list[dict]:
+        return list(self._by_lab.get(lab.lower(), ()))
+
+    def find_handle(self, handle: str) -> dict | None:
+        """The entry for an X handle, ignoring case and a leading ``@``."""
+        return self._by_handle.get(_normalize_handle(handle))
 
+    def values(self, field: str) -> list[str]:
+        return list(self._values[field])
 
-def load_watchlist(db_path: str | Path = "/app/data/radar.db") -> list[dict[str, Any]]:
+
+_INDEX: WatchlistIndex | None = None
+_INDEX_LOCK = threading.Lock()
+
+
+def _read_entries(conn: sqlite3.Connection) -> list[dict[str, Any]]:
+    rows = conn.execute(f"SELECT {', '.join(ENTRY_FIELDS)} FROM watchlist_entries ORDER BY name").fetchall()
+    return [dict(row) for row in rows]
+
+
+def get_watchlist_index() -> WatchlistIndex:
+    """The watchlist, reread from SQLite only when its ``watchlist`` data version has moved.
+
+    Every write bumps that version in its own transaction, so an edit made by any
+    process shows up on the next call; otherwise the check is one primary-key read.
+    """
+    global _INDEX
+    try:
+        version = get_data_versions(["watchlist"])["watchlist"][0]
+    except sqlite3.OperationalError:
+        # Not initialised yet.
+        return WatchlistIndex([], -1)
+    with _INDEX_LOCK:
+        if _INDEX is None or _INDEX.version != version:
+            conn = get_connection()
+            try:
+                _INDEX = WatchlistIndex(_read_entries(conn), version)
+            finally:
+                conn.close()
+        return _INDEX
+
+
+def load_watchlist(db_path: str | Path | None = None) -> list[dict[str, Any]]:
+    """Watchlist entries as dicts; from the shared index unless another database is named."""
+    if db_path is None:
+        return list(get_watchlist_index())
     path = Path(db_path)
     if not path.exists():
         return []
     conn = sqlite3.connect(path)
     conn.row_factory = sqlite3.Row
     try:
-        rows = conn.execute(
-            """
-            SELECT name, entry_type, lab, x_handle, website, youtube_channel, rss_url
-            FROM watchlist_entries
-            ORDER BY name
-            """
-        ).fetchall()
+        return _read_entries(conn)
     except sqlite3.OperationalError:
         return []
     finally:
         conn.close()
-    return [dict(row) for row in rows]
 
 
 def load_watchlist_yaml() -> dict:
@@ -44,28 +127,26 @@ def save_watchlist(data: dict) -> None:
         yaml.safe_dump(data, handle, sort_keys=False, allow_unicode=True)
 
 
-def add_watchlist_entry(entry: dict, db_path: str | Path = "/app/data/radar.db") -> None:
-    conn = sqlite3.connect(db_path)
+def add_watchlist_entry(entry: dict, db_path: str | Path | None = None) -> dict[str, Any]:
+    """Insert one entry and return it with its ``id``; the version bump invalidates every process's index."""
+    conn = get_connection() if db_path is None else sqlite3.connect(db_path)
+    values = {field: entry.get(field) for field in ENTRY_FIELDS}
+    values["entry_type"] = values["entry_type"] or "person"
     try:
-        conn.execute(
+        cursor = conn.execute(
             """
             INSERT INTO watchlist_entries
             (name, entry_type, lab, x_handle, website, youtube_channel, rss_url, created_at)
             VALUES (?, ?, ?, ?, ?, ?, ?, datetime('now'))
             """,
-            (
-                entry.get("name"),
-                entry.get("entry_type", "person"),
-                entry.get("lab"),
-                entry.get("x_handle"),
-                entry.get("website"),
-                entry.get("youtube_channel"),
-                entry.get("rss_url"),
-            ),
+            tuple(values[field] for field in ENTRY_FIELDS),
         )
+        values["id"] = cursor.lastrowid
+        bump_data_version(conn.cursor(), "watchlist")
         conn.commit()
     finally:
         conn.close()
+    return values
 
 
 def flatten_watchlist(data: dict) -> list[dict[str, Any]]:
@@ -102,17 +183,23 @@ def flatten_watchlist(data: dict) -> list[dict[str, Any]]:
     return entries
 
 
-def all_x_handles(entries: list[dict[str, Any]]) -> list[str]:
-    return [entry["x_handle"] for entry in entries if entry.get("x_handle")]
+def _source_values(entries: Iterable[dict[str, Any]], field: str) -> list[str]:
+    if isinstance(entries, WatchlistIndex):
+        return entries.values(field)
+    return [entry[field] for entry in entries if entry.get(field)]
+
+
+def all_x_handles(entries: Iterable[dict[str, Any]]) -> list[str]:
+    return _source_values(entries, "x_handle")
 
 
-def all_youtube_channels(entries: list[dict[str, Any]]) -> list[str]:
-    return [entry["youtube_channel"] for entry in entries if entry.get("youtube_channel")]
+def all_youtube_channels(entries: Iterable[dict[str, Any]]) -> list[str]:
+    return _source_values(entries, "youtube_channel")
 
 
-def all_websites(entries: list[dict[str, Any]]) -> list[str]:
-    return [entry["website"] for entry in entries if entry.get("website")]
+def all_websites(entries: Iterable[dict[str, Any]]) -> list[str]:
+    return _source_values(entries, "website")
 
 
-def all_rss_feeds(entries: list[dict[str, Any]]) -> list[str]:
-    return [entry["rss_url"] for entry in entries if entry.get("rss_url")]
+def all_rss_feeds(entries: Iterable[dict[str, Any]]) -> list[str]:
+    return _source_values(entries, "rss_url")
@@ -3,61 +3,164 @@ from __future__ import annotations
 import hashlib
 from datetime import datetime
 import logging
-from typing import Iterable
+from math import ceil
+from typing import Iterable, Iterator
+from urllib.parse import urlsplit
 
-import requests
-
-from app.content import normalize_published_at
-from app.db import insert_item
+from app.content import parse_published_at
+from app.dates import utc_now
+from app.db import (
+    get_connection,
+    insert_item,
+    load_search_response,
+    search_fetch_times,
+    store_search_response,
+)
 from app.settings import settings
+from workers.clustering import find_cluster_leader, fingerprint_item
+from workers.digest import record_candidate
+from workers.http_client import http_get
+from workers.rate_limit import PACIFIC, quota_remaining
+from workers.source_health import guarded, http_error, is_open
 from workers.watchlist import all_websites, all_x_handles, load_watchlist
 
 API_BASE = "https://www.googleapis.com/customsearch/v1"
 LOGGER = logging.getLogger(__name__)
 
+QUOTA_PROVIDER = "google_cse"
+MAX_QUERY_CHARS = 2000
+
+
+def _site_term(website: str) -> str:
+    parts = urlsplit(website if "//" in website else f"//{website}")
+    return f"site:{parts.hostname or website}{parts.path.rstrip('/')}"
+
+
+def _handle_term(handle: str) -> str:
+    return f'"{handle.lstrip("@")}"'
+
+
+def _or_queries(terms: Iterable[str], size: int) -> list[str]:
+    queries: list[str] = []
+    current: list[str] = []
+    for term in sorted(set(terms)):
+        if current and (len(current) >= size or len(" OR ".join([*current, term])) > MAX_QUERY_CHARS):
+            queries.append(" OR ".join(current))
+            current = []
+        current.append(term)
+    if current:
+        queries.append(" OR ".join(current))
+    return queries
+
 
 def build_queries_from_watchlist(watchlist: list[dict]) -> list[str]:
-    return [*all_websites(watchlist), *all_x_handles(watchlist)]
+    """Websites as ``site:`` and X handles as quoted terms, ``OR``-ed in groups of ``WEB_SEARCH_TERMS_PER_QUERY``.
+
+    Terms are sorted before grouping, so a query string stays the same from run to
+    run (and keeps its cache entry) unless the watchlist changes next to it.
+    """
+    size = settings.web_search_terms_per_query
+    return [
+        *_or_queries(map(_site_term, all_websites(watchlist)), size),
+        *_or_queries(map(_handle_term, all_x_handles(watchlist)), size),
+    ]
+
+
+def run_budget(now: datetime) -> int:
+    """This run's share of what is left of today's quota, spread over the hourly runs still to come."""
+    return max(0, ceil(quota_remaining(QUOTA_PROVIDER, now) / (24 - now.astimezone(PACIFIC).hour)))
+
+
+def plan_queries(queries: Iterable[str], now: datetime | None = None) -> list[tuple[str, str]]:
+    """``(query, dateRestrict)`` for the queries to fetch this run.
+
+    Queries answered within ``WEB_SEARCH_CACHE_TTL_HOURS``, or whose circuit breaker
+    is open, are skipped. The rest are taken never-fetched first, then oldest
+    first, up to ``run_budget``, so successive runs rotate through the watchlist. ``dateRestrict`` covers
+    the days since a query's last fetch (the retention window for a new one).
+    """
+    now = now or utc_now()
+    queries = list(dict.fromkeys(queries))
+    fetched = search_fetch_times(queries)
+    ttl = settings.web_search_cache_ttl_hours * 3600
+    due = [
+        query
+        for query in queries
+        if (query not in fetched or now.timestamp() - fetched[query] >= ttl) and not is_open("web", query)
+    ]
+    due.sort(key=lambda query: fetched.get(query, 0.0))
+    plan = []
+    for query in due[: run_budget(now)]:
+        days = settings.content_max_age_days
+        if query in fetched:
+            days = min(days, max(1, ceil((now.timestamp() - fetched[query]) / 86400)))
+        plan.append((query, f"d{days}"))
+    return plan
+
+
+def fetch_results(query: str, date_restrict: str | None = None, now: datetime | None = None) -> list[dict]:
+    """CSE result entries for ``query``, from ``search_cache`` while fresh.
+
+    Raises ``SourceError`` on an error response and ``QuotaExceeded`` once the daily
+    quota is spent.
+    """
+    now = now or utc_now()
+    cached = load_search_response(query, settings.web_search_cache_ttl_hours * 3600, now.timestamp())
+    if cached is not None:
+        return cached
+    params = {
+        "key": settings.google_cse_api_key,
+        "cx": settings.google_cse_cx,
+        "q": query,
+        "num": settings.web_search_results_per_query,
+    }
+    if date_restrict:
+        params["dateRestrict"] = date_restrict
+    resp = http_get(API_BASE, provider=QUOTA_PROVIDER, params=params, timeout=20)
+    if resp.status_code != 200:
+        raise http_error(resp)
+    entries = resp.json().get("items", [])
+    store_search_response(query, entries, now.timestamp())
+    return entries
 
 
 def search_web(queries: Iterable[str]) -> list[dict]:
+    return list(iter_web_results(queries))
+
+
+def iter_web_results(queries: Iterable[str]) -> Iterator[dict]:
+    return iter_planned_results(plan_queries(queries))
+
+
+def iter_planned_results(plan: Iterable[tuple[str, str]]) -> Iterator[dict]:
+    """Result items for ``(query, dateRestrict)`` pairs from ``plan_queries``."""
     if not settings.google_cse_api_key or not settings.google_cse_cx:
-        return []
-    items: list[dict] = []
-    for query in queries:
-        resp = requests.get(
-            API_BASE,
-            params={
-                "key": settings.google_cse_api_key,
-                "cx": settings.google_cse_cx,
-                "q": query,
-                "num": 5,
-            },
-            timeout=20,
-        )
-        if resp.status_code != 200:
+        return
+    for query, date_restrict in plan:
+        yield from guarded("web", query, lambda: _parse_results(query, fetch_results(query, date_restrict))) or []
+
+
+def _parse_results(query: str, entries: list[dict]) -> list[dict]:
+    items = []
+    for entry in entries:
+        url = entry.get("link")
+        if not url:
             continue
-        for entry in resp.json().get("items", []):
-            url = entry.get("link")
-            if not url:
-                continue
-            dedupe_hash = hashlib.sha256(f"web-{url}".encode()).hexdigest()
-            items.append(
-                {
-                    "source_type": "web",
-                    "title": entry.get("title"),
-                    "url": url,
-                    "author": entry.get("displayLink"),
-                    "published_at": entry.get("pagemap", {})
-                    .get("metatags", [{}])[0]
-                    .get("article:published_time"),
-                    "excerpt": entry.get("snippet"),
-                    "content": None,
-                    "dedupe_hash": dedupe_hash,
-                    "metadata": {"query": query},
-                    "ingested_at": datetime.utcnow().isoformat(),
-                }
-            )
+        dedupe_hash = hashlib.sha256(f"web-{url}".encode()).hexdigest()
+        items.append(
+            {
+                "source_type": "web",
+                "title": entry.get("title"),
+                "url": url,
+                "author": entry.get("displayLink"),
+                "published_at": (entry.get("pagemap", {}).get("metatags") or [{}])[0].get("article:published_time"),
+                "excerpt": entry.get("snippet"),
+                "content": None,
+                "dedupe_hash": dedupe_hash,
+                "metadata": {"query": query},
+                "ingested_at": datetime.utcnow().isoformat(),
+            }
+        )
     return items
 
 
@@ -66,13 +169,24 @@ def run_web_search() -> dict:
     queries = build_queries_from_watchlist(watchlist)
     items = search_web(queries)
     inserted = 0
-    for item in items:
-        norm = normalize_published_at(item.get("published_at"))
-        if norm is None:
-            continue
-        item["published_at"] = norm
-        if insert_item(item):
-            inserted += 1
+    conn = get_connection()
+    try:
+        for item in items:
+            published_dt = parse_published_at(item.get("published_at"))
+            if published_dt is None:
+                continue
+            item["published_dt"] = published_dt
+            item["published_at"] = published_dt.isoformat()
+            fingerprint_item(item)
+            leader = find_cluster_leader(conn, item)
+            if leader:
+                item["cluster_id"] = leader["id"]
+            item_id = insert_item(item)
+            record_candidate(item_id, item)
+            if item_id:
+                inserted += 1
+    finally:
+        conn.close()
     LOGGER.info(
         "web_search_summary watchlist_len=%s queries_len=%s fetched_count=%s inserted_count=%s",
         len(watchlist),
@@ -2,11 +2,11 @@ from __future__ import annotations
 
 import hashlib
 from datetime import datetime
-from typing import Iterable
-
-import requests
+from typing import Iterable, Iterator
 
 from app.settings import settings
+from workers.http_client import http_get
+from workers.source_health import SourceError, guarded, http_error
 
 API_BASE = "https://api.twitter.com/2"
 
@@ -15,53 +15,70 @@ def _headers() -> dict:
     return {"Authorization": f"Bearer {settings.x_api_bearer_token}"}
 
 
-def _user_id(handle: str) -> str | None:
-    resp = requests.get(f"{API_BASE}/users/by/username/{handle}", headers=_headers(), timeout=20)
+def _user_id(handle: str) -> str:
+    resp = http_get(f"{API_BASE}/users/by/username/{handle}", provider="x", headers=_headers(), timeout=20)
+    if resp.status_code != 200:
+        raise http_error(resp)
+    user_id = resp.json().get("data", {}).get("id")
+    if not user_id:
+        # Renamed or suspended accounts come back as 200 with an "errors" list.
+        raise SourceError("not_found", f"no X user @{handle}")
+    return user_id
+
+
+def _fetch_tweets(handle: str) -> list[dict]:
+    resp = http_get(
+        f"{API_BASE}/users/{_user_id(handle)}/tweets",
+        provider="x",
+        headers=_headers(),
+        params={
+            "tweet.fields": "created_at,author_id,referenced_tweets,entities",
+            "max_results": 20,
+        },
+        timeout=20,
+    )
     if resp.status_code != 200:
-        return None
-    data = resp.json()
-    return data.get("data", {}).get("id")
+        raise http_error(resp)
+    return resp.json().get("data", [])
+
+
+def _parse_tweets(handle: str, data: list[dict]) -> list[dict]:
+    items = []
+    for tweet in data:
+        content = tweet.get("text", "")
+        url = f"https://x.com/{handle}/status/{tweet.get('id')}"
+        published_at = tweet.get("created_at")
+        dedupe_hash = hashlib.sha256(f"x-{tweet.get('id')}".encode()).hexdigest()
+        links = [
+            link.get("expanded_url") or link.get("url")
+            for link in tweet.get("entities", {}).get("urls", [])
+        ]
+        items.append(
+            {
+                "source_type": "x",
+                "title": content[:120],
+                "url": url,
+                "author": handle,
+                "published_at": published_at,
+                "excerpt": content,
+                "content": content,
+                "dedupe_hash": dedupe_hash,
+                "metadata": {"handle": handle, "links": links, "raw": tweet},
+                "ingested_at": datetime.utcnow().isoformat(),
+            }
+        )
+    return items
 
 
 def fetch_x_posts(handles: Iterable[str]) -> list[dict]:
+    return list(iter_x_posts(handles))
+
+
+def iter_x_posts(handles: Iterable[str]) -> Iterator[dict]:
     if not settings.x_api_bearer_token:
         if settings.x_scrape_fallback:
-            return []
-        return []
-    items: list[dict] = []
+            return
+        return
     for handle in handles:
-        user_id = _user_id(handle)
-        if not user_id:
-            continue
-        resp = requests.get(
-            f"{API_BASE}/users/{user_id}/tweets",
-            headers=_headers(),
-            params={
-                "tweet.fields": "created_at,author_id,referenced_tweets",
-                "max_results": 20,
-            },
-            timeout=20,
-        )
-        if resp.status_code != 200:
-            continue
-        data = resp.json().get("data", [])
-        for tweet in data:
-            content = tweet.get("text", "")
-            url = f"https://x.com/{handle}/status/{tweet.get('id')}"
-            published_at = tweet.get("created_at")
-            dedupe_hash = hashlib.sha256(f"x-{tweet.get('id')}".encode()).hexdigest()
-            items.append(
-                {
-                    "source_type": "x",
-                    "title": content[:120],
-                    "url": url,
-                    "author": handle,
-                    "published_at": published_at,
-                    "excerpt": content,
-                    "content": content,
-                    "dedupe_hash": dedupe_hash,
-                    "metadata": {"handle": handle, "raw": tweet},
-                    "ingested_at": datetime.utcnow().isoformat(),
-                }
-            )
-    return items
+        # Parsed inside the breaker, so a malformed payload counts against the handle.
+        yield from guarded("x", handle, lambda: _parse_tweets(handle, _fetch_tweets(handle))) or []
@@ -2,43 +2,67 @@ from __future__ import annotations
 
 import hashlib
 from datetime import datetime
-from typing import Iterable
+from typing import Iterable, Iterator
 from urllib.parse import urlparse
 
-import requests
-from youtube_transcript_api import YouTubeTranscriptApi
-
 from app.settings import settings
+from workers.http_client import http_get
+from workers.source_health import SourceError, guarded, http_error
 
 API_BASE = "https://www.googleapis.com/youtube/v3"
+# search.list costs 100 of the 10,000 daily quota units.
+SEARCH_UNITS = 100
 
 
-def _resolve_channel_id(channel_url: str) -> str | None:
+def _resolve_channel_id(channel_url: str) -> str:
     if "/channel/" in channel_url:
         return channel_url.split("/channel/")[-1].split("/")[0]
-    if "@" in channel_url:
-        handle = channel_url.split("@")[-1].strip("/")
-        resp = requests.get(
-            f"{API_BASE}/search",
-            params={
-                "key": settings.youtube_api_key,
-                "q": handle,
-                "type": "channel",
-                "part": "snippet",
-                "maxResults": 1,
-            },
-            timeout=20,
-        )
-        if resp.status_code != 200:
-            return None
-        data = resp.json().get("items", [])
-        if not data:
-            return None
-        return data[0]["snippet"]["channelId"]
-    return None
+    if "@" not in channel_url:
+        raise SourceError("unsupported_url", "expected a /channel/<id> or /@handle URL")
+    handle = channel_url.split("@")[-1].strip("/")
+    resp = http_get(
+        f"{API_BASE}/search",
+        provider="youtube",
+        units=SEARCH_UNITS,
+        params={
+            "key": settings.youtube_api_key,
+            "q": handle,
+            "type": "channel",
+            "part": "snippet",
+            "maxResults": 1,
+        },
+        timeout=20,
+    )
+    if resp.status_code != 200:
+        raise http_error(resp)
+    data = resp.json().get("items", [])
+    if not data:
+        raise SourceError("not_found", f"no YouTube channel @{handle}")
+    return data[0]["snippet"]["channelId"]
+
+
+def _fetch_uploads(channel_url: str) -> list[dict]:
+    resp = http_get(
+        f"{API_BASE}/search",
+        provider="youtube",
+        units=SEARCH_UNITS,
+        params={
+            "key": settings.youtube_api_key,
+            "channelId": _resolve_channel_id(channel_url),
+            "part": "snippet",
+            "order": "date",
+            "maxResults": 10,
+        },
+        timeout=20,
+    )
+    if resp.status_code != 200:
+        raise http_error(resp)
+    return resp.json().get("items", [])
 
 
 def _fetch_transcript(video_id: str) -> str:
+    from youtube_transcript_api import YouTubeTranscriptApi
+
     try:
         transcript = YouTubeTranscriptApi.get_transcript(video_id)
         return " ".join([chunk["text"] for chunk in transcript])
@@ -47,46 +71,43 @@ def _fetch_transcript(video_id: str) -> str:
 
 
 def fetch_videos(channels: Iterable[str]) -> list[dict]:
-    if not settings.youtube_api_key:
-        return []
-    items: list[dict] = []
-    for channel_url in channels:
-        channel_id = _resolve_channel_id(channel_url)
-        if not channel_id:
-            continue
-        resp = requests.get(
-            f"{API_BASE}/search",
-            params={
-                "key": settings.youtube_api_key,
-                "channelId": channel_id,
-                "part": "snippet",
-                "order": "date",
-                "maxResults": 10,
-            },
-            timeout=20,
-        )
-        if resp.status_code != 200:
+    return list(iter_videos(channels))
+
+
+def _parse_uploads(channel_url: str, entries: list[dict]) -> list[tuple[str, dict]]:
+    """``(video_id, item)`` for each video; the transcript is fetched later, outside the breaker."""
+    videos = []
+    for entry in entries:
+        if entry.get("id", {}).get("kind") != "youtube#video":
             continue
-        for entry in resp.json().get("items", []):
-            if entry.get("id", {}).get("kind") != "youtube#video":
-                continue
-            video_id = entry["id"]["videoId"]
-            snippet = entry["snippet"]
-            url = f"https://www.youtube.com/watch?v={video_id}"
-            transcript = _fetch_transcript(video_id)
-            dedupe_hash = hashlib.sha256(f"yt-{video_id}".encode()).hexdigest()
-            items.append(
+        video_id = entry["id"]["videoId"]
+        snippet = entry["snippet"]
+        dedupe_hash = hashlib.sha256(f"yt-{video_id}".encode()).hexdigest()
+        videos.append(
+            (
+                video_id,
                 {
                     "source_type": "youtube",
                     "title": snippet.get("title"),
-                    "url": url,
+                    "url": f"https://www.youtube.com/watch?v={video_id}",
                     "author": snippet.get("channelTitle"),
                     "published_at": snippet.get("publishedAt"),
                     "excerpt": snippet.get("description"),
-                    "content": transcript,
+                    "content": None,
                     "dedupe_hash": dedupe_hash,
                     "metadata": {"channel": channel_url},
                     "ingested_at": datetime.utcnow().isoformat(),
-                }
+                },
             )
-    return items
+        )
+    return videos
+
+
+def iter_videos(channels: Iterable[str]) -> Iterator[dict]:
+    if not settings.youtube_api_key:
+        return
+    for channel_url in channels:
+        videos = guarded("youtube", channel_url, lambda: _parse_uploads(channel_url, _fetch_uploads(channel_url)))
+        for video_id, item in videos or []:
+            item["content"] = _fetch_transcript(video_id)
+            yield item